@@ -1,12 +1,25 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 import threading
+import importlib.util
 import os
+import json
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+import time
 from datetime import datetime
 from scraper.flipkart import FlipkartScraper
-from scraper.utils import parse_review_date
-import pandas as pd
-import csv
+from scraper.export import zip_files
+from scraper.http_fetch import iter_review_pages_http
+from scraper.sharding import iter_review_pages_sharded
+from scraper.sinks import open_sinks, truncate_csv, replay_csv, MultiSink, CsvSink, ExcelSink, ParquetSink
+from scraper.checkpoint import JobCheckpoint, new_job_id
+from scraper.jobs import JobStore, JobManager, QueueFull, FINISHED_STATUSES
+from scraper.dedup import review_hash
+from scraper.store import STORED_PAGES_TO_STOP, ReviewStore, product_key
+from scraper.preview import CsvRowIndex, iter_file_range
+from scraper.metrics import Metrics, REGISTRY as METRICS_REGISTRY, bind as bind_metrics
+from scraper.utils import parse_review_dates, DriverPool, OldPageStop
 
 app = Flask(__name__)
 # Enable CORS for all origins (production)
@@ -18,160 +31,321 @@ CORS(app, resources={
     }
 })
 
-# Global state to track scraping progress
-scraping_state = {
-    "is_running": False,
-    "current_page": 0,
-    "total_reviews": 0,
-    "recent_reviews": [], # New: Store last 5 reviews for live feed
-    "status": "idle",
-    "error": None,
-    "output_file": None,
-    "csv_file": None
-}
+def new_job_state():
+    """Progress of one scrape job, as served by /api/status/<job_id>"""
+    return {
+        "job_id": None, # Also the checkpoint id - pass as resume_job_id to continue an interrupted job
+        "is_running": False,
+        "current_page": 0,
+        "total_reviews": 0,
+        "recent_reviews": [], # New: Store last 5 reviews for live feed
+        "status": "idle",
+        "error": None,
+        "output_file": None,
+        "csv_file": None,
+        "output_files": [], # All Excel chunks when the export is split
+        "parquet_file": None,
+        "csv_readable_bytes": 0, # CSV bytes holding complete rows - /api/reviews and the CSV download read up to here
+        "run_id": None, # Changes whenever the job (re)starts, as a resume rewrites the end of the CSV
+        "concurrency": 1,
+        "products_completed": 0,
+        "pages_skipped": 0, # Pages not loaded because the date window was passed (sort_recent)
+        "time_saved_seconds": 0, # Estimated browser time those pages would have taken
+        "exported_reviews": 0, # Reviews in the export built from the review store (use_store/incremental)
+        "metrics": None, # Per-phase timings and WebDriver calls (scraper.metrics.Metrics.snapshot)
+        "products": [] # Per-product progress (url, status, current_page, reviews, pages_skipped, error)
+    }
 
-def append_to_csv(reviews, filename):
-    """Appends reviews to CSV file"""
-    if not reviews:
-        return
-    
-    fieldnames = ['platform', 'reviewer_name', 'rating', 'review', 'review_date', 'relative_date', 'product_url']
-    file_exists = os.path.isfile(filename)
-    
-    try:
-        with open(filename, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            for r in reviews:
-                row_to_write = {k: r.get(k, None) for k in fieldnames}
-                writer.writerow(row_to_write)
-    except Exception as e:
-        print(f"CSV Error: {e}")
+# Upper bound for parallel browsers per job (each Chrome needs a few hundred MB)
+MAX_CONCURRENCY = int(os.environ.get('MAX_CONCURRENCY', 4))
 
+# Pages between job checkpoints (each one fsyncs the CSV and rewrites output/jobs/<job_id>.json)
+CHECKPOINT_EVERY_PAGES = int(os.environ.get('CHECKPOINT_EVERY_PAGES', 20))
 
+# Per-product dedup memory cap; past it dedup switches to a Bloom filter with this false-positive rate
+DEDUP_OPTIONS = {
+    "max_bytes": int(os.environ.get('DEDUP_MAX_MB', 64)) * 1024 * 1024,
+    "false_positive_rate": float(os.environ.get('DEDUP_FALSE_POSITIVE_RATE', 0.001))
+}
 
+def save_checkpoint(job):
+    """Makes the reviews written so far durable, then records how far every product got (call with write_lock held)"""
+    job["sink"].checkpoint()
+    job["state"]["csv_readable_bytes"] = job["csv_sink"].flushed_bytes
+    job["checkpoint"].save(csv_bytes=job["csv_sink"].committed_bytes, total_reviews=job["state"]["total_reviews"])
 
-def convert_csv_to_excel(csv_filename, excel_filename):
-    """Converts CSV to beautifully styled Excel with colors and formatting"""
+def scrape_product(job, driver_pool, product_index, product_url):
+    """Scrapes one product with a driver leased from the pool (runs in a worker thread)"""
+    state = job["state"]
+    metrics = job["metrics"]
+    product_state = state["products"][product_index - 1]
+    checkpoint = job["checkpoint"]
+    saved = checkpoint.product(product_index)
+    
+    if saved["status"] == "completed":
+        # Resumed job: this product was finished before the restart
+        print(f"⏭ Product {product_index} already complete ({saved['reviews']} reviews) - skipping")
+        with job["write_lock"]:
+            product_state["status"] = "completed"
+            state["products_completed"] += 1
+        return
+    
+    if job["cancelled"]():
+        # Cancelled before this product started: leave it queued for a resume
+        product_state["status"] = "cancelled"
+        return
+    
+    product_state["status"] = "running"
+    job["emit"]("product", product=product_index, status="running")
+    
+    print(f"\n{'='*60}")
+    print(f"📦 PRODUCT {product_index}/{job['total_products']}")
+    print(f"🔗 URL: {product_url}")
+    print(f"{'='*60}\n")
+    
+    driver = None
+    shard_pool = None
+    pages = None
+    
     try:
-        from openpyxl import load_workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
-        
-        # Read CSV and create basic Excel
-        df = pd.read_csv(csv_filename)
-        df.to_excel(excel_filename, index=False, engine='openpyxl')
-        
-        # Load workbook for styling
-        wb = load_workbook(excel_filename)
-        ws = wb.active
+        # Lease a pooled driver for this product (a browser that fails to start fails only this product)
+        driver = driver_pool.acquire()
+        scraper = FlipkartScraper(driver=driver, min_delay=job["min_delay"], max_delay=job["min_delay"] * 2)
+        scraper.open_product_page(product_url)
+        scraper.go_to_all_reviews()
+        if job["sort_recent"]:
+            # Newest first, so paging can stop once it's past from_date
+            scraper.sort_reviews("MOST_RECENT")
         
-        # Define color scheme
-        header_fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")  # Blue
-        header_font = Font(name='Calibri', size=12, bold=True, color="FFFFFF")  # White text
+        # Track seen reviews (for infinite scroll deduplication) - restored when resuming
+        seen_reviews = checkpoint.restore_seen(product_index, **DEDUP_OPTIONS)
+        max_pages = job["max_pages"]
+        # First page not yet committed by an earlier run of this job
+        start_page = saved["page"] + 1
         
-        # Rating colors (gradient from red to green)
-        rating_colors = {
-            1: "FF4444",  # Red
-            2: "FF8844",  # Orange
-            3: "FFD700",  # Yellow/Gold
-            4: "88DD44",  # Light Green
-            5: "44DD44"   # Green
-        }
-        
-        # Border style
-        thin_border = Border(
-            left=Side(style='thin', color='CCCCCC'),
-            right=Side(style='thin', color='CCCCCC'),
-            top=Side(style='thin', color='CCCCCC'),
-            bottom=Side(style='thin', color='CCCCCC')
-        )
+        # Detect pagination mode on first check
+        pagination_mode = scraper.has_next_button()
+        mode_name = "PAGINATION" if pagination_mode else "INFINITE SCROLL"
+        print(f"🔍 Detected mode: {mode_name}\n")
+        checkpoint.update_product(product_index, status="running", mode="pagination" if pagination_mode else "scroll")
+        if start_page > 1:
+            print(f"↩ Resuming product {product_index} at page {start_page}\n")
         
-        # Style header row
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = thin_border
+        total_pages = scraper.get_total_pages() if pagination_mode and job["page_shards"] > 1 else None
         
-        # Get column indices
-        columns = {col.value: idx for idx, col in enumerate(ws[1], 1)}
-        rating_col = columns.get('rating')
-        review_col = columns.get('review')
-        platform_col = columns.get('platform')
+        if start_page > max_pages:
+            pages = iter(())
+        elif total_pages and total_pages > 1:
+            # Several browsers load pages by URL, merged back in page order
+            last_page = min(total_pages, max_pages)
+            print(f"🧩 {total_pages} pages found - scraping {start_page}-{last_page} with {job['page_shards']} browsers\n")
+            shard_pool = DriverPool(size=job["page_shards"] - 1, lean=job["lean"])
+            pages = iter_review_pages_sharded(
+                scraper, shard_pool, last_page, job["page_shards"],
+                scraper_kwargs={"min_delay": job["min_delay"], "max_delay": job["min_delay"] * 2},
+                start_page=start_page
+            )
+        elif pagination_mode and job["fetch_mode"] == "http":
+            # Browser for page 1 + cookies, then plain HTTP for the rest
+            print(f"🌐 Fetching pages over HTTP ({job['http_concurrency']} in flight, {job['rate_limit']} req/s)\n")
+            pages = iter_review_pages_http(
+                scraper, max_pages, concurrency=job["http_concurrency"], rate_limit=job["rate_limit"], start_page=start_page
+            )
+        elif scraper.skip_to_page(start_page, pagination_mode):
+            # Pagination: extract the whole page
+            # Infinite scroll: extract only the reviews appended since the last iteration
+            pages = scraper.iter_review_pages(max_pages, only_new=not pagination_mode, start_page=start_page)
+        else:
+            print("   Product ended before the resume point")
+            pages = iter(())
         
-        # Style data rows
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row), 2):
-            for cell in row:
-                # Apply borders
-                cell.border = thin_border
-                
-                # Center alignment for specific columns
-                if cell.column in [platform_col, rating_col]:
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                else:
-                    cell.alignment = Alignment(vertical='top', wrap_text=True)
-                
-                # Color-code ratings
-                if cell.column == rating_col and cell.value:
-                    try:
-                        rating_value = int(cell.value)
-                        if rating_value in rating_colors:
-                            cell.fill = PatternFill(start_color=rating_colors[rating_value], 
-                                                   end_color=rating_colors[rating_value], 
-                                                   fill_type="solid")
-                            cell.font = Font(bold=True, color="FFFFFF", size=11)
-                    except:
-                        pass
-                
-                # Alternate row colors (zebra striping)
-                if row_idx % 2 == 0 and cell.column != rating_col:
-                    cell.fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
+        product_review_count = saved["reviews"]
+        page_number = 0
+        old_page_stop = OldPageStop(job["from_date"], job["stop_after_old_pages"])
+        stopped_early = False
+        stored_pages = 0
+        store_key = product_key(product_url)
+        pages_started = time.monotonic()
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
+        for page_number, raw_reviews in pages:
+            if job["cancelled"]():
+                print(f"\n⏹ Job cancelled - product {product_index} stops before page {page_number}")
+                product_state["status"] = "cancelled"
+                break
             
-            for cell in column:
-                try:
-                    if cell.value:
-                        cell_length = len(str(cell.value))
-                        if cell_length > max_length:
-                            max_length = cell_length
-                except:
-                    pass
+            with job["write_lock"]:
+                product_state["current_page"] = page_number
+                state["current_page"] += 1
             
-            # Set width with limits
-            adjusted_width = min(max(max_length + 2, 12), 80)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Freeze header row
-        ws.freeze_panes = 'A2'
-        
-        # Set row height for header
-        ws.row_dimensions[1].height = 25
+            # ALWAYS deduplicate - duplicates can appear in both modes
+            unique_reviews = []
+            page_review_hashes = set()
+            with metrics.phase("dedup"):
+                for r in raw_reviews:
+                    review_key = review_hash(r)
+                    if review_key in seen_reviews or review_key in page_review_hashes:
+                        continue
+                    page_review_hashes.add(review_key)
+                    unique_reviews.append(r)
+            
+            # Filter reviews by date (the page's dates are parsed in one batch)
+            new_reviews = []
+            page_dates = []
+            with metrics.phase("date_parse"):
+                review_dates = parse_review_dates([r['review_date'] for r in unique_reviews])
+            for r, r_date in zip(unique_reviews, review_dates):
+                r['relative_date'] = r['review_date']
+                if r_date:
+                    r_date = r_date.replace(hour=0, minute=0, second=0, microsecond=0)
+                    page_dates.append(r_date)
+                    if job["from_date"] <= r_date <= job["to_date"]:
+                        r['review_date'] = r_date.strftime("%Y-%m-%d")
+                        r['product_url'] = product_url  # Add product URL to track source
+                        new_reviews.append(r)
+            
+            if job["store"] is not None and new_reviews:
+                # Only reviews earlier runs haven't stored are output by this run
+                in_window = len(new_reviews)
+                with metrics.phase("store"):
+                    new_reviews = job["store"].add_reviews(store_key, new_reviews, job["job_id"])
+                # Newest first: pages with nothing new mean the rest was scraped before
+                stored_pages = stored_pages + 1 if job["incremental"] and not new_reviews else 0
+                if in_window > len(new_reviews):
+                    print(f"   ↺ {in_window - len(new_reviews)} review(s) already in the store")
+            
+            # Save new reviews to every output sink (one writer at a time across workers)
+            # and commit the page: dedup state and page number change together with the output
+            with job["write_lock"], metrics.phase("write"):
+                if new_reviews:
+                    job["sink"].write(new_reviews)
+                    state["total_reviews"] += len(new_reviews)
+                    state["csv_readable_bytes"] = job["csv_sink"].flushed_bytes
+                    product_review_count += len(new_reviews)
+                    product_state["reviews"] = product_review_count
+                    state["recent_reviews"] = (new_reviews + state["recent_reviews"])[:5]
+                seen_reviews.update(page_review_hashes)
+                checkpoint.update_product(product_index, page=page_number, reviews=product_review_count)
+                if page_number % CHECKPOINT_EVERY_PAGES == 0:
+                    save_checkpoint(job)
+            
+            if new_reviews:
+                print(f"   ✓ Saved {len(new_reviews)} reviews | Product {product_index} Total: {product_review_count} | Overall Total: {state['total_reviews']}")
+            else:
+                print(f"   ⚠ No new reviews found on this iteration")
+            
+            metrics.page_done(product=product_index, page=page_number)
+            state["metrics"] = metrics.snapshot()
+            job["emit"](
+                "page", product=product_index, page=page_number, saved=len(new_reviews),
+                product_reviews=product_review_count, total_reviews=state["total_reviews"],
+                pages_done=state["current_page"], reviews=new_reviews[:5]
+            )
+            job["publish"]()
+            
+            if stored_pages >= STORED_PAGES_TO_STOP:
+                print(f"\n⏹ {stored_pages} page(s) in a row brought nothing new - the rest is already in the store")
+                break
+            if old_page_stop.update(page_dates):
+                stopped_early = True
+                break
         
-        # Save styled workbook
-        wb.save(excel_filename)
-        print(f"✨ Styled Excel file created: {excel_filename}")
-        return True
+        if stopped_early:
+            # Sorted newest first: every later page is older still
+            total_pages = total_pages or (scraper.get_total_pages() if pagination_mode else None)
+            pages_skipped = max(0, min(total_pages or max_pages, max_pages) - page_number)
+            seconds_per_page = (time.monotonic() - pages_started) / max(1, page_number - start_page + 1)
+            time_saved = round(pages_skipped * seconds_per_page)
+            with job["write_lock"]:
+                product_state["pages_skipped"] = pages_skipped
+                state["pages_skipped"] += pages_skipped
+                state["time_saved_seconds"] += time_saved
+            print(f"\n⏹ {job['stop_after_old_pages']} page(s) in a row older than {job['from_date'].date()} - "
+                  f"stopping early, skipped {'' if total_pages else 'up to '}{pages_skipped} page(s) (~{time_saved}s saved)")
         
+        if product_state["status"] != "cancelled":
+            print(f"\n✓ Product {product_index} complete - {page_number} page(s) (max {max_pages})")
+            print(f"   📊 Collected {product_review_count} reviews from this product\n")
+            product_state["status"] = "completed"
+                
     except Exception as e:
-        print(f"Excel conversion error: {e}")
-        return False
+        print(f"\n❌ Error scraping product {product_index}: {e}\n")
+        product_state["status"] = "error"
+        product_state["error"] = str(e)
+        state["error"] = f"Error on product {product_index}: {str(e)}"
+    finally:
+        # Left early (break or error): stop the page generator first, so shard threads
+        # are done with their drivers (shard 0 uses this product's) before any is reset
+        close_pages = getattr(pages, "close", None)
+        if close_pages is not None:
+            close_pages()
+        if shard_pool:
+            shard_pool.close()
+        # A crashed driver fails the reset and is recycled by the pool
+        if driver is not None:
+            driver_pool.release(driver)
+        with job["write_lock"]:
+            # Everything this product wrote is made durable before it counts as done;
+            # a failed or cancelled product keeps its page and dedup state so a resume continues it from there
+            if product_state["status"] == "completed":
+                checkpoint.finish_product(product_index, "completed")
+            else:
+                checkpoint.update_product(product_index, status=product_state["status"])
+            save_checkpoint(job)
+            state["products_completed"] += 1
+            job["emit"](
+                "product", product=product_index, status=product_state["status"], reviews=product_state["reviews"],
+                pages_skipped=product_state["pages_skipped"], error=product_state.get("error"),
+                products_completed=state["products_completed"], pages_skipped_total=state["pages_skipped"],
+                time_saved_seconds=state["time_saved_seconds"]
+            )
+            job["publish"](force=True)
 
-def scrape_task(product_urls, from_date_str, to_date_str, max_pages):
-    """Background scraping task - now supports multiple URLs"""
-    global scraping_state
+def scrape_task(product_urls, from_date_str, to_date_str, max_pages, concurrency=1, lean=False, min_delay=1.0,
+                fetch_mode="browser", http_concurrency=4, rate_limit=2.0, page_shards=1,
+                excel_split="rows", excel_layout="files", output_formats=("csv", "xlsx"), parquet_row_group_size=50000,
+                sort_recent=False, stop_after_old_pages=None, use_store=False, incremental=False,
+                job_id=None, resume=False, context=None):
+    """
+    Background scraping task - scrapes up to `concurrency` products in parallel.
+    Progress is checkpointed to output/jobs/<job_id>.json; resume=True continues
+    that job from its last committed pages (arguments must match the original run).
+    sort_recent: read reviews newest first and stop a product after
+    stop_after_old_pages (default 3; 0 = never) pages older than from_date.
+    use_store: also keep reviews in the cross-run review store (scraper.store);
+    the CSV then holds only reviews new to the store, and the Excel/Parquet
+    exports are built from the store at the end.
+    incremental: use_store + sort_recent, and stop each product once
+    STORED_PAGES_TO_STOP pages in a row had all their reviews stored already.
+    context: the scraper.jobs.JobContext when run by the job manager - its
+    state dict is updated in place, published as the job progresses, and a
+    cancel request stops the job after the current pages (resumable).
+    """
+    state = context.state if context else new_job_state()
+    # Per-phase timings and WebDriver calls of this job (also counted in the process-wide /api/metrics)
+    metrics = Metrics(parent=METRICS_REGISTRY)
+    driver_pool = None
+    sinks = None
+    store = None
+    if incremental:
+        use_store = sort_recent = True
     
     try:
-        scraping_state["status"] = "running"
-        scraping_state["is_running"] = True
-        scraping_state["current_page"] = 0
-        scraping_state["total_reviews"] = 0
-        scraping_state["error"] = None
+        state["status"] = "running"
+        state["is_running"] = True
+        state["current_page"] = 0
+        state["total_reviews"] = 0
+        state["recent_reviews"] = []
+        state["error"] = None
+        state["concurrency"] = concurrency
+        state["products_completed"] = 0
+        state["pages_skipped"] = 0
+        state["time_saved_seconds"] = 0
+        state["exported_reviews"] = 0
+        state["metrics"] = None
+        state["products"] = [
+            {"url": url, "status": "queued", "current_page": 0, "reviews": 0, "pages_skipped": 0, "error": None}
+            for url in product_urls
+        ]
         
         from_date = datetime.strptime(from_date_str, "%Y-%m-%d")
         to_date = datetime.strptime(to_date_str, "%Y-%m-%d")
@@ -181,126 +355,260 @@ def scrape_task(product_urls, from_date_str, to_date_str, max_pages):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_filename = f"{output_dir}/reviews_{timestamp}.csv"
-        excel_filename = f"{output_dir}/reviews_{timestamp}.xlsx"
+        # CSV is always written: it's the job's running record; Excel/Parquet are optional extra sinks
+        # (exported from the review store at the end instead when it's in use)
+        export_formats = [fmt for fmt in output_formats if fmt != "csv"]
+        formats = ["csv"] + ([] if use_store else export_formats)
         
-        scraping_state["csv_file"] = csv_filename
-        scraping_state["output_file"] = excel_filename
+        if resume:
+            checkpoint = JobCheckpoint.load(job_id)
+            base_path = checkpoint.base_path
+            # Drop rows written after the last checkpoint - those pages are scraped again
+            truncate_csv(f"{base_path}.csv", checkpoint.state["csv_bytes"])
+            state["total_reviews"] = checkpoint.state["total_reviews"]
+            for product_state, saved in zip(state["products"], checkpoint.state["products"]):
+                product_state["current_page"] = saved["page"]
+                product_state["reviews"] = saved["reviews"]
+            print(f"↩ Resuming job {job_id} ({state['total_reviews']} reviews already saved)")
+        else:
+            job_id = job_id or new_job_id()
+            base_path = f"{output_dir}/reviews_{job_id}"
+            checkpoint = JobCheckpoint(job_id, {
+                "product_urls": product_urls, "from_date_str": from_date_str, "to_date_str": to_date_str,
+                "max_pages": max_pages, "concurrency": concurrency, "lean": lean, "min_delay": min_delay,
+                "fetch_mode": fetch_mode, "http_concurrency": http_concurrency, "rate_limit": rate_limit,
+                "page_shards": page_shards, "excel_split": excel_split, "excel_layout": excel_layout,
+                "output_formats": list(output_formats), "parquet_row_group_size": parquet_row_group_size,
+                "sort_recent": sort_recent, "stop_after_old_pages": stop_after_old_pages,
+                "use_store": use_store, "incremental": incremental
+            }, base_path, formats, product_urls)
+            checkpoint.save()
+        csv_filename = f"{base_path}.csv"
         
-        # Process each URL
-        total_products = len(product_urls)
-        for product_index, product_url in enumerate(product_urls, 1):
-            print(f"\n{'='*60}")
-            print(f"📦 PRODUCT {product_index}/{total_products}")
-            print(f"🔗 URL: {product_url}")
-            print(f"{'='*60}\n")
-            
-            # Initialize scraper for this product
-            scraper = FlipkartScraper()
-            
-            try:
-                scraper.open_product_page(product_url)
-                scraper.go_to_all_reviews()
-                
-                # Track seen reviews (for infinite scroll deduplication)
-                seen_review_texts = set()
-                scroll_attempts = 0
-                max_scroll_attempts = max_pages
-                
-                # Detect pagination mode on first check
-                pagination_mode = scraper.has_next_button()
-                mode_name = "PAGINATION" if pagination_mode else "INFINITE SCROLL"
-                print(f"🔍 Detected mode: {mode_name}\n")
-                
-                product_review_count = 0
-                
-                while scroll_attempts < max_scroll_attempts:
-                    scroll_attempts += 1
-                    scraping_state["current_page"] = scroll_attempts
-                    
-                    # Extract ALL currently visible reviews
-                    raw_reviews = scraper.extract_page_data()
-                    
-                    # Filter reviews by date
-                    new_reviews = []
-                    for r in raw_reviews:
-                        # ALWAYS deduplicate - duplicates can appear in both modes
-                        review_id = f"{r.get('reviewer_name', '')}_{r.get('review', '')[:50]}"
-                        if review_id in seen_review_texts:
-                            continue
-                        seen_review_texts.add(review_id)
-                        
-                        raw_date_str = r['review_date']
-                        r['relative_date'] = raw_date_str
-                        r_date = parse_review_date(raw_date_str)
-                        
-                        if r_date:
-                            r_date = r_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                            if from_date <= r_date <= to_date:
-                                r['review_date'] = r_date.strftime("%Y-%m-%d")
-                                r['product_url'] = product_url  # Add product URL to track source
-                                new_reviews.append(r)
-                    
-                    # Save new reviews to CSV
-                    if new_reviews:
-                        append_to_csv(new_reviews, csv_filename)
-                        scraping_state["total_reviews"] += len(new_reviews)
-                        product_review_count += len(new_reviews)
-                        scraping_state["recent_reviews"] = (new_reviews + scraping_state["recent_reviews"])[:5]
-                        print(f"   ✓ Saved {len(new_reviews)} reviews | Product Total: {product_review_count} | Overall Total: {scraping_state['total_reviews']}")
-                    else:
-                        print(f"   ⚠ No new reviews found on this iteration")
-                    
-                    # Try to load more content
-                    if scroll_attempts < max_scroll_attempts:
-                        if not scraper.next_page():
-                            print(f"\n✓ Product {product_index} complete - reached end of content")
-                            print(f"   📊 Collected {product_review_count} reviews from this product\n")
-                            break
-                    else:
-                        print(f"\n✓ Product {product_index} complete - reached max iterations ({max_scroll_attempts})")
-                        print(f"   📊 Collected {product_review_count} reviews from this product\n")
-                        break
-                        
-            except Exception as e:
-                print(f"\n❌ Error scraping product {product_index}: {e}\n")
-                scraping_state["error"] = f"Error on product {product_index}: {str(e)}"
-            finally:
-                scraper.quit()
+        sinks = open_sinks(
+            formats, base_path,
+            excel_options={"split_by": "product" if excel_split == "product" else None, "layout": excel_layout},
+            parquet_options={"row_group_size": parquet_row_group_size}
+        )
+        if resume:
+            # Excel/Parquet are rebuilt from the committed CSV rows, then continue live
+            extra_sinks = MultiSink([sink for sink in sinks.sinks if not isinstance(sink, CsvSink)])
+            if extra_sinks.sinks:
+                replay_csv(csv_filename, extra_sinks)
+        
+        if use_store:
+            store = ReviewStore()
+        
+        state["job_id"] = job_id
+        state["csv_file"] = csv_filename
+        state["csv_readable_bytes"] = sinks.get(CsvSink).flushed_bytes
+        state["run_id"] = secrets.token_hex(4)
+        state["output_file"] = None
+        state["output_files"] = []
+        state["parquet_file"] = sinks.get(ParquetSink).path if sinks.get(ParquetSink) else None
+        
+        job = {
+            "state": state,
+            "cancelled": context.cancelled if context else (lambda: False),
+            "publish": context.publish if context else (lambda force=False: None),
+            "emit": context.emit if context else (lambda event_type, **data: None),
+            "from_date": from_date,
+            "to_date": to_date,
+            "max_pages": max_pages,
+            "csv_file": csv_filename,
+            "sink": sinks,
+            "csv_sink": sinks.get(CsvSink),
+            "checkpoint": checkpoint,
+            "job_id": job_id,
+            "store": store,
+            "incremental": incremental,
+            "total_products": len(product_urls),
+            "min_delay": min_delay,
+            "lean": lean,
+            "page_shards": page_shards,
+            "fetch_mode": fetch_mode,
+            "http_concurrency": http_concurrency,
+            "rate_limit": rate_limit,
+            "sort_recent": sort_recent,
+            # The early stop only holds when pages are sorted newest first
+            "stop_after_old_pages": (3 if stop_after_old_pages is None else stop_after_old_pages) if sort_recent else 0,
+            # Serializes sink writes, checkpoints and shared counters across workers
+            "metrics": metrics,
+            "write_lock": threading.Lock()
+        }
+        
+        # Streamed clients get the freshly reset state once the job has started
+        job["emit"]("status", **state)
+        job["publish"](force=True)
+        
+        # One warm browser per worker, reused across products (reset between them)
+        driver_pool = DriverPool(size=concurrency, lean=lean)
+        
+        with metrics.active(), ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                # bind(): product threads record into this job's metrics
+                executor.submit(bind_metrics(scrape_product), job, driver_pool, product_index, product_url)
+                for product_index, product_url in enumerate(product_urls, 1)
+            ]
+            for future in futures:
+                future.result()
         
+        cancelled = job["cancelled"]()
         print(f"\n{'='*60}")
-        print(f"🎉 ALL PRODUCTS COMPLETE")
-        print(f"📊 Total Reviews Collected: {scraping_state['total_reviews']}")
+        print(f"⏹ JOB CANCELLED - resume it with resume_job_id={job_id}" if cancelled else f"🎉 ALL PRODUCTS COMPLETE")
+        print(f"📊 Total Reviews Collected: {state['total_reviews']}")
         print(f"{'='*60}\n")
         
-        # Convert to Excel
-        if scraping_state["total_reviews"] > 0:
-            convert_csv_to_excel(csv_filename, excel_filename)
-            scraping_state["status"] = "completed"
+        # Finish every sink (Excel is split into several sheets/files past its row limit or per product)
+        excel_sink = sinks.get(ExcelSink)
+        with metrics.phase("export"):
+            sinks.close()
+        state["csv_readable_bytes"] = job["csv_sink"].flushed_bytes
+        excel_files = excel_sink.files if excel_sink else []
+        sinks = None
+        
+        output_count = state["total_reviews"]
+        if store and export_formats:
+            # Full picture for these products and dates: this run's reviews plus everything stored before
+            export_sinks = open_sinks(
+                export_formats, base_path,
+                excel_options={"split_by": "product" if excel_split == "product" else None, "layout": excel_layout},
+                parquet_options={"row_group_size": parquet_row_group_size}
+            )
+            try:
+                with metrics.phase("export"):
+                    output_count = store.export(
+                        export_sinks, [product_key(url) for url in product_urls],
+                        from_date.strftime("%Y-%m-%d"), to_date.strftime("%Y-%m-%d")
+                    )
+            finally:
+                excel_sink = export_sinks.get(ExcelSink)
+                with metrics.phase("export"):
+                    export_sinks.close()
+            excel_files = excel_sink.files if excel_sink else []
+            state["exported_reviews"] = output_count
+            state["parquet_file"] = export_sinks.get(ParquetSink).path if export_sinks.get(ParquetSink) else None
+            print(f"📦 Exported {output_count} stored reviews ({state['total_reviews']} new this run)")
+        
+        if output_count > 0:
+            state["output_files"] = excel_files
+            if len(excel_files) > 1:
+                # Several chunks - /api/download serves them as one zip
+                with metrics.phase("export"):
+                    state["output_file"] = zip_files(excel_files, f"{base_path}.zip")
+            elif excel_files:
+                state["output_file"] = excel_files[0]
+            state["status"] = "cancelled" if cancelled else "completed"
         else:
-            scraping_state["status"] = "completed"
-            scraping_state["error"] = "No reviews found"
+            state["status"] = "cancelled" if cancelled else "completed"
+            state["error"] = None if cancelled else "No reviews found"
             
     except Exception as e:
-        scraping_state["status"] = "error"
-        scraping_state["error"] = str(e)
+        state["status"] = "error"
+        state["error"] = str(e)
     finally:
-        scraping_state["is_running"] = False
+        if sinks:
+            # Error path: still flush what was collected
+            try:
+                sinks.close()
+            except Exception as e:
+                print(f"Error closing outputs: {e}")
+        if driver_pool:
+            driver_pool.close()
+        if store:
+            store.close()
+        # Per-job summary: where the time went
+        state["metrics"] = metrics.snapshot()
+        print(metrics.summary())
+        state["is_running"] = False
+        if context:
+            context.publish(force=True)
+
+def run_job(context):
+    """JobManager runner: one queued job, with the parameters it was submitted with"""
+    scrape_task(**context.params, job_id=context.job_id, resume=context.resume, context=context)
+
+# Jobs run at the same time by each API process; the rest wait in the queue
+JOB_SLOTS = int(os.environ.get('JOB_SLOTS', 1))
+# Queued jobs beyond this are refused with 429
+MAX_QUEUED_JOBS = int(os.environ.get('MAX_QUEUED_JOBS', 20))
+
+# Reviews returned per /api/reviews page at most
+MAX_REVIEWS_PER_PAGE = 1000
+# CSV row indexes kept for /api/reviews and the CSV download (one per job CSV)
+MAX_CSV_INDEXES = 32
+csv_indexes = {}
+csv_indexes_lock = threading.Lock()
+
+# Event streams check for new events at least this often (events from other worker processes)
+EVENT_POLL_SECONDS = 1.0
+EVENT_KEEPALIVE_SECONDS = 15
+# A stream is closed after this long; EventSource reconnects with Last-Event-ID and carries on
+# (a following CSV download ends too - clients reconnect with since_row)
+EVENT_STREAM_MAX_SECONDS = 300
+# Each open stream (event stream or following CSV download) holds a gunicorn thread; past this many
+# per process new streams get 503 and clients poll instead. Keep it below the worker's --threads
+# so other requests get through.
+MAX_EVENT_STREAMS = int(os.environ.get('MAX_EVENT_STREAMS', 4))
+event_stream_slots = threading.BoundedSemaphore(MAX_EVENT_STREAMS)
+
+job_store = JobStore()
+job_manager = JobManager(job_store, run_job, new_job_state, slots=JOB_SLOTS, max_queued=MAX_QUEUED_JOBS)
+
+@app.before_request
+def start_job_manager():
+    """Starts this process's job slots on its first request (importing api has no side effects)"""
+    job_manager.start()
 
 @app.route('/api/scrape', methods=['POST'])
 def start_scrape():
-    """Start scraping in background - supports multiple URLs"""
-    global scraping_state
+    """Queue a scrape job - supports multiple URLs. Returns its job_id and queue position."""
+    data = request.json
     
-    if scraping_state["is_running"]:
-        return jsonify({"error": "Scraping already in progress"}), 400
+    resume_job_id = data.get('resume_job_id')
+    if resume_job_id:
+        # Continue an interrupted job with its original settings
+        try:
+            params = JobCheckpoint.load(str(resume_job_id)).params
+        except (FileNotFoundError, ValueError):
+            return jsonify({"error": f"No checkpoint found for job {resume_job_id}"}), 404
+        # A job still 'running' on a worker that's gone is interrupted once its lease runs out
+        job_store.expire_leases()
+        existing = job_store.get(str(resume_job_id))
+        if existing and existing["status"] in ("queued", "running"):
+            return jsonify({"error": f"Job {resume_job_id} is already {existing['status']}"}), 409
+        try:
+            position = job_manager.submit(str(resume_job_id), params, resume=True)
+        except QueueFull as e:
+            return jsonify({"error": f"Too many jobs waiting ({e}) - try again later"}), 429
+        return jsonify({
+            "message": f"Resuming job {resume_job_id}",
+            "status": "queued",
+            "job_id": resume_job_id,
+            "queue_position": position,
+            "product_count": len(params["product_urls"]),
+            "concurrency": params["concurrency"]
+        })
     
-    data = request.json
     urls_input = data.get('url')
     from_date = data.get('from_date')
     to_date = data.get('to_date')
     max_pages = data.get('max_pages', 100)
+    concurrency = data.get('concurrency', 1)
+    lean = bool(data.get('lean', False))
+    min_delay = data.get('min_delay', 1.0)
+    fetch_mode = data.get('fetch_mode', 'browser')
+    http_concurrency = data.get('http_concurrency', 4)
+    rate_limit = data.get('rate_limit', 2.0)
+    page_shards = data.get('page_shards', 1)
+    excel_split = data.get('excel_split', 'rows')
+    excel_layout = data.get('excel_layout', 'files')
+    output_formats = data.get('output_formats', ['csv', 'xlsx'])
+    parquet_row_group_size = data.get('parquet_row_group_size', 50000)
+    sort_recent = bool(data.get('sort_recent', False))
+    use_store = bool(data.get('use_store', False))
+    incremental = bool(data.get('incremental', False))
+    stop_after_old_pages = data.get('stop_after_old_pages')
     
     if not all([urls_input, from_date, to_date]):
         return jsonify({"error": "Missing required fields"}), 400
@@ -316,42 +624,345 @@ def start_scrape():
         if 'flipkart.com' not in url:
             return jsonify({"error": f"Invalid Flipkart URL: {url}"}), 400
     
-    # Start scraping in background thread
-    thread = threading.Thread(
-        target=scrape_task,
-        args=(product_urls, from_date, to_date, max_pages)
-    )
-    thread.daemon = True
-    thread.start()
+    try:
+        concurrency = int(concurrency)
+    except (TypeError, ValueError):
+        return jsonify({"error": "concurrency must be an integer"}), 400
+    try:
+        min_delay = max(0.0, float(min_delay))
+    except (TypeError, ValueError):
+        return jsonify({"error": "min_delay must be a number of seconds"}), 400
+    if excel_split not in ('rows', 'product') or excel_layout not in ('files', 'sheets'):
+        return jsonify({"error": "excel_split must be 'rows' or 'product', excel_layout 'files' or 'sheets'"}), 400
+    if not isinstance(output_formats, list) or not set(output_formats) <= {'csv', 'xlsx', 'parquet'}:
+        return jsonify({"error": "output_formats must be a list of 'csv', 'xlsx', 'parquet'"}), 400
+    if 'parquet' in output_formats and importlib.util.find_spec("pyarrow") is None:
+        # Optional dependency - fail the request, not the job once it has started
+        return jsonify({"error": "Parquet output isn't available on this server (pyarrow is not installed)"}), 400
+    try:
+        parquet_row_group_size = max(1, int(parquet_row_group_size))
+    except (TypeError, ValueError):
+        return jsonify({"error": "parquet_row_group_size must be an integer"}), 400
+    try:
+        stop_after_old_pages = None if stop_after_old_pages is None else max(0, int(stop_after_old_pages))
+    except (TypeError, ValueError):
+        return jsonify({"error": "stop_after_old_pages must be an integer"}), 400
+    if fetch_mode not in ('browser', 'http'):
+        return jsonify({"error": "fetch_mode must be 'browser' or 'http'"}), 400
+    try:
+        http_concurrency = max(1, int(http_concurrency))
+        rate_limit = float(rate_limit)
+        page_shards = max(1, min(int(page_shards), MAX_CONCURRENCY))
+    except (TypeError, ValueError):
+        return jsonify({"error": "http_concurrency, rate_limit and page_shards must be numbers"}), 400
+    # No point in more browsers than products
+    concurrency = max(1, min(concurrency, MAX_CONCURRENCY, len(product_urls)))
+    
+    # Queue the job - a free job slot (in any API worker) picks it up
+    job_id = new_job_id()
+    params = {
+        "product_urls": product_urls, "from_date_str": from_date, "to_date_str": to_date,
+        "max_pages": max_pages, "concurrency": concurrency, "lean": lean, "min_delay": min_delay,
+        "fetch_mode": fetch_mode, "http_concurrency": http_concurrency, "rate_limit": rate_limit,
+        "page_shards": page_shards, "excel_split": excel_split, "excel_layout": excel_layout,
+        "output_formats": output_formats, "parquet_row_group_size": parquet_row_group_size,
+        "sort_recent": sort_recent, "stop_after_old_pages": stop_after_old_pages,
+        "use_store": use_store, "incremental": incremental
+    }
+    try:
+        position = job_manager.submit(job_id, params)
+    except QueueFull as e:
+        return jsonify({"error": f"Too many jobs waiting ({e}) - try again later"}), 429
     
     return jsonify({
-        "message": f"Scraping started for {len(product_urls)} product(s)", 
-        "status": "running",
-        "product_count": len(product_urls)
+        "message": f"Scraping queued for {len(product_urls)} product(s)",
+        "status": "queued",
+        "job_id": job_id,
+        "queue_position": position,
+        "product_count": len(product_urls),
+        "concurrency": concurrency
     })
 
+def job_status(job):
+    """Status payload for a job row: its last published state plus the job's own status"""
+    state = job["state"] or new_job_state()
+    return {
+        **state,
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "is_running": job["status"] in ("queued", "running"),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+
+@app.route('/api/config', methods=['GET'])
+def get_config():
+    """Server limits the web UI adapts to"""
+    return jsonify({"max_concurrency": MAX_CONCURRENCY})
+
 @app.route('/api/status', methods=['GET'])
 def get_status():
-    """Get current scraping status"""
-    return jsonify(scraping_state)
+    """Status of the most recent job (idle state when there is none)"""
+    job = job_store.latest()
+    return jsonify(job_status(job) if job else new_job_state())
 
-@app.route('/api/download', methods=['GET'])
-def download_file():
-    """Download the Excel file"""
-    if scraping_state["output_file"] and os.path.exists(scraping_state["output_file"]):
+@app.route('/api/status/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Status of one job"""
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+    return jsonify(job_status(job))
+
+def sse_message(event_type, data, event_id=None):
+    """One Server-Sent Events message"""
+    message = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{message}event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/events/<job_id>', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Progress stream (Server-Sent Events): a 'snapshot' of the job's status,
+    then 'status', 'page' and 'product' deltas as they happen, and 'end' with
+    the final status. Reconnects resume after the Last-Event-ID header.
+    """
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+    if not event_stream_slots.acquire(blocking=False):
+        return jsonify({"error": "Too many open event streams - poll /api/status/<job_id> instead"}), 503, {"Retry-After": "30"}
+    resume_after = request.headers.get('Last-Event-ID', type=int)
+    
+    def events():
+        after = resume_after
+        if after is None:
+            # Deltas after this id may already be in the snapshot - they only carry absolute totals, so replaying them is harmless
+            after = job_store.last_event_id()
+            snapshot = job_status(job_store.get(job_id))
+            yield sse_message("snapshot", snapshot, after)
+            if not snapshot["is_running"]:
+                yield sse_message("end", snapshot, after)
+                return
+        elif job["status"] in FINISHED_STATUSES and not job_store.events_since(job_id, after, limit=1):
+            yield sse_message("end", job_status(job), after)
+            return
+        
+        opened = last_sent = time.monotonic()
+        while time.monotonic() - opened < EVENT_STREAM_MAX_SECONDS:
+            batch = job_store.events_since(job_id, after)
+            for event_id, event_type, data in batch:
+                after = event_id
+                if event_type == "end":
+                    yield sse_message("end", job_status(job_store.get(job_id)), event_id)
+                    return
+                yield sse_message(event_type, data, event_id)
+            now = time.monotonic()
+            if batch:
+                last_sent = now
+                continue
+            if now - last_sent >= EVENT_KEEPALIVE_SECONDS:
+                # Comment line: keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                last_sent = now
+            job_store.wait_for_events(EVENT_POLL_SECONDS)
+    
+    response = Response(events(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no" # Unbuffered through nginx
+    })
+    # Called when the stream ends or the client goes away
+    response.call_on_close(event_stream_slots.release)
+    return response
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text format: phase timings and WebDriver commands of every job this process ran, plus job counts"""
+    lines = [METRICS_REGISTRY.prometheus().rstrip("\n"),
+             "# HELP scraper_jobs Jobs by status (all workers).",
+             "# TYPE scraper_jobs gauge"]
+    lines += [f'scraper_jobs{{status="{status}"}} {count}' for status, count in job_store.count_by_status().items()]
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Recent jobs, newest first (?limit=N, default 50)"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify([
+        {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+            "product_count": len(job["params"].get("product_urls", [])),
+            "total_reviews": (job["state"] or {}).get("total_reviews", 0)
+        }
+        for job in job_store.list(limit)
+    ])
+
+def send_job_output(job):
+    """Sends a job's Excel file (or the zip of all chunks when the export was split)"""
+    output_file = (job["state"] or {}).get("output_file") if job else None
+    if output_file and os.path.exists(output_file):
         return send_file(
-            scraping_state["output_file"],
+            output_file,
             as_attachment=True,
-            download_name=os.path.basename(scraping_state["output_file"])
+            download_name=os.path.basename(output_file)
         )
     return jsonify({"error": "File not found"}), 404
 
+@app.route('/api/download', methods=['GET'])
+def download_file():
+    """Download the most recent job's Excel output"""
+    return send_job_output(job_store.latest())
+
+@app.route('/api/download/<job_id>', methods=['GET'])
+def download_job_file(job_id):
+    """Download a job's Excel output"""
+    return send_job_output(job_store.get(job_id))
+
+def job_csv(job):
+    """(path, readable bytes, CsvRowIndex) for a job's CSV, or None before it has one"""
+    state = job["state"] or {}
+    path = state.get("csv_file")
+    if not path or not os.path.isfile(path):
+        return None
+    size = os.path.getsize(path)
+    # Finished jobs closed their CSV; a running (or crashed) one is only complete up to its last flush
+    readable = size if job["status"] in ("completed", "cancelled", "error") else min(state.get("csv_readable_bytes", 0), size)
+    key = (path, state.get("run_id"))
+    with csv_indexes_lock:
+        index = csv_indexes.pop(key, None) or CsvRowIndex(path)
+        csv_indexes[key] = index
+        while len(csv_indexes) > MAX_CSV_INDEXES:
+            # Least recently used first
+            csv_indexes.pop(next(iter(csv_indexes)))
+    return path, readable, index
+
+@app.route('/api/reviews/<job_id>', methods=['GET'])
+def get_job_reviews(job_id):
+    """
+    Page through a job's reviews while it runs (?offset=0&limit=100, limit up to 1000).
+    Reads the CSV through a sparse row index, so deep pages don't load the file.
+    """
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = max(1, min(request.args.get('limit', 100, type=int), MAX_REVIEWS_PER_PAGE))
+    
+    reviews, total = [], 0
+    csv_info = job_csv(job)
+    if csv_info:
+        path, readable, index = csv_info
+        reviews = index.read(offset, limit, readable)
+        total = index.rows
+    return jsonify({
+        "job_id": job_id,
+        "status": job["status"],
+        "is_running": job["status"] in ("queued", "running"),
+        "offset": offset,
+        "limit": limit,
+        "total": total, # Rows readable so far
+        "next_offset": offset + len(reviews),
+        "reviews": reviews
+    })
+
+@app.route('/api/download/<job_id>/csv', methods=['GET'])
+def download_job_csv(job_id):
+    """
+    The job's CSV as it is now, while the job runs too. Honours Range requests.
+    ?since_row=N streams from data row N (header too unless header=0);
+    ?follow=1 keeps the response open and streams new rows until the job ends
+    (or EVENT_STREAM_MAX_SECONDS pass - continue with since_row).
+    """
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+    csv_info = job_csv(job)
+    if not csv_info:
+        return jsonify({"error": "No reviews written yet"}), 404
+    path, readable, index = csv_info
+    since_row = request.args.get('since_row', type=int)
+    follow = request.args.get('follow') in ('1', 'true')
+    headers = {"Content-Disposition": f'attachment; filename="{os.path.basename(path)}"'}
+    
+    if since_row is None and not follow:
+        # Snapshot of the complete rows so far
+        headers["Accept-Ranges"] = "bytes"
+        if request.range is None:
+            return Response(iter_file_range(path, 0, readable), mimetype="text/csv",
+                            headers={**headers, "Content-Length": str(readable)})
+        byte_range = request.range.range_for_length(readable)
+        if byte_range is None:
+            return Response(status=416, headers={"Content-Range": f"bytes */{readable}"})
+        start, end = byte_range
+        return Response(iter_file_range(path, start, end), status=206, mimetype="text/csv", headers={
+            **headers, "Content-Length": str(end - start), "Content-Range": f"bytes {start}-{end - 1}/{readable}"
+        })
+    
+    with_header = request.args.get('header', '1') not in ('0', 'false')
+    run_id = (job["state"] or {}).get("run_id")
+    # Following holds a thread like an event stream, so it takes one of their slots
+    if follow and not event_stream_slots.acquire(blocking=False):
+        return jsonify({"error": "Too many open streams - download without follow=1, then again with since_row"}), 503, {"Retry-After": "30"}
+    
+    def rows():
+        nonlocal readable
+        since = max(0, since_row or 0)
+        position = None
+        finished = job["status"] not in ("queued", "running")
+        opened = time.monotonic()
+        while True:
+            total = index.refresh(readable)
+            if position is None and index.fieldnames is not None and (total >= since or finished):
+                position = index.offset_of(since, readable)
+                if with_header:
+                    yield index.header_bytes()
+            if position is not None:
+                # Whole rows only: the index stops at the last complete one
+                yield from iter_file_range(path, position, index.scanned)
+                position = index.scanned
+            if not follow or finished or time.monotonic() - opened >= EVENT_STREAM_MAX_SECONDS:
+                return
+            job_store.wait_for_events(EVENT_POLL_SECONDS)
+            current = job_store.get(job_id)
+            if (current["state"] or {}).get("run_id") != run_id:
+                # Restarted (resume) - its CSV was cut back; reconnect with since_row
+                return
+            finished = current["status"] not in ("queued", "running")
+            csv_info = job_csv(current)
+            if csv_info:
+                readable = csv_info[1]
+    
+    response = Response(rows(), mimetype="text/csv", headers=headers)
+    if follow:
+        response.call_on_close(event_stream_slots.release)
+    return response
+
+def cancel_job(job_id):
+    status = job_store.request_cancel(job_id)
+    if status is None:
+        return jsonify({"error": f"Unknown job {job_id}"}), 404
+    if status == "running":
+        message = "Stop requested (will finish the pages in progress; resume with resume_job_id)"
+    elif status == "cancelled":
+        message = "Job cancelled"
+    else:
+        message = f"Job already {status}"
+    return jsonify({"message": message, "job_id": job_id, "status": status})
+
 @app.route('/api/stop', methods=['POST'])
 def stop_scrape():
-    """Stop the current scraping (graceful)"""
-    # Note: This is a simple implementation. For true stopping, 
-    # we'd need to implement a flag check in the scraping loop
-    return jsonify({"message": "Stop requested (will finish current page)"})
+    """Stop the most recent running job"""
+    job = next((job for job in job_store.list() if job["status"] == "running"), None)
+    if not job:
+        return jsonify({"error": "No job is running"}), 404
+    return cancel_job(job["job_id"])
+
+@app.route('/api/stop/<job_id>', methods=['POST'])
+def stop_job(job_id):
+    """Cancel a queued job, or stop a running one after its current pages"""
+    return cancel_job(job_id)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,200 @@
+"""
+Fake WebDriver for offline benchmarks.
+
+Serves FixtureSite pages from memory and answers the WebDriver commands
+FlipkartScraper sends - get, find_element(s), element text/click,
+page_source and the scraper's own scripts (bulk extraction, infinite-scroll
+wait) - with lxml standing in for the browser. Every command that would be a
+WebDriver round trip is counted in `calls`, so benchmarks can report
+commands per page.
+"""
+from collections import Counter
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from scraper.flipkart import BULK_EXTRACT_JS, SCROLL_AND_WAIT_JS, REVIEW_MARKER_XPATH
+from scraper.parser import parse_html
+
+BASE_URL = "https://www.flipkart.com"
+
+_MARK = "data-fk-scraped"
+
+
+class FakeElement:
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+        self._generation = driver.generation
+
+    def _check(self):
+        if self._generation != self._driver.generation:
+            raise StaleElementReferenceException("element is not attached to the page document")
+
+    @property
+    def text(self):
+        self._driver.calls["element.text"] += 1
+        self._check()
+        return self._node.text_content().strip()
+
+    def is_enabled(self):
+        self._driver.calls["element.is_enabled"] += 1
+        self._check()
+        return True
+
+    def get_attribute(self, name):
+        self._driver.calls["element.get_attribute"] += 1
+        self._check()
+        return self._node.get(name)
+
+    def find_elements(self, by, xpath):
+        self._driver.calls["element.find_elements"] += 1
+        self._check()
+        return [FakeElement(self._driver, node) for node in self._node.xpath(xpath)]
+
+    def click(self):
+        self._driver.calls["element.click"] += 1
+        self._check()
+        self._driver._click(self._node)
+
+
+class FakeDriver:
+    """
+    Stands in for a Chrome WebDriver on a FixtureSite.
+
+    Paginated sites navigate through the Next link's href; infinite-scroll
+    sites append the next page's reviews on each scroll script.
+    """
+    def __init__(self, site, base_url=BASE_URL):
+        self.site = site
+        self.base_url = base_url
+        self.calls = Counter()
+        self.generation = 0
+        self.tree = None
+        self._url = "about:blank"
+        self._loaded_pages = 0
+
+    # Navigation
+
+    def get(self, url):
+        self.calls["get"] += 1
+        self._load(url if "://" in url else self.base_url + url)
+
+    def _load(self, url):
+        self._url = url
+        page = self.site.page_number(url)
+        source = self.site.page(page) or "<html><body><p>No reviews</p></body></html>"
+        self.tree = parse_html(source)
+        self._loaded_pages = page
+        self.generation += 1
+
+    def _click(self, node):
+        href = node.get("href")
+        if href:
+            self._load(href if "://" in href else self.base_url + href)
+
+    def _scroll(self):
+        """Appends the next page's review blocks (infinite scroll). Returns True if any were added."""
+        next_source = self.site.page(self._loaded_pages + 1)
+        if next_source is None:
+            return False
+        self._loaded_pages += 1
+        container = self.tree.get_element_by_id("reviews")
+        for block in parse_html(next_source).get_element_by_id("reviews"):
+            container.append(block)
+        return True
+
+    @property
+    def current_url(self):
+        self.calls["current_url"] += 1
+        return self._url
+
+    @property
+    def page_source(self):
+        self.calls["page_source"] += 1
+        return lxml_html.tostring(self.tree, encoding="unicode")
+
+    # Elements
+
+    def find_elements(self, by, xpath):
+        self.calls["find_elements"] += 1
+        return [FakeElement(self, node) for node in self.tree.xpath(xpath)]
+
+    def find_element(self, by, xpath):
+        self.calls["find_element"] += 1
+        nodes = self.tree.xpath(xpath)
+        if not nodes:
+            raise NoSuchElementException(xpath)
+        return FakeElement(self, nodes[0])
+
+    # Scripts
+
+    def execute_script(self, script, *args):
+        self.calls["execute_script"] += 1
+        if script == BULK_EXTRACT_JS:
+            return self._bulk_extract(*args)
+        if "scrollHeight" in script:
+            return len(self.tree.xpath(REVIEW_MARKER_XPATH)) * 400
+        if "navigator.userAgent" in script:
+            return "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+        if "click()" in script and args:
+            args[0]._click(args[0]._node)
+        return None
+
+    def execute_async_script(self, script, *args):
+        self.calls["execute_async_script"] += 1
+        if script != SCROLL_AND_WAIT_JS:
+            return None
+        count = lambda: len(self.tree.xpath(args[0]))
+        height = lambda: count() * 400
+        before = {"count": count(), "height": height()}
+        self._scroll()
+        return {"before": before, "after": {"count": count(), "height": height()}}
+
+    def _bulk_extract(self, markers, rankings, fallback, date_xpath, only_new, full_fields):
+        # Same signature, cascade, lazy field alternatives and marker attribute as BULK_EXTRACT_JS
+        signature = "+".join(name for name, xpath in markers if self.tree.xpath(f"boolean({xpath})"))
+        ranking = rankings.get(signature) or fallback
+        for strategy in ranking["strategies"]:
+            seen = 0
+            blocks = []
+            for block in self.tree.xpath(strategy):
+                if only_new and block.get(_MARK):
+                    seen += 1
+                elif len(block.text_content().strip()) > 20:
+                    blocks.append(block)
+            if not blocks and not seen:
+                continue
+            reviews = []
+            for block in blocks:
+                raw = {}
+                for field, xpaths in ranking["fields"].items():
+                    raw[field] = [None] * len(xpaths)
+                    for i, xpath in enumerate(xpaths):
+                        found = block.xpath(xpath)
+                        if found:
+                            raw[field][i] = found[0].text_content()
+                            if raw[field][i].strip() and field not in full_fields:
+                                break
+                raw["dates"] = [node.text_content() for node in block.xpath(date_xpath)]
+                block.set(_MARK, "1")
+                reviews.append(raw)
+            return {"signature": signature, "strategy": strategy, "reviews": reviews}
+        return {"signature": signature, "strategy": None, "reviews": []}
+
+    # Session
+
+    def set_script_timeout(self, seconds):
+        self.calls["set_script_timeout"] += 1
+
+    def get_cookies(self):
+        self.calls["get_cookies"] += 1
+        return [{"name": "T", "value": "bench", "domain": "", "path": "/"}]
+
+    def delete_all_cookies(self):
+        self.calls["delete_all_cookies"] += 1
+
+    def quit(self):
+        pass
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
@@ -0,0 +1,133 @@
+"""
+Synthetic Flipkart review pages for offline benchmarks.
+
+Pages are generated, not recorded: they follow the markup the scraper's
+selectors target (scraper.parser) in both layouts, with realistic page
+chrome around the reviews, so extraction cost and the strategy cascade are
+exercised without hitting flipkart.com:
+
+- "new": MKiFS6 ratings, G4PxIA bodies, zJ1ZGa/ZDi3w2 name and date lines
+- "old": _2wzgFH blocks, _3LWZlK ratings, t-ZTKy bodies, _2sc7ZR/_2V5EHH footer
+
+Content is deterministic (seeded per page), so runs are comparable.
+"""
+import html
+import random
+from urllib.parse import parse_qs, urlsplit
+
+LAYOUTS = ("new", "old")
+REVIEWS_PER_PAGE = 10
+
+PRODUCT_PATH = "/bench-phone/product-reviews/itm0123456789abc"
+PRODUCT_QUERY = "pid=BENCH0123456789"
+
+_WORDS = (
+    "battery camera display performance value money delivery quality sound build "
+    "charging speed heating gaming photos night mode screen brightness smooth lag "
+    "design weight grip software updates price worth excellent decent average poor"
+).split()
+_TITLES = ("Wonderful", "Terrific purchase", "Just okay", "Worth every penny", "Not recommended", "Super!", "Fair")
+_NAMES = ("Aarav Sharma", "Priya Nair", "Flipkart Customer", "Rohit K", "Sneha Patel", "Vikram Singh", "Ananya R")
+_DATES = ("2 days ago", "5 days ago", "3 weeks ago", "1 month ago", "6 months ago", "Mar, 2024", "Nov, 2023")
+
+
+def _review(rng):
+    words = rng.randint(8, 120)
+    return {
+        "rating": rng.randint(1, 5),
+        "title": rng.choice(_TITLES),
+        "body": " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + ".",
+        "name": rng.choice(_NAMES),
+        "date": rng.choice(_DATES)
+    }
+
+
+def _new_block(r):
+    return f"""
+<div class="col EPCmJX Ma1fCG"><div class="x_CUu6">
+  <div class="row"><div class="MKiFS6 Ga3i8K">{r['rating']}<img src="star.svg" class="Rza2QY"></div><p class="qW2QI1">{html.escape(r['title'])}</p></div>
+  <div class="row"><div class="G4PxIA"><div><div class="">{html.escape(r['body'])}</div></div><span class="wTYmpv">READ MORE</span></div></div>
+  <div class="row gHqwa8"><div class="row"><p class="zJ1ZGa ZDi3w2">{html.escape(r['name'])}</p><svg width="14" height="14"></svg><p class="MztJPv"><span>Certified Buyer</span></p><p class="zJ1ZGa">{r['date']}</p></div>
+  <div class="row"><div class="_6kK6mk"><span class="tl9VpF">{r['rating'] * 7}</span></div><div class="_6kK6mk aQymJL"><span class="tl9VpF">{r['rating']}</span></div></div></div>
+</div></div>"""
+
+
+def _old_block(r):
+    return f"""
+<div class="col _2wzgFH K0kLPL">
+  <div class="row"><div class="_3LWZlK _1BLPMq">{r['rating']}<img src="star.svg" class="_1wB99o"></div><p class="_2-N8zT">{html.escape(r['title'])}</p></div>
+  <div class="row"><div class="t-ZTKy"><div><div class="">{html.escape(r['body'])}</div></div><span class="_1H-bmy"><span>READ MORE</span></span></div></div>
+  <div class="row _3n8db9"><div class="row"><p class="_2sc7ZR _2V5EHH">{html.escape(r['name'])}</p><svg width="14" height="14"></svg><p class="_2mcZGG"><span>Certified Buyer</span></p><p class="_2sc7ZR">{r['date']}</p></div></div>
+</div>"""
+
+
+def _pagination(layout, page, total_pages, infinite_scroll):
+    if infinite_scroll:
+        return ""
+    link_class = "_9QVEpD" if layout == "new" else "_1LKTO3"
+    nav_class = "WSL9JP" if layout == "new" else "yFHi8N"
+    links = [
+        f'<a class="cn++Ap{" A1msZJ" if n == page else ""}" href="{page_url(n)}">{n}</a>'
+        for n in range(max(1, page - 4), min(total_pages, page + 5) + 1)
+    ]
+    if page < total_pages:
+        links.append(f'<a class="{link_class}" href="{page_url(page + 1)}"><span>Next</span></a>')
+    return (f'<div class="_1G0WLw mpIySA"><span>Page {page} of {total_pages:,}</span>'
+            f'<nav class="{nav_class}">{"".join(links)}</nav></div>')
+
+
+def page_url(page, base=""):
+    return f"{base}{PRODUCT_PATH}?{PRODUCT_QUERY}&page={page}"
+
+
+def reviews_for_page(page, seed=0):
+    rng = random.Random(f"{seed}:{page}")
+    return [_review(rng) for _ in range(REVIEWS_PER_PAGE)]
+
+
+def review_page_html(layout, page, total_pages, infinite_scroll=False, seed=0):
+    """Full HTML of review page `page` of `total_pages`."""
+    block = _new_block if layout == "new" else _old_block
+    blocks = "".join(block(r) for r in reviews_for_page(page, seed))
+    rating_bar = "".join(
+        f'<li class="fQ-FC1"><div class="BArk-j">{stars}★</div><div class="_1Y6ZGK"></div></li>'
+        for stars in range(5, 0, -1)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Bench Phone Reviews</title>
+<style>.col{{display:block}}</style><script>window.__INITIAL_STATE__ = {{"pageDataV4": {{"page": {page}}}}};</script></head>
+<body><div id="container"><div class="_1kfTjk"><header class="_3ZqtNW"><a href="/">Flipkart</a><input name="q" placeholder="Search"></header></div>
+<div class="_39kFie N3De93"><div class="DOjaWF YJG4Cf">
+  <div class="cPHDOP col-12-12"><div class="_3HJNb- "><div class="KzDlHZ">Bench Phone (Midnight, 128 GB)</div><div class="Nx9bqj">₹19,999</div></div></div>
+  <div class="cPHDOP col-12-12"><div class="row"><div class="col-3-12"><div class="ipqd2A">4.3★</div><div class="j-PBvV">12,345 Ratings &amp; 1,234 Reviews</div></div>
+    <div class="col-9-12"><ul class="+psZUR">{rating_bar}</ul></div></div></div>
+  <div class="cPHDOP col-12-12" id="reviews">{blocks}</div>
+  {_pagination(layout, page, total_pages, infinite_scroll)}
+</div></div>
+<footer class="jALP6D"><p>© 2007-2026 Flipkart.com</p></footer></div></body></html>"""
+
+
+class FixtureSite:
+    """A product with `total_pages` review pages in one layout, addressed by URL (?page=N)."""
+    def __init__(self, layout="new", total_pages=50, infinite_scroll=False, seed=0):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        self.layout = layout
+        self.total_pages = total_pages
+        self.infinite_scroll = infinite_scroll
+        self.seed = seed
+        self._cache = {}
+
+    @staticmethod
+    def page_number(url):
+        """Page requested by a review page URL (1 when it has none)."""
+        values = parse_qs(urlsplit(url).query).get("page")
+        return int(values[0]) if values and values[0].isdigit() else 1
+
+    def page(self, page):
+        """HTML of page `page`, or None past the last page."""
+        if not 1 <= page <= self.total_pages:
+            return None
+        if page not in self._cache:
+            self._cache[page] = review_page_html(self.layout, page, self.total_pages, self.infinite_scroll, self.seed)
+        return self._cache[page]
@@ -0,0 +1,351 @@
+"""
+Offline scraping and export benchmarks, so regressions in extraction,
+pagination or the exporters show up between commits without touching
+flipkart.com.
+
+Review pages come from benchmarks/fixtures.py (synthetic pages in the old
+and new Flipkart layouts) and are served by a fake WebDriver
+(benchmarks/fake_driver.py), a local HTTP stand-in (--http) or headless
+Chrome loading them from that stand-in (--chrome). Every scenario runs in a
+fresh interpreter, so its peak RSS is its own. Scrapers start with an empty
+in-memory SelectorCache, so the selector order is learned on page 1 of each
+scenario and never read from or written to output/.
+
+Scenarios and what they report:
+- extract:<layout>:<extraction>:<paginate|scroll> - FlipkartScraper.iter_review_pages
+  on the fake driver: pages/s, reviews/s, WebDriver calls per page
+- http:<layout> - browser page 1 + scraper.http_fetch for the rest, from the local server
+- chrome:<layout> - real headless Chrome against the local server (calls counted at the command executor)
+- export:<csv|xlsx|parquet>:<rows> - sink write + close time for N rows
+All of them also report seconds and peak_rss_mb.
+
+Usage:
+    python benchmarks/scrape_bench.py [--pages 50] [--rows 10000,100000,1000000]
+        [--http] [--chrome] [--only extract] [--output bench.json] [--compare old.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import LAYOUTS, REVIEWS_PER_PAGE, FixtureSite, page_url, reviews_for_page
+
+EXTRACTIONS = ("bulk", "offline", "elements")
+EXPORT_FORMATS = ("csv", "xlsx", "parquet")
+
+# Metrics compared by --compare, and whether higher is better
+COMPARED_METRICS = {
+    "pages_per_second": True,
+    "reviews_per_second": True,
+    "rows_per_second": True,
+    "calls_per_page": False,
+    "seconds": False,
+    "peak_rss_mb": False
+}
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def scenario_names(args):
+    names = []
+    if not args.only or args.only == "extract":
+        for layout in LAYOUTS:
+            for extraction in EXTRACTIONS:
+                for navigation in ("paginate", "scroll"):
+                    names.append(f"extract:{layout}:{extraction}:{navigation}")
+    if args.http and (not args.only or args.only == "http"):
+        names.extend(f"http:{layout}" for layout in LAYOUTS)
+    if args.chrome and (not args.only or args.only == "chrome"):
+        names.extend(f"chrome:{layout}" for layout in LAYOUTS)
+    if not args.only or args.only == "export":
+        for fmt in EXPORT_FORMATS:
+            names.extend(f"export:{fmt}:{rows}" for rows in args.rows)
+    return names
+
+
+# Scraping scenarios
+
+class FixtureServer:
+    """Serves a FixtureSite over HTTP on 127.0.0.1 (a stand-in for flipkart.com)."""
+    def __init__(self, site):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                body = site.page(site.page_number(handler.path))
+                if body is None:
+                    handler.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/html; charset=utf-8")
+                handler.send_header("Content-Length", str(len(data)))
+                handler.end_headers()
+                handler.wfile.write(data)
+
+            def log_message(handler, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def scrape_result(pages, seconds, calls):
+    page_count = len(pages)
+    reviews = sum(len(reviews) for _, reviews in pages)
+    return {
+        "pages": page_count,
+        "reviews": reviews,
+        # Fixture pages hold REVIEWS_PER_PAGE reviews each; a difference means extraction changed
+        "reviews_expected": page_count * REVIEWS_PER_PAGE,
+        "seconds": round(seconds, 4),
+        "pages_per_second": round(page_count / seconds, 2) if seconds else None,
+        "reviews_per_second": round(reviews / seconds, 1) if seconds else None,
+        "calls": sum(calls.values()),
+        "calls_per_page": round(sum(calls.values()) / max(1, page_count), 2),
+        "calls_by_command": dict(calls.most_common())
+    }
+
+
+def run_extract(layout, extraction, navigation, pages):
+    from fake_driver import FakeDriver
+    from scraper.flipkart import FlipkartScraper
+    from scraper.selector_cache import SelectorCache
+
+    scroll = navigation == "scroll"
+    driver = FakeDriver(FixtureSite(layout, pages, infinite_scroll=scroll))
+    driver.get(page_url(1))
+    driver.calls.clear()
+    scraper = FlipkartScraper(driver=driver, extraction=extraction, min_delay=0, max_delay=0, max_wait=1,
+                              selectors=SelectorCache())
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = list(scraper.iter_review_pages(pages, only_new=scroll))
+    return scrape_result(result, time.perf_counter() - started, driver.calls)
+
+
+def run_http(layout, pages):
+    from fake_driver import FakeDriver
+    from scraper.flipkart import FlipkartScraper
+    from scraper.selector_cache import SelectorCache
+    from scraper.http_fetch import iter_review_pages_http
+
+    site = FixtureSite(layout, pages)
+    server = FixtureServer(site)
+    try:
+        driver = FakeDriver(site, base_url=server.base_url)
+        driver.get(page_url(1))
+        driver.calls.clear()
+        scraper = FlipkartScraper(driver=driver, min_delay=0, max_delay=0, max_wait=1, selectors=SelectorCache())
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = list(iter_review_pages_http(scraper, pages, concurrency=4, rate_limit=0))
+        return scrape_result(result, time.perf_counter() - started, driver.calls)
+    finally:
+        server.close()
+
+
+def run_chrome(layout, pages):
+    from scraper.flipkart import FlipkartScraper
+    from scraper.selector_cache import SelectorCache
+    from scraper.utils import get_driver
+
+    server = FixtureServer(FixtureSite(layout, pages))
+    driver = get_driver(lean=True)
+    calls = Counter()
+    # Count every WebDriver command at the HTTP command executor
+    executor = driver.command_executor
+    execute = executor.execute
+
+    def counting_execute(command, params):
+        calls[command] += 1
+        return execute(command, params)
+
+    executor.execute = counting_execute
+    try:
+        driver.get(page_url(1, server.base_url))
+        calls.clear()
+        scraper = FlipkartScraper(driver=driver, min_delay=0, max_delay=0, max_wait=5, selectors=SelectorCache())
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = list(scraper.iter_review_pages(pages))
+        return scrape_result(result, time.perf_counter() - started, calls)
+    finally:
+        driver.quit()
+        server.close()
+
+
+# Export scenarios
+
+def review_rows(count, batch_size=5000):
+    """Yields `count` review dicts (REVIEW_FIELDS) in batches, reusing one pre-built batch."""
+    template = []
+    page = 1
+    while len(template) < batch_size:
+        for r in reviews_for_page(page):
+            template.append({
+                "platform": "Flipkart",
+                "reviewer_name": r["name"],
+                "rating": r["rating"],
+                "review": f"{r['title']} - {r['body']}",
+                "review_date": f"2024-{page % 12 + 1:02d}-{page % 28 + 1:02d}",
+                "relative_date": r["date"],
+                "product_url": f"https://www.flipkart.com{page_url(1)}"
+            })
+        page += 1
+    remaining = count
+    while remaining > 0:
+        batch = template[:min(batch_size, remaining)]
+        remaining -= len(batch)
+        yield batch
+
+
+def run_export(fmt, rows):
+    from scraper.sinks import open_sinks
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = os.path.join(tmp, "bench")
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sinks = open_sinks([fmt], base_path)
+            for batch in review_rows(rows):
+                sinks.write(batch)
+            files = sinks.close()
+        seconds = time.perf_counter() - started
+        size = sum(os.path.getsize(path) for path in files)
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+        "files": len(files),
+        "output_mb": round(size / (1024 * 1024), 2)
+    }
+
+
+def run_scenario(name, pages):
+    kind, *parts = name.split(":")
+    if kind == "extract":
+        result = run_extract(parts[0], parts[1], parts[2], pages)
+    elif kind == "http":
+        result = run_http(parts[0], pages)
+    elif kind == "chrome":
+        result = run_chrome(parts[0], pages)
+    elif kind == "export":
+        result = run_export(parts[0], int(parts[1]))
+    else:
+        raise ValueError(f"Unknown scenario: {name}")
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+# Orchestration
+
+def run_isolated(name, pages):
+    """Runs one scenario in a fresh interpreter. Returns its result, or {"error": ...}."""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--scenario", name, "--pages", str(pages)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if out.returncode != 0:
+        lines = (out.stderr or out.stdout).strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit code {out.returncode}"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summary(result):
+    if "error" in result:
+        return f"ERROR {result['error']}"
+    if "rows" in result:
+        return f"{result['seconds']:8.2f}s {result['rows_per_second']:>9} rows/s {result['output_mb']:8.1f} MB  rss {result['peak_rss_mb']} MB"
+    return (f"{result['pages_per_second']:8.1f} pages/s {result['reviews_per_second']:9.1f} reviews/s "
+            f"{result['calls_per_page']:6.1f} calls/page  {result['reviews']}/{result['reviews_expected']} reviews  "
+            f"rss {result['peak_rss_mb']} MB")
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit')}):")
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before or "error" in result or "error" in before:
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric in result and before.get(metric):
+                change = (result[metric] - before[metric]) / before[metric] * 100
+                better = (change > 0) == higher_is_better
+                changes.append(f"{metric} {change:+.1f}%{'' if abs(change) < 5 else (' ✓' if better else ' ✗')}")
+        print(f"{name:<32} {', '.join(changes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50, help="review pages per scraping scenario")
+    parser.add_argument("--rows", default="10000,100000,1000000", help="comma-separated row counts for the export scenarios")
+    parser.add_argument("--http", action="store_true", help="also run the HTTP fetch path against a local server")
+    parser.add_argument("--chrome", action="store_true", help="also run headless Chrome against a local server")
+    parser.add_argument("--only", choices=["extract", "http", "chrome", "export"], help="run one group of scenarios")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        # Child process: run one scenario, result as the last line of output
+        print(json.dumps(run_scenario(args.scenario, args.pages)))
+        return
+
+    args.rows = [int(rows) for rows in args.rows.split(",") if rows.strip()]
+    results = {}
+    for name in scenario_names(args):
+        results[name] = run_isolated(name, args.pages)
+        print(f"{name:<32} {summary(results[name])}", flush=True)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pages": args.pages,
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures scraper startup cost so regressions show up between commits.
+
+Reports (in seconds):
+- import_api / import_scraper: cold import time in a fresh interpreter
+- driver_path_cold / driver_path_cached: chromedriver resolution with and without the on-disk cache
+- driver_launch: time to start Chrome (only with --launch)
+
+Usage:
+    python benchmarks/startup_time.py [--runs 5] [--launch] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(module, runs):
+    """Median wall time of `import module` in a fresh interpreter."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def time_driver_path(cold):
+    """Time for get_driver_path() in a fresh interpreter, optionally with the disk cache removed."""
+    code = (
+        "import time; from scraper import utils\n"
+        f"if {cold}: utils.invalidate_driver_path()\n"
+        "t = time.perf_counter(); utils.get_driver_path(); print(time.perf_counter() - t)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def time_driver_launch():
+    sys.path.insert(0, ROOT)
+    from scraper.utils import get_driver
+    t = time.perf_counter()
+    driver = get_driver()
+    elapsed = time.perf_counter() - t
+    driver.quit()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per import measurement")
+    parser.add_argument("--launch", action="store_true", help="also measure a Chrome launch")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {
+        "import_api": time_import("api", args.runs),
+        "import_scraper": time_import("scraper.flipkart", args.runs),
+    }
+    try:
+        results["driver_path_cold"] = time_driver_path(cold=True)
+        results["driver_path_cached"] = time_driver_path(cold=False)
+    except subprocess.CalledProcessError as e:
+        print(f"Skipping driver path timing: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+    if args.launch:
+        results["driver_launch"] = time_driver_launch()
+
+    for name, seconds in results.items():
+        print(f"{name:<20} {seconds:8.3f}s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
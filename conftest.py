@@ -0,0 +1 @@
+# Makes the repository root importable (scraper, api) when running pytest from anywhere
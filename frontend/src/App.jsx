@@ -15,14 +15,29 @@ function App() {
     status: 'idle',
     error: null
   })
+  // Id of the job this page started - status and downloads are per job
+  const [jobId, setJobId] = useState(null)
+  // Most parallel browsers the server allows (MAX_CONCURRENCY)
+  const [maxConcurrency, setMaxConcurrency] = useState(4)
 
-  // Poll status when scraping
   useEffect(() => {
+    fetch(`${API_URL}/config`)
+      .then(response => response.json())
+      .then(config => setMaxConcurrency(config.max_concurrency))
+      .catch(error => console.error('Error loading server config:', error))
+  }, [])
+
+  // Follow the job's progress stream; fall back to polling when it is unavailable
+  useEffect(() => {
+    if (!status.is_running || !jobId) return
+
     let interval
-    if (status.is_running) {
+    let source
+
+    const startPolling = () => {
       interval = setInterval(async () => {
         try {
-          const response = await fetch(`${API_URL}/status`)
+          const response = await fetch(`${API_URL}/status/${jobId}`)
           const data = await response.json()
           setStatus(data)
 
@@ -35,10 +50,58 @@ function App() {
       }, 1000)
     }
 
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+    } else {
+      let received = false
+      source = new EventSource(`${API_URL}/events/${jobId}`)
+      const listen = (type, apply) => {
+        source.addEventListener(type, (event) => {
+          received = true
+          apply(JSON.parse(event.data))
+        })
+      }
+
+      listen('snapshot', (data) => setStatus(data))
+      listen('status', (data) => setStatus((prev) => ({ ...prev, ...data, is_running: true })))
+      listen('page', (data) => setStatus((prev) => ({
+        ...prev,
+        current_page: data.pages_done,
+        total_reviews: data.total_reviews,
+        recent_reviews: [...data.reviews, ...(prev.recent_reviews || [])].slice(0, 5),
+        products: (prev.products || []).map((product, i) => i === data.product - 1
+          ? { ...product, current_page: data.page, reviews: data.product_reviews }
+          : product)
+      })))
+      listen('product', (data) => setStatus((prev) => ({
+        ...prev,
+        products_completed: data.products_completed ?? prev.products_completed,
+        pages_skipped: data.pages_skipped_total ?? prev.pages_skipped,
+        time_saved_seconds: data.time_saved_seconds ?? prev.time_saved_seconds,
+        products: (prev.products || []).map((product, i) => i === data.product - 1
+          ? { ...product, status: data.status, ...(data.reviews !== undefined && { reviews: data.reviews }) }
+          : product)
+      })))
+      listen('end', (data) => {
+        source.close()
+        setStatus(data)
+      })
+
+      source.onerror = () => {
+        // Never connected (e.g. a proxy that doesn't stream) - poll instead;
+        // otherwise EventSource reconnects by itself where it left off
+        if (!received) {
+          source.close()
+          startPolling()
+        }
+      }
+    }
+
     return () => {
+      if (source) source.close()
       if (interval) clearInterval(interval)
     }
-  }, [status.is_running])
+  }, [status.is_running, jobId])
 
   const handleStartScraping = async (formData) => {
     try {
@@ -53,7 +116,9 @@ function App() {
       const data = await response.json()
 
       if (response.ok) {
-        setStatus({ ...status, is_running: true, status: 'running' })
+        // Queued until a job slot is free on the server
+        setJobId(data.job_id)
+        setStatus({ ...status, is_running: true, status: data.status })
       } else {
         alert(data.error || 'Failed to start scraping')
       }
@@ -64,13 +129,15 @@ function App() {
 
   const handleDownload = async () => {
     try {
-      const response = await fetch(`${API_URL}/download`)
+      const response = await fetch(`${API_URL}/download/${jobId}`)
       if (response.ok) {
         const blob = await response.blob()
         const url = window.URL.createObjectURL(blob)
         const a = document.createElement('a')
         a.href = url
-        a.download = `flipkart_reviews_${Date.now()}.xlsx`
+        // Large or per-product exports come back as a zip of .xlsx files
+        const extension = blob.type === 'application/zip' ? 'zip' : 'xlsx'
+        a.download = `flipkart_reviews_${Date.now()}.${extension}`
         document.body.appendChild(a)
         a.click()
         window.URL.revokeObjectURL(url)
@@ -83,6 +150,23 @@ function App() {
     }
   }
 
+  // Complete rows written so far - works while the job is still running
+  const handleDownloadCsv = () => {
+    window.open(`${API_URL}/download/${jobId}/csv`, '_blank')
+  }
+
+  const handleStop = async () => {
+    try {
+      const response = await fetch(`${API_URL}/stop/${jobId}`, { method: 'POST' })
+      const data = await response.json()
+      if (!response.ok) {
+        alert(data.error || 'Failed to stop the job')
+      }
+    } catch (error) {
+      alert('Error connecting to API: ' + error.message)
+    }
+  }
+
   return (
     <div className="app">
       <div className="container">
@@ -98,11 +182,14 @@ function App() {
           <ScraperForm 
             onSubmit={handleStartScraping}
             isRunning={status.is_running}
+            maxConcurrency={maxConcurrency}
           />
 
           <StatusPanel 
             status={status}
             onDownload={handleDownload}
+            onStop={handleStop}
+            onDownloadCsv={handleDownloadCsv}
           />
         </div>
 
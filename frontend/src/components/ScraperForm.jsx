@@ -1,13 +1,15 @@
 import { useState } from 'react'
 import './ScraperForm.css'
 
-function ScraperForm({ onSubmit, isRunning }) {
+function ScraperForm({ onSubmit, isRunning, maxConcurrency = 4 }) {
   const [mode, setMode] = useState('single') // 'single' or 'multiple'
   const [formData, setFormData] = useState({
     url: '',
     from_date: '2020-01-01',
     to_date: new Date().toISOString().split('T')[0],
-    max_pages: 100
+    max_pages: 100,
+    concurrency: 1,
+    sort_recent: false
   })
 
   const handleSubmit = (e) => {
@@ -152,6 +154,45 @@ function ScraperForm({ onSubmit, isRunning }) {
         </div>
       </div>
 
+      <div className="form-group">
+        <label htmlFor="sort_recent">
+          <span className="label-icon">🕒</span>
+          Review Order
+          <span className="label-hint">
+            {formData.sort_recent ? '(stops once pages are older than From Date)' : ''}
+          </span>
+        </label>
+        <select
+          id="sort_recent"
+          value={formData.sort_recent ? 'recent' : 'default'}
+          onChange={(e) => handleChange('sort_recent', e.target.value === 'recent')}
+          disabled={isRunning}
+        >
+          <option value="default">Most helpful (Flipkart default)</option>
+          <option value="recent">Most recent first</option>
+        </select>
+      </div>
+
+      {mode === 'multiple' && (
+        <div className="form-group">
+          <label htmlFor="concurrency">
+            <span className="label-icon">⚡</span>
+            Parallel Browsers
+            <span className="label-hint">(products scraped at the same time)</span>
+          </label>
+          <select
+            id="concurrency"
+            value={formData.concurrency}
+            onChange={(e) => handleChange('concurrency', parseInt(e.target.value))}
+            disabled={isRunning}
+          >
+            {Array.from({ length: maxConcurrency }, (_, i) => i + 1).map(n => (
+              <option key={n} value={n}>{n}</option>
+            ))}
+          </select>
+        </div>
+      )}
+
       <button 
         type="submit" 
         className="btn btn-primary"
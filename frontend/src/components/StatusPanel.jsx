@@ -1,6 +1,6 @@
 import './StatusPanel.css'
 
-function StatusPanel({ status, onDownload }) {
+function StatusPanel({ status, onDownload, onStop, onDownloadCsv }) {
   if (status.status === 'idle') return null
 
   return (
@@ -23,6 +23,21 @@ function StatusPanel({ status, onDownload }) {
           <div className="card-label">TOTAL REVIEWS</div>
           <div className="card-value">{status.total_reviews}</div>
         </div>
+
+        {status.products && status.products.length > 1 && (
+          <div className="status-card">
+            <div className="card-label">PRODUCTS DONE</div>
+            <div className="card-value">{status.products_completed}/{status.products.length}</div>
+          </div>
+        )}
+
+        {status.pages_skipped > 0 && (
+          <div className="status-card">
+            <div className="card-label">PAGES SKIPPED</div>
+            <div className="card-value">{status.pages_skipped}</div>
+            <div className="card-label">~{Math.round(status.time_saved_seconds / 60)} MIN SAVED</div>
+          </div>
+        )}
       </div>
 
       {status.is_running && status.recent_reviews && status.recent_reviews.length > 0 && (
@@ -46,11 +61,21 @@ function StatusPanel({ status, onDownload }) {
         <div className="progress-container">
           <div className="progress-bar-glow"></div>
           <div className="progress-bar-fill"></div>
-          <p>SCANNING DATA PACKETS...</p>
+          <p>{status.status === 'queued' ? 'WAITING FOR A FREE JOB SLOT...' : 'SCANNING DATA PACKETS...'}</p>
+          {onStop && (
+            <button onClick={onStop} className="btn-stop">
+              ⏹ STOP
+            </button>
+          )}
+          {onDownloadCsv && status.total_reviews > 0 && (
+            <button onClick={onDownloadCsv} className="btn-stop btn-partial">
+              📄 CSV SO FAR
+            </button>
+          )}
         </div>
       )}
 
-      {status.status === 'completed' && (
+      {(status.status === 'completed' || (status.status === 'cancelled' && status.output_file)) && (
         <div className="final-actions">
           {status.error ? (
             <div className="error-box">{status.error}</div>
@@ -1,63 +1,56 @@
 from scraper.flipkart import FlipkartScraper
-from scraper.utils import parse_review_date
-import pandas as pd
+from scraper.utils import parse_review_dates, OldPageStop
+from scraper.sinks import open_sinks, truncate_csv, replay_csv, CsvSink, ExcelSink
+from scraper.checkpoint import JobCheckpoint, new_job_id
+from scraper.store import STORED_PAGES_TO_STOP, ReviewStore, product_key
+from scraper.metrics import Metrics
 from datetime import datetime
+import argparse
 import os
-
-import csv
-
-def append_to_csv(reviews, filename):
-    """
-    Appends a list of reviews to a CSV file.
-    Creates the file with header if it doesn't exist.
-    """
-    if not reviews:
-        return
-
-    # Define columns
-    fieldnames = ['platform', 'reviewer_name', 'rating', 'review', 'review_date', 'relative_date']
-    
-    file_exists = os.path.isfile(filename)
-    
-    try:
-        with open(filename, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
-                
-            # Filter and write rows
-            for r in reviews:
-                # Ensure only valid keys are written
-                row_to_write = {k: r.get(k, None) for k in fieldnames}
-                writer.writerow(row_to_write)
-                
-        # print(f"   [CSV] Appended {len(reviews)} rows.")
-            
-    except Exception as e:
-        print(f"   [CSV Error] {e}")
-
-def convert_csv_to_excel(csv_filename, excel_filename):
-    """
-    Converts the final CSV to Excel.
-    """
-    try:
-        print("   Converting CSV to Excel...")
-        df = pd.read_csv(csv_filename)
-        df.to_excel(excel_filename, index=False)
-        print(f"   Success! Excel saved: {excel_filename}")
-    except Exception as e:
-        print(f"   [Excel Conversion Error] {e}")
+import time
 
 def main():
     print("=== Flipkart Review Scraper ===")
     
-    # 1. User Inputs
-    product_url = input("Enter Flipkart Product URL: ").strip()
+    parser = argparse.ArgumentParser(description="Scrape Flipkart reviews into CSV + Excel")
+    parser.add_argument("--resume", metavar="JOB_ID", help="continue an interrupted run from its last checkpoint")
+    parser.add_argument("--sort-recent", action="store_true",
+                        help="read reviews newest first and stop once pages are older than the From Date")
+    parser.add_argument("--stop-after-old-pages", type=int, default=3, metavar="K",
+                        help="with --sort-recent: stop after K pages in a row older than the From Date (default 3)")
+    parser.add_argument("--use-store", action="store_true",
+                        help="keep reviews in the cross-run review store: the CSV gets only reviews new to the "
+                             "store, the Excel file is exported from the store")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"--use-store, read newest first and stop after {STORED_PAGES_TO_STOP} pages in a row "
+                             "that are already stored")
+    args = parser.parse_args()
     
-    print("\n--- Date Filter (YYYY-MM-DD) ---")
-    from_date_str = input("From Date (e.g., 2023-01-01): ").strip()
-    to_date_str = input("To Date (e.g., 2024-12-31): ").strip()
+    checkpoint = None
+    if args.resume:
+        try:
+            checkpoint = JobCheckpoint.load(args.resume)
+        except (FileNotFoundError, ValueError):
+            print(f"No checkpoint found for job {args.resume}.")
+            return
+        if checkpoint.product(1)["status"] == "completed":
+            print(f"Job {args.resume} already finished - see {checkpoint.base_path}.csv")
+            return
+        product_url = checkpoint.params["product_url"]
+        from_date_str = checkpoint.params["from_date_str"]
+        to_date_str = checkpoint.params["to_date_str"]
+        args.sort_recent = checkpoint.params.get("sort_recent", False)
+        args.stop_after_old_pages = checkpoint.params.get("stop_after_old_pages", 3)
+        args.incremental = checkpoint.params.get("incremental", False)
+        args.use_store = checkpoint.params.get("use_store", args.incremental)
+        print(f"Resuming job {args.resume}: {product_url}")
+    else:
+        # 1. User Inputs
+        product_url = input("Enter Flipkart Product URL: ").strip()
+        
+        print("\n--- Date Filter (YYYY-MM-DD) ---")
+        from_date_str = input("From Date (e.g., 2023-01-01): ").strip()
+        to_date_str = input("To Date (e.g., 2024-12-31): ").strip()
     
     try:
         from_date = datetime.strptime(from_date_str, "%Y-%m-%d")
@@ -67,77 +60,169 @@ def main():
         return
 
     MAX_PAGES = 50000 # 50k support
+    CHECKPOINT_EVERY_PAGES = 100 # fsync the output and save the job checkpoint this often
     print(f"\nSettings: Max {MAX_PAGES} pages, Filter {from_date.date()} to {to_date.date()}")
     
     # Setup output
     output_dir = "output"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_filename = f"{output_dir}/reviews_{timestamp}.csv"
-    excel_filename = f"{output_dir}/reviews_{timestamp}.xlsx"
+    # CSV and styled Excel are both written page by page
+    # (review store: the CSV gets this run's new reviews, Excel is exported from the store at the end)
+    fieldnames = ['platform', 'reviewer_name', 'rating', 'review', 'review_date', 'relative_date']
+    if args.incremental:
+        args.use_store = args.sort_recent = True
+    formats = ["csv"] if args.use_store else ["csv", "xlsx"]
+    if checkpoint:
+        base_path = checkpoint.base_path
+        # Drop rows written after the last checkpoint - those pages are scraped again
+        truncate_csv(f"{base_path}.csv", checkpoint.state["csv_bytes"])
+    else:
+        job_id = new_job_id()
+        base_path = f"{output_dir}/reviews_{job_id}"
+        checkpoint = JobCheckpoint(job_id, {
+            "product_url": product_url, "from_date_str": from_date_str, "to_date_str": to_date_str,
+            "sort_recent": args.sort_recent, "stop_after_old_pages": args.stop_after_old_pages,
+            "use_store": args.use_store, "incremental": args.incremental
+        }, base_path, formats, [product_url])
+        checkpoint.save()
+    sinks = open_sinks(formats, base_path, fieldnames=fieldnames)
+    csv_sink = sinks.get(CsvSink)
+    # The Excel file is rebuilt from the rows already in the CSV (nothing to do on a fresh run)
+    if sinks.get(ExcelSink):
+        replay_csv(csv_sink.path, sinks.get(ExcelSink))
+    store = ReviewStore() if args.use_store else None
+    print(f"Job id: {checkpoint.job_id}")
 
+    # Where the time goes: per-phase timings and WebDriver calls, printed at the end
+    metrics = Metrics()
+    
     # 2. Init Scraper
     scraper = FlipkartScraper()
     # Note: We NO LONGER store all_reviews in memory. We just count total.
-    total_reviews_collected = 0
+    total_reviews_collected = checkpoint.state["total_reviews"]
+    finished = False
     
-    try:
-        # 3. Navigation
-        scraper.open_product_page(product_url)
-        scraper.go_to_all_reviews()
+    with metrics.active():
+        try:
+            # 3. Navigation
+            scraper.open_product_page(product_url)
+            scraper.go_to_all_reviews()
+            if args.sort_recent:
+                scraper.sort_reviews("MOST_RECENT")
         
-        # 4. Scraping Loop
-        page_count = 0
-        while page_count < MAX_PAGES:
-            page_count += 1
-            print(f"\n--- Scraping Page {page_count} ---")
+            # Infinite scroll keeps old reviews in the DOM, so only read the new ones
+            pagination_mode = scraper.has_next_button()
+
+            # Continue after the last committed page (0 on a fresh run)
+            page_count = checkpoint.product(1)["page"]
+            if page_count:
+                print(f"Resuming at page {page_count + 1} ({total_reviews_collected} reviews already saved)")
+                if not scraper.skip_to_page(page_count + 1, pagination_mode):
+                    page_count = MAX_PAGES
+
+            # Duplicates show up across pages (and when infinite scroll re-renders blocks)
+            seen_reviews = checkpoint.restore_seen(1)
+
+            # 4. Scraping Loop
+            old_page_stop = OldPageStop(from_date, args.stop_after_old_pages if args.sort_recent else 0)
+            first_page = page_count + 1
+            pages_started = time.monotonic()
+            stored_pages = 0
+            while page_count < MAX_PAGES:
+                page_count += 1
+                print(f"\n--- Scraping Page {page_count} ---")
             
-            # Extract data
-            raw_reviews = scraper.extract_page_data()
+                # Extract data
+                raw_reviews = scraper.extract_page_data(only_new=not pagination_mode)
             
-            # Process & Filter immediately (Streaming Mode)
-            processed_reviews = []
-            for r in raw_reviews:
-                raw_date_str = r['review_date']
-                r['relative_date'] = raw_date_str 
-                r_date = parse_review_date(raw_date_str)
+                # Process & Filter immediately (Streaming Mode)
+                processed_reviews = []
+                page_dates = []
+                with metrics.phase("dedup"):
+                    unique_reviews = [r for r in raw_reviews if seen_reviews.add_review(r)]
+                with metrics.phase("date_parse"):
+                    dates = parse_review_dates([r['review_date'] for r in unique_reviews])
+                for r, r_date in zip(unique_reviews, dates):
+                    r['relative_date'] = r['review_date']
                 
-                if r_date:
-                    r_date = r_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                    if from_date <= r_date <= to_date:
-                        r['review_date'] = r_date.strftime("%Y-%m-%d")
-                        processed_reviews.append(r)
+                    if r_date:
+                        r_date = r_date.replace(hour=0, minute=0, second=0, microsecond=0)
+                        page_dates.append(r_date)
+                        if from_date <= r_date <= to_date:
+                            r['review_date'] = r_date.strftime("%Y-%m-%d")
+                            processed_reviews.append(r)
             
-            # Write batch to CSV immediately
-            if processed_reviews:
-                append_to_csv(processed_reviews, csv_filename)
-                total_reviews_collected += len(processed_reviews)
-                print(f"   Saved {len(processed_reviews)} reviews to CSV (Total: {total_reviews_collected})")
-            else:
-                print("   No valid reviews on this page (filtered out or empty).")
+                if store and processed_reviews:
+                    # Only reviews earlier runs haven't stored are new
+                    processed_reviews = store.add_reviews(product_key(product_url), processed_reviews, checkpoint.job_id)
+                    stored_pages = stored_pages + 1 if args.incremental and not processed_reviews else 0
+            
+                # Write batch to the outputs immediately
+                if processed_reviews:
+                    with metrics.phase("write"):
+                        sinks.write(processed_reviews)
+                    total_reviews_collected += len(processed_reviews)
+                    print(f"   Saved {len(processed_reviews)} reviews (Total: {total_reviews_collected})")
+                else:
+                    print("   No valid reviews on this page (filtered out or empty).")
                 
-            # No huge list in memory
+                # No huge list in memory
+                checkpoint.update_product(1, page=page_count, reviews=total_reviews_collected)
+                if page_count % CHECKPOINT_EVERY_PAGES == 0:
+                    with metrics.phase("write"):
+                        sinks.checkpoint()
+                        checkpoint.save(csv_bytes=csv_sink.committed_bytes, total_reviews=total_reviews_collected)
+                metrics.page_done(page=page_count)
             
-            # Pagination
-            if page_count < MAX_PAGES:
-                if not scraper.next_page():
+                if stored_pages >= STORED_PAGES_TO_STOP:
+                    print(f"\nNothing new on {stored_pages} pages in a row - the rest is already in the review store.")
                     break
-            else:
-                print("Max pages reached.")
+                if old_page_stop.update(page_dates):
+                    # Sorted newest first: every later page is older still
+                    total_pages = scraper.get_total_pages() if pagination_mode else None
+                    pages_skipped = max(0, min(total_pages or MAX_PAGES, MAX_PAGES) - page_count)
+                    seconds_per_page = (time.monotonic() - pages_started) / (page_count - first_page + 1)
+                    print(f"\n{old_page_stop.limit} page(s) in a row older than {from_date.date()} - stopping early.")
+                    print(f"Skipped {'' if total_pages else 'up to '}{pages_skipped} page(s), ~{pages_skipped * seconds_per_page:.0f}s saved.")
+                    break
+            
+                # Pagination
+                if page_count < MAX_PAGES:
+                    if not scraper.next_page():
+                        break
+                else:
+                    print("Max pages reached.")
+            finished = True
                 
-    except KeyboardInterrupt:
-        print("\nScraping interrupted by user.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-    finally:
-        scraper.quit()
+        except KeyboardInterrupt:
+            print("\nScraping interrupted by user.")
+        except Exception as e:
+            print(f"An error occurred: {e}")
+        finally:
+            scraper.quit()
         
-        # Finally convert to Excel
-        if total_reviews_collected > 0:
-            convert_csv_to_excel(csv_filename, excel_filename)
-        else:
-            print("No reviews collected.")
+            # Finish the outputs
+            files = sinks.close()
+            # Everything written so far is on disk now - record it
+            if finished:
+                checkpoint.finish_product(1, "completed")
+            checkpoint.save(csv_bytes=csv_sink.committed_bytes, total_reviews=total_reviews_collected)
+            if store:
+                # Excel covers everything stored for this product and date range, not just this run
+                excel_sinks = open_sinks(["xlsx"], base_path, fieldnames=fieldnames)
+                exported = store.export(excel_sinks, [product_key(product_url)], from_date_str, to_date_str)
+                files += excel_sinks.close()
+                store.close()
+                print(f"{total_reviews_collected} new reviews this run, {exported} in the review store for this date range.")
+            if files:
+                for path in files:
+                    print(f"Saved {path}")
+            else:
+                print("No reviews collected.")
+            if not finished:
+                print(f"Continue later with: python main.py --resume {checkpoint.job_id}")
+            print(metrics.summary())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,129 @@
+"""
+Job checkpoints for resuming long scrapes.
+
+A checkpoint is a small JSON file (output/jobs/<job_id>.json) recording the
+job's parameters, its output files, how many CSV bytes were durably written,
+and for every product the last committed page plus its dedup state. It is
+rewritten atomically (temp file + os.replace), so a crash at any point leaves
+either the previous or the new checkpoint on disk, never a torn one.
+
+Pages count as committed once their reviews were written to the sinks and
+the CSV was fsynced; resuming truncates the CSV back to that point and
+continues every unfinished product from the page after its last commit.
+"""
+import json
+import os
+import re
+import secrets
+import threading
+from datetime import datetime
+from .dedup import DedupIndex
+
+CHECKPOINT_DIR = os.path.join("output", "jobs")
+
+
+def new_job_id():
+    """
+    Job ids double as the output file name (reviews_<job_id>.csv): a timestamp
+    plus a random suffix, so jobs queued in the same second don't collide.
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}"
+
+
+def checkpoint_path(job_id):
+    # Ids come from API requests - keep them to a plain file name
+    if not re.fullmatch(r"[\w-]+", job_id):
+        raise ValueError(f"Invalid job id: {job_id!r}")
+    return os.path.join(CHECKPOINT_DIR, f"{job_id}.json")
+
+
+class JobCheckpoint:
+    """
+    In-memory job progress plus save() to persist it.
+
+    Product progress is updated on every page (cheap, in memory); save() is
+    only called every few pages and when a product finishes. Callers must
+    serialize update/save against sink writes (api.py uses its write lock)
+    so the saved pages always match the saved CSV size.
+    """
+    def __init__(self, job_id, params, base_path, formats, product_urls):
+        self.job_id = job_id
+        self.path = checkpoint_path(job_id)
+        self.lock = threading.Lock()
+        self.state = {
+            "job_id": job_id,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "updated_at": None,
+            "params": params,
+            "base_path": base_path,
+            "formats": list(formats),
+            "csv_bytes": 0,
+            "total_reviews": 0,
+            "products": [
+                {"url": url, "status": "queued", "mode": None, "page": 0, "reviews": 0, "seen": None}
+                for url in product_urls
+            ]
+        }
+        # Live dedup indexes of running products, serialized on save
+        self._seen = {}
+
+    @classmethod
+    def load(cls, job_id):
+        """Loads a saved checkpoint. Raises FileNotFoundError if there is none."""
+        with open(checkpoint_path(job_id), encoding="utf-8") as f:
+            state = json.load(f)
+        checkpoint = cls.__new__(cls)
+        checkpoint.job_id = job_id
+        checkpoint.path = checkpoint_path(job_id)
+        checkpoint.lock = threading.Lock()
+        checkpoint.state = state
+        checkpoint._seen = {}
+        return checkpoint
+
+    @property
+    def params(self):
+        return self.state["params"]
+
+    @property
+    def base_path(self):
+        return self.state["base_path"]
+
+    def product(self, index):
+        """Saved progress of product `index` (1-based)."""
+        return self.state["products"][index - 1]
+
+    def restore_seen(self, index, **dedup_options):
+        """
+        Returns the DedupIndex saved for product `index` (empty on a fresh run)
+        and tracks it from now on. dedup_options: see DedupIndex.
+        """
+        seen = DedupIndex.from_state(self.product(index)["seen"], **dedup_options)
+        self._seen[index] = seen
+        return seen
+
+    def update_product(self, index, **fields):
+        self.product(index).update(fields)
+
+    def finish_product(self, index, status):
+        """Marks a product done; its dedup state is no longer needed."""
+        self.update_product(index, status=status, seen=None)
+        self._seen.pop(index, None)
+
+    def save(self, csv_bytes=None, total_reviews=None):
+        """Writes the checkpoint atomically."""
+        with self.lock:
+            if csv_bytes is not None:
+                self.state["csv_bytes"] = csv_bytes
+            if total_reviews is not None:
+                self.state["total_reviews"] = total_reviews
+            for index, seen in self._seen.items():
+                self.product(index)["seen"] = seen.to_state()
+            self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,198 @@
+"""
+Memory-bounded duplicate detection for scraped reviews.
+
+Reviews are reduced to a 64-bit blake2b hash of the normalized reviewer name,
+full review text and date, and the hashes are kept in an open-addressing
+table backed by array('Q') - 8 bytes per slot instead of a Python string
+per review. When the table would grow past `max_bytes` it is folded into a
+Bloom filter of that size: memory stays flat from then on, at the cost of a
+small, configurable false-positive rate (a few new reviews may be taken for
+duplicates, a duplicate is never written twice).
+"""
+import base64
+import hashlib
+import math
+import re
+from array import array
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(text):
+    return _WHITESPACE.sub(" ", str(text or "")).strip().lower()
+
+
+def review_hash(review, fields=("reviewer_name", "review", "review_date")):
+    """64-bit hash of a review dict's reviewer_name, review and review_date (never 0)."""
+    key = "\x1f".join(_normalize(review.get(field)) for field in fields)
+    value = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+    # 0 marks an empty slot in the hash table
+    return value or 1
+
+
+class _HashTable:
+    """Open-addressing (linear probing) set of non-zero 64-bit ints."""
+    def __init__(self, capacity=1024):
+        self.slots = array("Q", bytes(8 * capacity))
+        self.mask = capacity - 1
+        self.count = 0
+
+    @property
+    def nbytes(self):
+        return len(self.slots) * self.slots.itemsize
+
+    def _find(self, value):
+        slots, mask = self.slots, self.mask
+        i = value & mask
+        while slots[i] and slots[i] != value:
+            i = (i + 1) & mask
+        return i
+
+    def __contains__(self, value):
+        return self.slots[self._find(value)] == value
+
+    def add(self, value):
+        i = self._find(value)
+        if self.slots[i] == value:
+            return False
+        self.slots[i] = value
+        self.count += 1
+        return True
+
+    def needs_grow(self):
+        # Keep the load factor under 2/3 so probe chains stay short
+        return (self.count + 1) * 3 > len(self.slots) * 2
+
+    def grown(self):
+        table = _HashTable(len(self.slots) * 2)
+        for value in self:
+            table.add(value)
+        return table
+
+    def __iter__(self):
+        return (value for value in self.slots if value)
+
+
+class _BloomFilter:
+    """
+    Bloom filter over 64-bit hashes using the whole memory budget: m bits,
+    k = ceil(-log2(p)) probes derived by double hashing from the two 32-bit
+    halves of the hash.
+    """
+    def __init__(self, nbytes, false_positive_rate):
+        self.bits = bytearray(max(1, nbytes))
+        self.m = len(self.bits) * 8
+        self.k = max(1, math.ceil(-math.log2(false_positive_rate)))
+        self.count = 0
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+    def _positions(self, value):
+        h1, h2 = value & 0xFFFFFFFF, (value >> 32) | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def __contains__(self, value):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+    def add(self, value):
+        bits, new = self.bits, False
+        for p in self._positions(value):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                bits[p >> 3] |= 1 << (p & 7)
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def false_positive_rate(self):
+        """Current estimated false-positive probability."""
+        return (1 - math.exp(-self.k * self.count / self.m)) ** self.k
+
+
+class DedupIndex:
+    """
+    Set of seen review hashes with a memory cap.
+
+    max_bytes: memory budget; past it the exact table becomes a Bloom filter
+    false_positive_rate: target rate for that Bloom filter
+
+    `review_hash(r) in index` / index.add(hash) for the usual check-then-add;
+    index.add_review(r) does both and returns True for a new review.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, false_positive_rate=0.001):
+        self.max_bytes = max_bytes
+        self.false_positive_rate = false_positive_rate
+        self._set = _HashTable()
+
+    @property
+    def exact(self):
+        """False once the index has fallen back to the Bloom filter."""
+        return isinstance(self._set, _HashTable)
+
+    @property
+    def nbytes(self):
+        return self._set.nbytes
+
+    def __len__(self):
+        return self._set.count
+
+    def __contains__(self, value):
+        return value in self._set
+
+    def add(self, value):
+        """Adds a review hash. Returns False if it was already there."""
+        if self.exact and self._set.needs_grow():
+            if self._set.nbytes * 2 > self.max_bytes:
+                self._to_bloom()
+            else:
+                self._set = self._set.grown()
+        return self._set.add(value)
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def add_review(self, review):
+        return self.add(review_hash(review))
+
+    def _to_bloom(self):
+        bloom = _BloomFilter(self.max_bytes, self.false_positive_rate)
+        for value in self._set:
+            bloom.add(value)
+        print(f"   [Dedup] {self._set.count} reviews seen - switching to a "
+              f"{self.max_bytes / (1024 * 1024):g} MB Bloom filter (~{self.false_positive_rate:.2%} false positives)")
+        self._set = bloom
+
+    def to_state(self):
+        """JSON-serializable snapshot (for job checkpoints)."""
+        data = self._set.slots.tobytes() if self.exact else bytes(self._set.bits)
+        return {
+            "kind": "table" if self.exact else "bloom",
+            "count": self._set.count,
+            "max_bytes": self.max_bytes,
+            "false_positive_rate": self.false_positive_rate,
+            "data": base64.b64encode(data).decode("ascii")
+        }
+
+    @classmethod
+    def from_state(cls, state, **options):
+        """Rebuilds an index saved with to_state(); None gives an empty index."""
+        if not state:
+            return cls(**options)
+        index = cls(max_bytes=state["max_bytes"], false_positive_rate=state["false_positive_rate"])
+        data = base64.b64decode(state["data"])
+        if state["kind"] == "table":
+            table = _HashTable(1)
+            table.slots = array("Q")
+            table.slots.frombytes(data)
+            table.mask = len(table.slots) - 1
+            index._set = table
+        else:
+            bloom = _BloomFilter(len(data), state["false_positive_rate"])
+            bloom.bits = bytearray(data)
+            index._set = bloom
+        index._set.count = state["count"]
+        return index
@@ -0,0 +1,263 @@
+"""
+Streaming styled-Excel export.
+
+Rows are streamed (by sinks.ExcelSink) into xlsxwriter workbooks in constant-memory
+mode, styled as they are written and with column widths tracked on the fly,
+so the export is a single pass and memory stays flat however many reviews
+there are. Output past Excel's row limit (or split per product) is rotated
+into extra sheets or files.
+"""
+import os
+import re
+import zipfile
+from urllib.parse import urlsplit
+
+# Colour scheme
+HEADER_COLOR = "4A90E2"  # Blue
+ZEBRA_COLOR = "F8F9FA"
+BORDER_COLOR = "CCCCCC"
+
+# Rating colors (gradient from red to green)
+RATING_COLORS = {
+    1: "FF4444",  # Red
+    2: "FF8844",  # Orange
+    3: "FFD700",  # Yellow/Gold
+    4: "88DD44",  # Light Green
+    5: "44DD44"   # Green
+}
+
+# Columns shown centered (everything else is top-aligned and wrapped)
+CENTERED_COLUMNS = ("platform", "rating")
+
+MIN_COLUMN_WIDTH = 12
+MAX_COLUMN_WIDTH = 80
+
+
+# Excel's hard limit is 1,048,576 rows per sheet, one of which is the header
+EXCEL_MAX_DATA_ROWS = 1048575
+
+# Characters Excel doesn't allow in sheet names
+_INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+
+def _product_label(product_url):
+    """Short readable label for a product URL (its slug), safe for file and sheet names."""
+    path = urlsplit(product_url or "").path.strip("/")
+    slug = path.split("/")[0] if path else ""
+    slug = re.sub(r'[^A-Za-z0-9_-]+', "-", slug).strip("-")
+    return slug or "product"
+
+
+class _StyledSheet:
+    """One styled worksheet; see StyledExcelWriter."""
+    def __init__(self, workbook, formats, name, fieldnames):
+        self.workbook = workbook
+        self.formats = formats
+        self.fieldnames = fieldnames
+        self.rating_col = fieldnames.index("rating") if "rating" in fieldnames else None
+        self.centered_cols = {i for i, col_name in enumerate(fieldnames) if col_name in CENTERED_COLUMNS}
+
+        self.sheet = workbook.add_worksheet(name)
+        self.widths = [len(col_name) for col_name in fieldnames]
+        self.row_idx = 0
+        self._write_header()
+
+    @property
+    def data_rows(self):
+        return self.row_idx - 1
+
+    def _format(self, centered, fill=None, rating=False):
+        """Returns a cached xlsxwriter format for the given cell style."""
+        key = (centered, fill, rating)
+        if key not in self.formats:
+            props = {"border": 1, "border_color": f"#{BORDER_COLOR}"}
+            if centered:
+                props.update({"align": "center", "valign": "vcenter"})
+            else:
+                props.update({"valign": "top", "text_wrap": True})
+            if fill:
+                props.update({"bg_color": f"#{fill}", "pattern": 1})
+            if rating:
+                props.update({"bold": True, "font_color": "#FFFFFF", "font_size": 11})
+            self.formats[key] = self.workbook.add_format(props)
+        return self.formats[key]
+
+    def _write_header(self):
+        if "header" not in self.formats:
+            self.formats["header"] = self.workbook.add_format({
+                "bold": True, "font_name": "Calibri", "font_size": 12, "font_color": "#FFFFFF",
+                "bg_color": f"#{HEADER_COLOR}", "pattern": 1,
+                "align": "center", "valign": "vcenter", "text_wrap": True,
+                "border": 1, "border_color": f"#{BORDER_COLOR}"
+            })
+        # Row options must be set before the row is written in constant-memory mode
+        self.sheet.set_row(0, 25)
+        self.sheet.write_row(0, 0, self.fieldnames, self.formats["header"])
+        self.row_idx = 1
+
+    def write_row(self, row):
+        excel_row = self.row_idx + 1  # 1-based, as Excel shows it
+        zebra = ZEBRA_COLOR if excel_row % 2 == 0 else None
+
+        for col, name in enumerate(self.fieldnames):
+            value = row.get(name)
+            if value == "":
+                value = None
+
+            if col == self.rating_col:
+                # Color-code ratings (no zebra stripe on the rating column)
+                try:
+                    value = int(value) if value is not None else None
+                except (TypeError, ValueError):
+                    pass
+                if value in RATING_COLORS:
+                    cell_format = self._format(True, RATING_COLORS[value], rating=True)
+                else:
+                    cell_format = self._format(True)
+            else:
+                cell_format = self._format(col in self.centered_cols, zebra)
+
+            if value is None:
+                self.sheet.write_blank(self.row_idx, col, None, cell_format)
+                continue
+
+            self.sheet.write(self.row_idx, col, value, cell_format)
+            length = len(str(value))
+            if length > self.widths[col]:
+                self.widths[col] = length
+
+        self.row_idx += 1
+
+    def finish(self):
+        """Applies column widths and the frozen header."""
+        for col, max_length in enumerate(self.widths):
+            self.sheet.set_column(col, col, min(max(max_length + 2, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH))
+        self.sheet.freeze_panes(1, 0)
+
+
+class StyledExcelWriter:
+    """
+    Writes review dicts into styled .xlsx output one row at a time:
+    blue header, colour-coded ratings, zebra striping, thin borders,
+    frozen header row and auto-sized column widths.
+
+    Output is rotated so no sheet goes past Excel's row limit:
+    split_by: None - one chunk, rotated every `rows_per_chunk` rows
+              "product" - one chunk per product_url (each also rotated by rows)
+    layout:   "files" - every chunk is its own .xlsx next to `filename`
+              "sheets" - every chunk is a sheet in `filename`
+    Each workbook is written in constant-memory mode, so memory stays bounded
+    per open chunk. close() returns the list of files written.
+    """
+    def __init__(self, filename, fieldnames, split_by=None, layout="files", rows_per_chunk=EXCEL_MAX_DATA_ROWS):
+        if split_by not in (None, "product"):
+            raise ValueError(f"Unknown split_by: {split_by}")
+        if layout not in ("files", "sheets"):
+            raise ValueError(f"Unknown layout: {layout}")
+
+        self.filename = filename
+        self.fieldnames = list(fieldnames)
+        self.split_by = split_by
+        self.layout = layout
+        self.rows_per_chunk = max(1, min(int(rows_per_chunk), EXCEL_MAX_DATA_ROWS))
+
+        self._workbooks = {}   # path -> (workbook, formats)
+        self._chunks = {}      # chunk key -> (label, part number, _StyledSheet)
+        self._sheet_names = set()
+        self._labels = set()
+        self.files = []
+
+    def _open_workbook(self, path):
+        import xlsxwriter
+
+        if path not in self._workbooks:
+            workbook = xlsxwriter.Workbook(path, {
+                "constant_memory": True,    # flush each row to disk as soon as the next one starts
+                "strings_to_numbers": False,
+                "strings_to_urls": False    # product_url stays plain text (and Excel caps URLs per sheet)
+            })
+            self._workbooks[path] = (workbook, {})
+            self.files.append(path)
+        return self._workbooks[path]
+
+    def _unique_sheet_name(self, name):
+        name = _INVALID_SHEET_CHARS.sub("-", name)[:31] or "Reviews"
+        candidate, n = name, 2
+        while candidate.lower() in self._sheet_names:
+            suffix = f" ({n})"
+            candidate = name[:31 - len(suffix)] + suffix
+            n += 1
+        self._sheet_names.add(candidate.lower())
+        return candidate
+
+    def _new_chunk(self, label, part):
+        """Opens the sheet (and, for layout="files", the workbook) for a chunk."""
+        base, ext = os.path.splitext(self.filename)
+        suffix = "" if label is None else f"_{label}"
+        if part > 1:
+            suffix += f"_part{part}"
+
+        if self.layout == "files":
+            path = f"{base}{suffix}{ext or '.xlsx'}"
+            workbook, formats = self._open_workbook(path)
+            sheet_name = "Reviews"
+        else:
+            workbook, formats = self._open_workbook(self.filename)
+            sheet_name = self._unique_sheet_name((label or "Reviews") + (f" part {part}" if part > 1 else ""))
+        return _StyledSheet(workbook, formats, sheet_name, self.fieldnames)
+
+    def write_row(self, row):
+        """Writes one review dict (missing keys become blank cells)."""
+        key = (row.get("product_url") or "") if self.split_by == "product" else None
+
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            label = None
+            if key is not None:
+                # Two products can share a slug - keep their files/sheets apart
+                base_label = label = _product_label(key)
+                n = 2
+                while label in self._labels:
+                    label = f"{base_label}-{n}"
+                    n += 1
+                self._labels.add(label)
+            chunk = (label, 1, self._new_chunk(label, 1))
+        elif chunk[2].data_rows >= self.rows_per_chunk:
+            # Sheet is full - rotate to the next part
+            chunk[2].finish()
+            if self.layout == "files":
+                self._close_workbook_of(chunk[2])
+            label, part = chunk[0], chunk[1] + 1
+            chunk = (label, part, self._new_chunk(label, part))
+        self._chunks[key] = chunk
+        chunk[2].write_row(row)
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write_row(row)
+
+    def _close_workbook_of(self, styled_sheet):
+        for path, (workbook, _) in list(self._workbooks.items()):
+            if workbook is styled_sheet.workbook:
+                workbook.close()
+                del self._workbooks[path]
+
+    def close(self):
+        """Finishes every open sheet, saves the workbooks and returns the list of files."""
+        if not self._chunks:
+            # Nothing written - still produce a workbook with just the header
+            self._chunks[None] = (None, 1, self._new_chunk(None, 1))
+        for _, _, styled_sheet in self._chunks.values():
+            styled_sheet.finish()
+        for workbook, _ in self._workbooks.values():
+            workbook.close()
+        self._workbooks = {}
+        return list(self.files)
+
+
+def zip_files(files, zip_filename):
+    """Bundles export chunks into one zip (stored, .xlsx is already compressed)."""
+    with zipfile.ZipFile(zip_filename, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for path in files:
+            zf.write(path, arcname=os.path.basename(path))
+    return zip_filename
@@ -1,22 +1,131 @@
+import re
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
-from .utils import get_driver, random_sleep
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, WebDriverException, StaleElementReferenceException
+from .utils import get_driver, polite_sleep, review_page_url, set_url_param
+from .metrics import timed
+from .parser import FIELDS_READ_IN_FULL, LAYOUT_MARKERS, REVIEW_BLOCK_STRATEGIES, REVIEW_FIELD_XPATHS, REVIEW_DATE_XPATH, build_review, clean_text, extract_raw_reviews, layout_signature, parse_html
+from .selector_cache import default_cache
+
+# Runs the same strategy cascade as _collect_raw_reviews_elements inside the browser,
+# so a whole page comes back in one WebDriver round trip. The page's layout signature
+# picks the learned selector order (rankings, see SelectorCache), else the default one.
+BULK_EXTRACT_JS = """
+var markers = arguments[0], rankings = arguments[1], fallback = arguments[2], dateXpath = arguments[3], onlyNew = arguments[4];
+var fullFields = arguments[5];
+var MARK = 'data-fk-scraped';
+function nodes(xpath, ctx) {
+    var snap = document.evaluate(xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var out = [];
+    for (var i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+}
+function text(el) { return el.innerText || ''; }
+var signature = markers.filter(function (marker) {
+    return document.evaluate('boolean(' + marker[1] + ')', document, null, XPathResult.BOOLEAN_TYPE, null).booleanValue;
+}).map(function (marker) { return marker[0]; }).join('+');
+var ranking = rankings[signature] || fallback;
+var strategies = ranking.strategies, fields = ranking.fields;
+for (var s = 0; s < strategies.length; s++) {
+    var seen = 0;
+    var blocks = nodes(strategies[s], document).filter(function (b) {
+        // Already-processed blocks were valid before; don't re-read their text
+        if (onlyNew && b.hasAttribute(MARK)) { seen++; return false; }
+        return text(b).trim().length > 20;
+    });
+    if (!blocks.length && !seen) continue;
+    return {
+        signature: signature,
+        strategy: strategies[s],
+        reviews: blocks.map(function (block) {
+            var raw = {};
+            for (var field in fields) {
+                // Alternatives after the first one with text aren't needed (except fullFields)
+                raw[field] = fields[field].map(function () { return null; });
+                for (var i = 0; i < fields[field].length; i++) {
+                    var found = nodes(fields[field][i], block);
+                    if (!found.length) continue;
+                    raw[field][i] = text(found[0]);
+                    if (raw[field][i].trim() && fullFields.indexOf(field) < 0) break;
+                }
+            }
+            raw.dates = nodes(dateXpath, block).map(text);
+            block.setAttribute(MARK, '1');
+            return raw;
+        })
+    };
+}
+return {signature: signature, strategy: null, reviews: []};
+"""
+
+# Rating blocks: present exactly once per review in both layouts
+REVIEW_MARKER_XPATH = "//div[contains(@class, 'MKiFS6')] | //div[contains(@class, '_3LWZlK')]"
+
+# Scrolls to the bottom and resolves as soon as new reviews are appended (MutationObserver),
+# or after timeoutMs if nothing arrives. One async round trip per scroll.
+SCROLL_AND_WAIT_JS = """
+var xpath = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+function state() {
+    return {
+        count: document.evaluate('count(' + xpath + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue,
+        height: document.body.scrollHeight
+    };
+}
+var before = state(), timer = null;
+var observer = new MutationObserver(function () {
+    var now = state();
+    if (now.count > before.count) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done({before: before, after: now});
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(function () {
+    observer.disconnect();
+    done({before: before, after: state()});
+}, timeoutMs);
+window.scrollTo(0, document.body.scrollHeight);
+"""
 
 class FlipkartScraper:
-    def __init__(self):
-        self.driver = get_driver()
+    def __init__(self, extraction="bulk", driver=None, lean=False, min_delay=1.0, max_delay=2.0, max_wait=10, selectors=None):
+        """
+        extraction: "bulk" pulls every review with one execute_script call,
+        "offline" parses page_source with lxml (scraper.parser),
+        "elements" walks the blocks with find_element calls (old behaviour).
+        driver: an existing driver (e.g. leased from a DriverPool). The scraper
+        only quits drivers it created itself.
+        lean: start the driver with the resource-blocking profile (see utils.get_driver).
+        min_delay/max_delay: politeness floor (seconds) after each navigation. Waits return
+        as soon as the new content is present, but never faster than this.
+        max_wait: longest time to wait for new content before giving up.
+        selectors: SelectorCache with the selector order learned per layout
+        (default: the process-wide one, see selector_cache.default_cache).
+        """
+        self.owns_driver = driver is None
+        self.driver = driver if driver is not None else get_driver(lean=lean)
         self.wait = WebDriverWait(self.driver, 10)  # Standard 10s wait
+        self.extraction = extraction
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+        self.max_wait = max_wait
+        self.selectors = selectors if selectors is not None else default_cache()
+        # (blocks already processed, strategy) for extract_page_data(only_new=True)
+        self._block_cursor = (0, None)
 
+    @timed("page_load")
     def open_product_page(self, url):
         """
         Opens the product page and handles the initial popup.
         """
         print(f"Opening URL: {url}")
-        self.driver.get(url)
-        random_sleep(2, 4)
+        started = time.monotonic()
+        self.driver.get(url)  # returns once the document has loaded
+        self._block_cursor = (0, None)
+        polite_sleep(started, self.min_delay, self.max_delay)
         self.close_login_popup()
 
     def close_login_popup(self):
@@ -28,18 +137,21 @@ class FlipkartScraper:
             print("Checking for login popup...")
             # Flipkart's popup close button selector (class: _30XB9F is common for the 'X' button)
             # Also checking for older selectors just in case
-            close_btn = self.wait.until(
+            # The popup shows up right after load, so a short wait is enough
+            close_btn = WebDriverWait(self.driver, 3).until(
                 EC.element_to_be_clickable((By.XPATH, "//div[@class='_30XB9F'] | //button[contains(@class, '_2KpZ6l')]"))
             )
             # Click it
+            started = time.monotonic()
             close_btn.click()
             print("Login popup closed.")
-            random_sleep(1, 2)
+            polite_sleep(started, self.min_delay / 2, self.max_delay / 2)
         except TimeoutException:
             print("No login popup appeared (or couldn't find close button).")
         except Exception as e:
             print(f"Error closing popup: {e}")
 
+    @timed("page_load")
     def go_to_all_reviews(self):
         """
         Navigates from the main product page to the 'All Reviews' page.
@@ -82,27 +194,53 @@ class FlipkartScraper:
 
             # Scroll to it
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", all_reviews_btn)
-            random_sleep(1, 2)
             
+            started = time.monotonic()
             try:
                 all_reviews_btn.click()
             except ElementClickInterceptedException:
                 self.driver.execute_script("arguments[0].click();", all_reviews_btn)
             
             print("Clicked 'All Reviews' button.")
-            random_sleep(3, 5) # wait for the new page to load
+            # Wait for the reviews page instead of a fixed sleep
+            try:
+                WebDriverWait(self.driver, self.max_wait, poll_frequency=0.25).until(
+                    lambda d: "/product-reviews/" in d.current_url
+                )
+            except TimeoutException:
+                print("   Reviews page didn't show up in time. Continuing anyway...")
+            polite_sleep(started, self.min_delay, self.max_delay)
             
         except Exception as e:
             print(f"Error navigating to all reviews: {e}")
 
+    @timed("page_load")
+    def sort_reviews(self, order="MOST_RECENT"):
+        """
+        Reloads the reviews page in another order (Flipkart's sortOrder values:
+        MOST_RECENT, MOST_HELPFUL, POSITIVE_FIRST, NEGATIVE_FIRST). Later pages
+        are loaded from this URL, so they keep the order.
+        """
+        print(f"Sorting reviews by {order}...")
+        started = time.monotonic()
+        self.driver.get(set_url_param(self.driver.current_url, "sortOrder", order))
+        self._block_cursor = (0, None)
+        polite_sleep(started, self.min_delay, self.max_delay)
+
     def quit(self):
+        if not self.owns_driver:
+            return
         print("Closing driver...")
         self.driver.quit()
 
-    def extract_page_data(self):
+    @timed("extract")
+    def extract_page_data(self, only_new=False):
         """
         Extracts all reviews from the current page.
         Returns a list of dictionaries.
+
+        only_new: skip review blocks handled by a previous call on the same DOM
+        (infinite scroll), so each call only reads the newly appended reviews.
         """
         reviews_data = []
         try:
@@ -118,130 +256,29 @@ class FlipkartScraper:
             except TimeoutException:
                 print("   Timeout waiting for review elements. Trying extraction anyway...")
 
-            # 2. Multi-strategy selector for review containers
-            strategies = [
-                # A. Container that wraps the whole review column
-                "//div[contains(@class, 'gMdEY7')]//div[contains(@class, 'col')]",
-                # B. Direct content wrapper parent
-                "//div[contains(@class, 'x_CUu6')]/parent::div",
-                # C. Find ANY div that contains a rating block (Very Robust)
-                "//div[(.//div[contains(@class, 'MKiFS6')] or .//div[contains(@class, '_3LWZlK')]) and .//p]",
-                # D. Classic layout
-                "//div[contains(@class, '_2wzgFH')]",
-                # E. Mobile/Responsive layout
-                "//div[contains(@class, 'cPHDOP')]"
-            ]
+            # 2. Collect the raw field candidates for every review block
+            result = None
+            if self.extraction == "offline":
+                result = self._collect_raw_reviews_offline(only_new)
+            elif self.extraction == "bulk":
+                try:
+                    result = self._collect_raw_reviews_bulk(only_new)
+                except WebDriverException as e:
+                    print(f"   Bulk extraction failed ({e.__class__.__name__}), falling back to element-by-element...")
+            if result is None:
+                result = self._collect_raw_reviews_elements(only_new)
+            strategy, raw_reviews = result
 
-            review_blocks = []
-            for xpath in strategies:
-                blocks = self.driver.find_elements(By.XPATH, xpath)
-                # Filter out small blocks (e.g. sidebar info)
-                # True review blocks usually have some height/text
-                valid_blocks = [b for b in blocks if len(b.text.strip()) > 20]
-                if valid_blocks:
-                    review_blocks = valid_blocks
-                    print(f"   Success with strategy: {xpath} (Found {len(review_blocks)})")
-                    break
-            
-            if not review_blocks:
+            if not strategy:
                 print("   Found 0 reviews on this page. Saving debug snapshot...")
                 with open("debug_last_failed.html", "w", encoding="utf-8") as f:
                     f.write(self.driver.page_source)
                 return []
+            print(f"   Success with strategy: {strategy} (Found {len(raw_reviews)}{' new' if only_new else ''})")
 
-            for block in review_blocks:
-                data = {
-                    "platform": "Flipkart",
-                    "reviewer_name": None,
-                    "rating": None,
-                    "review": None,
-                    "review_date": None
-                }
-                
-                # 0. Extract Reviewer Name
-                try:
-                    # New layout: Name usually has class 'ZDi3w2' (often combined with zJ1ZGa)
-                    try:
-                        name_elem = block.find_element(By.XPATH, ".//p[contains(@class, 'ZDi3w2')]")
-                        data["reviewer_name"] = name_elem.text.strip()
-                    except:
-                        pass
-                    
-                    # Old layout fallback: _2V5EHH
-                    if not data["reviewer_name"]:
-                         try:
-                            name_elem = block.find_element(By.XPATH, ".//p[contains(@class, '_2V5EHH')]")
-                            data["reviewer_name"] = name_elem.text.strip()
-                         except:
-                            pass
-                except:
-                    pass
-                
-                if not data["reviewer_name"]:
-                    data["reviewer_name"] = "Anonymous"
-
-                # 1. Extract Rating (New layout uses MKiFS6 or XdJ...]
-                try:
-                    # Try new selector first
-                    rating_elem = block.find_element(By.XPATH, ".//div[contains(@class, 'MKiFS6')]")
-                    data["rating"] = int(rating_elem.text.strip())
-                except:
-                    # Fallback old selector
-                    try:
-                        rating_elem = block.find_element(By.XPATH, ".//div[contains(@class, '_3LWZlK')]")
-                        data["rating"] = int(rating_elem.text.strip())
-                    except:
-                        data["rating"] = 0
-                
-                # 2. Extract Review Text & Title
-                try:
-                    full_text_parts = []
-                    # Title (New: qW2QI1, Old: _2-N8zT)
-                    try:
-                        title_elem = block.find_element(By.XPATH, ".//p[contains(@class, 'qW2QI1')] | .//p[contains(@class, '_2-N8zT')]")
-                        full_text_parts.append(title_elem.text.strip())
-                    except:
-                        pass
-                    
-                    # Body (New: G4PxIA, Old: t-ZTKy)
-                    try:
-                        text_elem = block.find_element(By.XPATH, ".//div[contains(@class, 'G4PxIA')]//div[1] | .//div[contains(@class, 't-ZTKy')]")
-                        body = text_elem.text.replace("READ MORE", "").strip()
-                        full_text_parts.append(body)
-                    except:
-                        pass
-                        
-                    data["review"] = self._clean_text(" - ".join(full_text_parts))
-                except:
-                    data["review"] = ""
-
-                # 3. Extract Date
-                try:
-                    # New layout: Date is often a simple <p class="zJ1ZGa">10 months ago</p>
-                    # But author name also uses zJ1ZGa or similar? 
-                    # In sample: Name is <p class="zJ1ZGa ZDi3w2">Name</p>
-                    # Date is <p class="zJ1ZGa">10 months ago</p> (Second occurrence in footer or distinct class)
-                    
-                    # Strategy: Get all 'zJ1ZGa' or '_2sc7ZR'
-                    date_candidates = block.find_elements(By.XPATH, ".//p[contains(@class, 'zJ1ZGa')] | .//p[contains(@class, '_2sc7ZR')]")
-                    
-                    # Usually the last one or the one with 'ago' or year is the date
-                    valid_date_found = False
-                    for dc in date_candidates:
-                        txt = dc.text.strip()
-                        # Simple heuristic: if it contains "ago" or "202" (year)
-                        if "ago" in txt or "202" in txt or "201" in txt:
-                             data["review_date"] = txt
-                             valid_date_found = True
-                             break
-                    
-                    if not valid_date_found and date_candidates:
-                         # Fallback: take the last one
-                         data["review_date"] = date_candidates[-1].text.strip()
-                         
-                except:
-                    data["review_date"] = None
-                
+            # 3. Turn candidates into review dicts
+            for raw in raw_reviews:
+                data = build_review(raw)
                 if data["rating"] or data["review"]:
                     reviews_data.append(data)
                 
@@ -250,11 +287,123 @@ class FlipkartScraper:
             
         return reviews_data
 
+    def _collect_raw_reviews_bulk(self, only_new=False):
+        """
+        Collects every review on the page in a single execute_script round trip.
+        Processed blocks are tagged with a marker attribute so only_new can skip them.
+        Returns (strategy, raw field candidates) - see parser.build_review.
+        """
+        rankings = self.selectors.rankings()
+        fallback = {"strategies": REVIEW_BLOCK_STRATEGIES, "fields": REVIEW_FIELD_XPATHS}
+        result = self.driver.execute_script(
+            BULK_EXTRACT_JS, list(LAYOUT_MARKERS.items()), rankings, fallback, REVIEW_DATE_XPATH, only_new,
+            list(FIELDS_READ_IN_FULL)
+        )
+        if not result:
+            return None, []
+        strategy, raw_reviews = result.get("strategy"), result.get("reviews", [])
+        ranking = rankings.get(result.get("signature"), fallback)
+        self.selectors.learn(result.get("signature"), strategy, raw_reviews, (ranking["strategies"], ranking["fields"]))
+        return strategy, raw_reviews
+
+    def _collect_raw_reviews_offline(self, only_new=False):
+        """
+        Fetches page_source once and runs the selectors with lxml (scraper.parser).
+        """
+        skip, skip_strategy = self._block_cursor if only_new else (0, None)
+        tree = parse_html(self.driver.page_source)
+        signature = layout_signature(tree)
+        ranking = self.selectors.ranking(signature)
+        strategy, raw_reviews, block_count = extract_raw_reviews(
+            tree, skip=skip, skip_strategy=skip_strategy, ranking=ranking
+        )
+        self._block_cursor = (block_count, strategy)
+        self.selectors.learn(signature, strategy, raw_reviews, ranking)
+        return strategy, raw_reviews
+
+    def _collect_raw_reviews_elements(self, only_new=False):
+        """
+        Element-by-element version of _collect_raw_reviews_bulk.
+        Slower (one WebDriver call per field), but doesn't depend on execute_script.
+        Uses an index cursor instead of a marker attribute for only_new.
+        """
+        skip, skip_strategy = self._block_cursor if only_new else (0, None)
+        signature = "+".join(name for name, xpath in LAYOUT_MARKERS.items() if self.driver.find_elements(By.XPATH, xpath))
+        ranking = self.selectors.ranking(signature)
+        strategies, fields = ranking
+        strategy = None
+        review_blocks = []
+        for xpath in strategies:
+            blocks = self.driver.find_elements(By.XPATH, xpath)
+            seen = skip if xpath == skip_strategy else 0
+            # Filter out small blocks (e.g. sidebar info)
+            # True review blocks usually have some height/text
+            valid_blocks = [b for b in blocks[seen:] if len(b.text.strip()) > 20]
+            if valid_blocks or (seen and len(blocks) >= seen):
+                strategy = xpath
+                review_blocks = valid_blocks
+                self._block_cursor = (len(blocks), xpath)
+                break
+
+        raw_reviews = []
+        for block in review_blocks:
+            raw = {}
+            for field, xpaths in fields.items():
+                raw[field] = [None] * len(xpaths)
+                for i, xpath in enumerate(xpaths):
+                    try:
+                        elems = block.find_elements(By.XPATH, xpath)
+                        if elems:
+                            raw[field][i] = elems[0].text
+                            if raw[field][i].strip() and field not in FIELDS_READ_IN_FULL:
+                                break
+                    except WebDriverException:
+                        pass
+            try:
+                raw["dates"] = [dc.text for dc in block.find_elements(By.XPATH, REVIEW_DATE_XPATH)]
+            except WebDriverException:
+                raw["dates"] = []
+            raw_reviews.append(raw)
+        self.selectors.learn(signature, strategy, raw_reviews, ranking)
+        return strategy, raw_reviews
+
     def _clean_text(self, text):
         """Helper to remove newlines and extra spaces."""
-        if not text:
-            return ""
-        return " ".join(text.split())
+        return clean_text(text)
+
+    @timed("page_load")
+    def open_review_page(self, reviews_url, page):
+        """
+        Loads review page `page` directly by URL (no clicking through).
+        """
+        started = time.monotonic()
+        self.driver.get(review_page_url(reviews_url, page))
+        self._block_cursor = (0, None)
+        polite_sleep(started, self.min_delay, self.max_delay)
+
+    def get_total_pages(self):
+        """
+        Reads the total number of review pages from the pagination bar
+        ("Page 1 of 1,234"), falling back to the highest numbered page link.
+        Returns an int, or None if there's no pagination bar.
+        """
+        try:
+            labels = self.driver.find_elements(By.XPATH,
+                "//*[self::span or self::div][starts-with(normalize-space(text()), 'Page ') and contains(text(), ' of ')]"
+            )
+            for label in labels:
+                match = re.search(r'of\s+([\d,]+)', label.text)
+                if match:
+                    return int(match.group(1).replace(",", ""))
+
+            numbers = [
+                int(link.text.strip())
+                for link in self.driver.find_elements(By.XPATH, "//nav//a")
+                if link.text.strip().isdigit()
+            ]
+            return max(numbers) if numbers else None
+        except WebDriverException:
+            return None
 
     def has_next_button(self):
         """
@@ -283,21 +432,45 @@ class FlipkartScraper:
             if next_btn:
                 btn = next_btn[0]
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                random_sleep(1, 2)
+                
+                # Remember the current page so we can tell when it's been replaced
+                old_url = self.driver.current_url
+                old_markers = self.driver.find_elements(By.XPATH, REVIEW_MARKER_XPATH)
+                started = time.monotonic()
                 
                 try:
                     btn.click()
                 except:
                     self.driver.execute_script("arguments[0].click();", btn)
                 
+                self._wait_for_page_change(old_url, old_markers[0] if old_markers else None)
                 print("   ✓ Navigated to next page")
-                random_sleep(3, 5)
+                polite_sleep(started, self.min_delay, self.max_delay)
                 return True
             return False
         except Exception as e:
             print(f"   Error clicking Next button: {e}")
             return False
     
+    def _wait_for_page_change(self, old_url, old_marker):
+        """
+        Waits until the previous review page is gone: the old rating element went
+        stale (DOM replaced) or the URL changed. New reviews are then awaited by
+        extract_page_data's presence check.
+        """
+        def page_changed(driver):
+            if old_marker is not None:
+                try:
+                    old_marker.is_enabled()
+                except StaleElementReferenceException:
+                    return True
+            return driver.current_url != old_url
+
+        try:
+            WebDriverWait(self.driver, self.max_wait, poll_frequency=0.25).until(page_changed)
+        except TimeoutException:
+            print("   Page didn't change in time. Continuing anyway...")
+
     def scroll_to_load_more(self):
         """
         Scrolls down to trigger infinite scroll and load more reviews.
@@ -306,28 +479,17 @@ class FlipkartScraper:
         try:
             print("   Using infinite scroll - scrolling down...")
             
-            # Get current number of review elements before scrolling
-            before_count = len(self.driver.find_elements(By.XPATH, 
-                "//div[contains(@class, 'MKiFS6')] | //div[contains(@class, '_3LWZlK')]"
-            ))
-            
-            # Get current scroll height
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            # Scroll to bottom
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            # Scroll to bottom and wait until new reviews are appended (or max_wait passes)
+            started = time.monotonic()
+            self.driver.set_script_timeout(self.max_wait + 5)
+            result = self.driver.execute_async_script(SCROLL_AND_WAIT_JS, REVIEW_MARKER_XPATH, int(self.max_wait * 1000))
+            polite_sleep(started, self.min_delay, self.max_delay)
             
-            # Wait for new content to load
-            random_sleep(3, 5)
-            
-            # Get new scroll height
+            before_count, last_height = int(result["before"]["count"]), result["before"]["height"]
+            after_count = int(result["after"]["count"])
+            # Re-read the height: lazy content may still have grown the page during the polite delay
             new_height = self.driver.execute_script("return document.body.scrollHeight")
             
-            # Get new count of review elements
-            after_count = len(self.driver.find_elements(By.XPATH, 
-                "//div[contains(@class, 'MKiFS6')] | //div[contains(@class, '_3LWZlK')]"
-            ))
-            
             # Check if new content loaded
             if new_height > last_height or after_count > before_count:
                 print(f"   ✓ Loaded more reviews ({before_count} → {after_count})")
@@ -340,6 +502,7 @@ class FlipkartScraper:
             print(f"   Error during scroll: {e}")
             return False
     
+    @timed("navigate")
     def next_page(self):
         """
         Smart hybrid method that auto-detects pagination type.
@@ -359,3 +522,38 @@ class FlipkartScraper:
             print(f"Error in next_page: {e}")
             return False
 
+    @timed("navigate")
+    def skip_to_page(self, page, paginated):
+        """
+        Moves a freshly opened reviews page forward to page `page` when a job
+        resumes. Paginated products load it by URL; infinite scroll scrolls
+        down page - 1 times and marks the reviews loaded before it as read, so
+        extract_page_data(only_new=True) continues with that page's reviews.
+        Returns False if the product ends before that page.
+        """
+        if page <= 1:
+            return True
+        if paginated:
+            self.open_review_page(self.driver.current_url, page)
+            return True
+
+        print(f"   Resuming: scrolling past {page - 1} loaded page(s)...")
+        for _ in range(page - 2):
+            if not self.scroll_to_load_more():
+                return False
+        self.extract_page_data(only_new=True)
+        return self.scroll_to_load_more()
+
+    def iter_review_pages(self, max_pages, only_new=False, start_page=1):
+        """
+        Yields (page_number, reviews) for the current page and every following
+        one reached through next_page(), up to max_pages.
+        only_new: see extract_page_data (use for infinite scroll).
+        """
+        page_number = start_page - 1
+        while page_number < max_pages:
+            page_number += 1
+            yield page_number, self.extract_page_data(only_new=only_new)
+            if page_number < max_pages and not self.next_page():
+                print("   Reached end of content")
+                return
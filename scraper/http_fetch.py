@@ -0,0 +1,115 @@
+"""
+Direct HTTP fetch path for paginated review pages.
+
+The browser is only used once per product: to get past the landing page and
+collect cookies. Subsequent /product-reviews/...&page=N pages are downloaded
+over a pooled keep-alive requests.Session and parsed offline (scraper.parser),
+with several pages in flight under a rate limit.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .parser import parse_reviews
+from .utils import RateLimiter, review_page_url
+from .metrics import bind, timed
+
+
+class ReviewPageFetcher:
+    """
+    Downloads review pages by URL using the browser's cookies and user agent.
+
+    concurrency: pages in flight at once (also the connection pool size)
+    rate_limit: max requests started per second across all threads
+    selectors: SelectorCache for the parser (None: default selector order)
+    """
+    def __init__(self, driver, concurrency=4, rate_limit=2.0, timeout=20, selectors=None):
+        self.base_url = driver.current_url
+        self.selectors = selectors
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Look like the browser session that just loaded page 1
+        self.session.headers.update({
+            "User-Agent": driver.execute_script("return navigator.userAgent"),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-IN,en;q=0.9",
+            "Referer": self.base_url
+        })
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+    @timed("http_fetch")
+    def fetch_page(self, page):
+        """Downloads and parses one review page. Returns a list of review dicts."""
+        self.rate_limiter.wait()
+        response = self.session.get(review_page_url(self.base_url, page), timeout=self.timeout)
+        response.raise_for_status()
+        return parse_reviews(response.text, selectors=self.selectors)
+
+    def iter_pages(self, start_page, end_page):
+        """
+        Yields (page_number, reviews) in page order for start_page..end_page,
+        keeping up to `concurrency` requests in flight. Stops at the first page
+        that has no reviews or fails after retries (end of the product).
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = {}
+            next_to_submit = start_page
+            try:
+                for page in range(start_page, end_page + 1):
+                    # Keep the window full
+                    while next_to_submit <= end_page and next_to_submit < page + self.concurrency:
+                        pending[next_to_submit] = executor.submit(bind(self.fetch_page), next_to_submit)
+                        next_to_submit += 1
+
+                    try:
+                        reviews = pending.pop(page).result()
+                    except requests.RequestException as e:
+                        print(f"   [HTTP] Page {page} failed: {e}")
+                        return
+                    if not reviews:
+                        print(f"   [HTTP] Page {page} has no reviews - end of product")
+                        return
+                    yield page, reviews
+            finally:
+                # Pages fetched past the end are simply dropped
+                for future in pending.values():
+                    future.cancel()
+
+    def close(self):
+        self.session.close()
+
+
+def iter_review_pages_http(scraper, max_pages, concurrency=4, rate_limit=2.0, start_page=1):
+    """
+    Drop-in alternative to scraper.iter_review_pages() for paginated products:
+    page 1 comes from the browser, pages 2..max_pages over HTTP. Falls back to
+    clicking through in the browser if the HTTP path gets nothing back.
+    start_page > 1 (resuming) fetches start_page..max_pages over HTTP only.
+    """
+    first_http_page = max(2, start_page)
+    if start_page <= 1:
+        yield 1, scraper.extract_page_data()
+    if max_pages < first_http_page:
+        return
+
+    fetcher = ReviewPageFetcher(scraper.driver, concurrency=concurrency, rate_limit=rate_limit, selectors=scraper.selectors)
+    got_pages = False
+    try:
+        for page_number, reviews in fetcher.iter_pages(first_http_page, max_pages):
+            got_pages = True
+            yield page_number, reviews
+    finally:
+        fetcher.close()
+
+    if not got_pages and (scraper.next_page() if start_page <= 1 else scraper.skip_to_page(first_http_page, paginated=True)):
+        print("   [HTTP] No reviews over HTTP - falling back to the browser")
+        yield from scraper.iter_review_pages(max_pages, start_page=first_http_page)
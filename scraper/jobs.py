@@ -0,0 +1,470 @@
+"""
+Job manager for scrape jobs.
+
+Jobs live in a small SQLite database (output/jobs.db) shared by every API
+worker process: each job's parameters, status, cancel flag and latest
+progress snapshot. Any worker can therefore answer /api/status/<job_id>,
+and every worker's JobManager claims queued jobs from the same table, so
+jobs queue up instead of being rejected while another one runs.
+
+Cancellation is cooperative: the runner checks JobContext.cancelled()
+between pages and winds the job down itself.
+
+Running jobs hold a lease: their worker's heartbeat thread touches
+updated_at every few seconds, and any worker marks running jobs whose
+updated_at is older than JOB_LEASE_SECONDS as interrupted (they can be
+resumed). This covers workers that died, hosts that were replaced by a
+redeploy and PIDs that were reused, none of which a process check can tell.
+
+Progress is also recorded as small events (page advanced, product finished,
+job ended) in an events table, which /api/events/<job_id> streams to
+clients as Server-Sent Events instead of them polling the full status.
+"""
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+
+JOBS_DB_PATH = os.environ.get('JOBS_DB_PATH', os.path.join("output", "jobs.db"))
+# A running job whose worker hasn't renewed its lease for this long is interrupted
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 60))
+
+# Job statuses a job can't leave by itself
+FINISHED_STATUSES = ("completed", "error", "cancelled", "interrupted")
+
+
+class QueueFull(Exception):
+    """Raised by JobManager.submit when max_queued jobs are already waiting."""
+
+
+class JobStore:
+    """
+    Jobs table in SQLite. Opens a short-lived connection per call, so it is safe
+    across threads and processes. The database is created on first use.
+    """
+    def __init__(self, path=JOBS_DB_PATH):
+        self.path = path
+        self._ready = False
+        self._ready_lock = threading.Lock()
+        # Wakes event readers in this process as soon as events are added
+        self.events_added = threading.Condition()
+
+    def _create(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._open() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    state TEXT,
+                    resume INTEGER NOT NULL DEFAULT 0,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS events_by_job ON events (job_id, id)")
+
+    def _connect(self):
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    self._create()
+                    self._ready = True
+        return self._open()
+
+    @contextmanager
+    def _open(self):
+        # Autocommit; claim_next/request_cancel open their own IMMEDIATE transactions
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _now():
+        return datetime.now().isoformat(timespec="seconds")
+
+    def add(self, job_id, params, state, resume=False):
+        """Queues a job (re-queues it when resuming an existing job id)."""
+        now = self._now()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, params, state, resume, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET status = 'queued', params = excluded.params, state = excluded.state, "
+                "resume = excluded.resume, cancel_requested = 0, worker = NULL, updated_at = excluded.updated_at",
+                (job_id, json.dumps(params), json.dumps(state), int(resume), now, now)
+            )
+
+    def count(self, status):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def count_by_status(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def claim_next(self, worker):
+        """Atomically moves the oldest queued job to 'running' for `worker`. Returns its row or None."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT job_id, params, resume FROM jobs WHERE status = 'queued' ORDER BY created_at, rowid LIMIT 1"
+                ).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, updated_at = ? WHERE job_id = ?",
+                        (worker, self._now(), row[0])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if not row:
+            return None
+        return {"job_id": row[0], "params": json.loads(row[1]), "resume": bool(row[2])}
+
+    def save_state(self, job_id, state, status=None, events=()):
+        """Saves a job's state snapshot, plus any (type, data) events, in one transaction."""
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            if events:
+                conn.executemany(
+                    "INSERT INTO events (job_id, type, data) VALUES (?, ?, ?)",
+                    [(job_id, event_type, json.dumps(data)) for event_type, data in events]
+                )
+            if status:
+                conn.execute(
+                    "UPDATE jobs SET state = ?, status = ?, updated_at = ? WHERE job_id = ?",
+                    (json.dumps(state), status, self._now(), job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET state = ?, updated_at = ? WHERE job_id = ?",
+                    (json.dumps(state), self._now(), job_id)
+                )
+            conn.execute("COMMIT")
+        if events:
+            self._notify_events()
+
+    def _notify_events(self):
+        with self.events_added:
+            self.events_added.notify_all()
+
+    def add_event(self, job_id, event_type, data):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO events (job_id, type, data) VALUES (?, ?, ?)",
+                (job_id, event_type, json.dumps(data))
+            )
+        self._notify_events()
+
+    def last_event_id(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    def events_since(self, job_id, after_id, limit=500):
+        """A job's events with id > after_id, oldest first: [(id, type, data)]."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, type, data FROM events WHERE job_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (job_id, after_id, limit)
+            ).fetchall()
+        return [(event_id, event_type, json.loads(data)) for event_id, event_type, data in rows]
+
+    def wait_for_events(self, timeout):
+        """Blocks until events are added in this process, or `timeout` seconds (other processes' events)."""
+        with self.events_added:
+            self.events_added.wait(timeout)
+
+    def prune_events(self, max_age_seconds=24 * 3600):
+        """Drops the events of jobs that finished more than max_age_seconds ago."""
+        cutoff = datetime.fromtimestamp(time.time() - max_age_seconds).isoformat(timespec="seconds")
+        with self._connect() as conn:
+            conn.execute(
+                f"DELETE FROM events WHERE job_id IN (SELECT job_id FROM jobs WHERE status IN "
+                f"({','.join('?' * len(FINISHED_STATUSES))}) AND updated_at < ?)",
+                (*FINISHED_STATUSES, cutoff)
+            )
+
+    def get(self, job_id):
+        """Returns {"job_id", "status", "params", "state", "created_at", "updated_at"} or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, status, params, state, created_at, updated_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def latest(self):
+        """The most recently created job, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, status, params, state, created_at, updated_at FROM jobs ORDER BY created_at DESC, rowid DESC LIMIT 1"
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list(self, limit=50):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, status, params, state, created_at, updated_at FROM jobs ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    @staticmethod
+    def _row_to_job(row):
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "params": json.loads(row[2]),
+            "state": json.loads(row[3]) if row[3] else None,
+            "created_at": row[4],
+            "updated_at": row[5]
+        }
+
+    def request_cancel(self, job_id):
+        """
+        Flags a job for cancellation. A queued job is cancelled right away;
+        a running one stops at its next page. Returns the job's status, or None if unknown.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            status = row[0]
+            if status == "queued":
+                status = "cancelled"
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, updated_at = ? WHERE job_id = ?",
+                    (self._now(), job_id)
+                )
+                conn.execute(
+                    "INSERT INTO events (job_id, type, data) VALUES (?, 'end', ?)",
+                    (job_id, json.dumps({"status": status}))
+                )
+            elif status == "running":
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE job_id = ?", (job_id,))
+            conn.execute("COMMIT")
+        if status == "cancelled":
+            self._notify_events()
+        return status
+
+    def is_cancel_requested(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def renew_leases(self, worker, job_ids):
+        """Touches the running jobs `worker` still holds. Returns the ids of those it no longer holds."""
+        if not job_ids:
+            return []
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            held = conn.execute(
+                f"SELECT job_id FROM jobs WHERE status = 'running' AND worker = ? AND job_id IN ({','.join('?' * len(job_ids))})",
+                (worker, *job_ids)
+            ).fetchall()
+            held = [row[0] for row in held]
+            if held:
+                conn.execute(
+                    f"UPDATE jobs SET updated_at = ? WHERE job_id IN ({','.join('?' * len(held))})",
+                    (self._now(), *held)
+                )
+            conn.execute("COMMIT")
+        return [job_id for job_id in job_ids if job_id not in held]
+
+    def expire_leases(self, max_age_seconds=JOB_LEASE_SECONDS):
+        """Marks running jobs whose lease wasn't renewed for max_age_seconds as interrupted (they can be resumed)."""
+        cutoff = datetime.fromtimestamp(time.time() - max_age_seconds).isoformat(timespec="seconds")
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = [row[0] for row in conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'running' AND updated_at < ?", (cutoff,)
+            ).fetchall()]
+            for job_id in expired:
+                conn.execute(
+                    "UPDATE jobs SET status = 'interrupted', updated_at = ? WHERE job_id = ?",
+                    (self._now(), job_id)
+                )
+                conn.execute(
+                    "INSERT INTO events (job_id, type, data) VALUES (?, 'end', ?)",
+                    (job_id, json.dumps({"status": "interrupted"}))
+                )
+            conn.execute("COMMIT")
+        if expired:
+            self._notify_events()
+        return expired
+
+
+class JobContext:
+    """
+    Handed to the job runner: the job's live state dict plus helpers to
+    publish it to the store, emit progress events and check for
+    cancellation. Publishing and cancel checks are throttled and events are
+    written along with the next publish, so calling them on every page is cheap.
+    """
+    def __init__(self, store, job_id, params, state, resume=False, publish_interval=0.5, cancel_check_interval=1.0):
+        self.store = store
+        self.job_id = job_id
+        self.params = params
+        self.state = state
+        self.resume = resume
+        self.publish_interval = publish_interval
+        self.cancel_check_interval = cancel_check_interval
+        self._last_publish = 0.0
+        self._last_cancel_check = 0.0
+        self._cancelled = False
+        # Set by the manager when another worker declared this job interrupted
+        self.lease_lost = False
+        self._events = []
+        self._lock = threading.Lock()
+
+    def emit(self, event_type, **data):
+        """Queues a progress event; it is stored (and streamed) on the next publish()."""
+        with self._lock:
+            self._events.append((event_type, data))
+
+    def publish(self, force=False):
+        """Writes the current state and queued events to the store (at most every publish_interval seconds unless forced)."""
+        now = time.monotonic()
+        if not force and now - self._last_publish < self.publish_interval:
+            return
+        with self._lock:
+            self._last_publish = now
+            self.store.save_state(self.job_id, self.state, events=self._take_events())
+
+    def _take_events(self):
+        events, self._events = self._events, []
+        return events
+
+    def cancelled(self):
+        """True once a cancel was requested for this job (or its lease was lost)."""
+        if self._cancelled or self.lease_lost:
+            return True
+        now = time.monotonic()
+        if now - self._last_cancel_check >= self.cancel_check_interval:
+            self._last_cancel_check = now
+            self._cancelled = self.store.is_cancel_requested(self.job_id)
+        return self._cancelled
+
+
+class JobManager:
+    """
+    Runs queued jobs on `slots` worker threads.
+
+    runner(context) does the work; its final context.state["status"] becomes
+    the job status. submit() refuses new jobs with QueueFull once
+    `max_queued` are waiting. A heartbeat thread renews the leases of the
+    jobs this manager runs and expires everyone's stale leases.
+    """
+    def __init__(self, store, runner, new_state, slots=1, max_queued=20, poll_interval=1.0,
+                 lease_seconds=JOB_LEASE_SECONDS):
+        self.store = store
+        self.runner = runner
+        self.new_state = new_state
+        self.slots = max(1, slots)
+        self.max_queued = max_queued
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        # Unique per process start: hostnames and PIDs are reused across restarts
+        self.worker = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self._wake = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._running = {}  # job_id -> JobContext, for the heartbeat
+        self._running_lock = threading.Lock()
+
+    def start(self):
+        """Starts the slot and heartbeat threads (once per process; safe to call on every request)."""
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self.store.expire_leases(self.lease_seconds)
+            self.store.prune_events()
+            threads = [threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)]
+            threads += [threading.Thread(target=self._run_slot, name=f"job-slot-{slot}", daemon=True) for slot in range(self.slots)]
+            for thread in threads:
+                thread.start()
+            self._threads = threads
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(max(1.0, self.lease_seconds / 4))
+            try:
+                with self._running_lock:
+                    running = dict(self._running)
+                for job_id in self.store.renew_leases(self.worker, list(running)):
+                    print(f"Job {job_id} lost its lease (marked interrupted) - stopping it")
+                    running[job_id].lease_lost = True
+                self.store.expire_leases(self.lease_seconds)
+            except sqlite3.Error:
+                traceback.print_exc()
+
+    def submit(self, job_id, params, resume=False):
+        """Queues a job. Returns its position in the queue (1 = next)."""
+        queued = self.store.count("queued")
+        if queued >= self.max_queued:
+            raise QueueFull(f"{queued} jobs are already queued")
+        state = self.new_state()
+        state["job_id"] = job_id
+        state["status"] = "queued"
+        self.store.add(job_id, params, state, resume=resume)
+        self._wake.set()
+        return queued + 1
+
+    def _run_slot(self):
+        while True:
+            job = self.store.claim_next(self.worker)
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            state = self.new_state()
+            state["job_id"] = job["job_id"]
+            context = JobContext(self.store, job["job_id"], job["params"], state, resume=job["resume"])
+            with self._running_lock:
+                self._running[job["job_id"]] = context
+            try:
+                self.runner(context)
+            except Exception as e:
+                traceback.print_exc()
+                state["status"] = "error"
+                state["error"] = str(e)
+            finally:
+                with self._running_lock:
+                    del self._running[job["job_id"]]
+            state["is_running"] = False
+            if context.lease_lost:
+                # Already interrupted (and its end event sent) by another worker; keep that status
+                self.store.save_state(job["job_id"], state)
+                continue
+            status = state["status"] if state["status"] in FINISHED_STATUSES else "completed"
+            # Events still queued by the runner go out before the job's end event
+            events = context._take_events() + [("end", {"status": status, "error": state.get("error")})]
+            self.store.save_state(job["job_id"], state, status=status, events=events)
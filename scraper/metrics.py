@@ -0,0 +1,259 @@
+"""
+Lightweight timing and WebDriver call instrumentation.
+
+A Metrics object collects, per phase (page_load, navigate, extract,
+polite_sleep, dedup, date_parse, write, export, ...), how often it ran and
+how long it took, plus every WebDriver command sent through an instrumented
+driver's command executor. Work is attributed to the Metrics *active in the
+current thread* (see Metrics.active), so pooled drivers and shared helpers
+need no extra arguments, and nothing is recorded when no Metrics is active.
+
+Phases can nest - navigate and page_load include their polite_sleep - so
+phase times don't add up to the wall time. Every job's Metrics also feeds
+the process-wide REGISTRY behind /api/metrics.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+_local = threading.local()
+
+
+def current():
+    """The Metrics active in this thread, or None."""
+    return getattr(_local, "metrics", None)
+
+
+class Metrics:
+    """
+    Phase timers and WebDriver command counts (thread-safe).
+
+    recent_pages: how many per-page breakdowns to keep (see page_done)
+    """
+    def __init__(self, parent=None, recent_pages=20):
+        self.parent = parent
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.pages = 0
+        self.phases = {}    # name -> [count, seconds, max_seconds]
+        self.commands = {}  # WebDriver command -> [count, seconds]
+        self.recent_pages = deque(maxlen=recent_pages)
+
+    # Recording
+
+    def record(self, phase, seconds):
+        metrics = self
+        while metrics is not None:
+            with metrics.lock:
+                stats = metrics.phases.get(phase)
+                if stats is None:
+                    stats = metrics.phases[phase] = [0, 0.0, 0.0]
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+            metrics = metrics.parent
+        phases = _page_bucket()["phases"]
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+    def record_command(self, command, seconds):
+        metrics = self
+        while metrics is not None:
+            with metrics.lock:
+                stats = metrics.commands.get(command)
+                if stats is None:
+                    stats = metrics.commands[command] = [0, 0.0]
+                stats[0] += 1
+                stats[1] += seconds
+            metrics = metrics.parent
+        bucket = _page_bucket()
+        bucket["calls"] += 1
+        bucket["webdriver_seconds"] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Times the enclosed block as phase `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def page_done(self, **labels):
+        """
+        Closes the current thread's page: everything recorded in this thread
+        since its previous page_done() becomes one per-page entry (with `labels`,
+        e.g. product and page number).
+        """
+        bucket = _page_bucket()
+        _local.page = None
+        now = time.perf_counter()
+        entry = {
+            **labels,
+            "seconds": round(now - bucket["started"], 3),
+            "calls": bucket["calls"],
+            "webdriver_seconds": round(bucket["webdriver_seconds"], 3),
+            "phases": {name: round(seconds, 3) for name, seconds in bucket["phases"].items()}
+        }
+        with self.lock:
+            self.recent_pages.append(entry)
+        metrics = self
+        while metrics is not None:
+            with metrics.lock:
+                metrics.pages += 1
+            metrics = metrics.parent
+
+    @contextmanager
+    def active(self):
+        """Makes this the Metrics that work in the current thread is recorded into."""
+        previous = current()
+        _local.metrics = self
+        _local.page = None
+        try:
+            yield self
+        finally:
+            _local.metrics = previous
+            _local.page = None
+
+    # Reporting
+
+    def snapshot(self, recent=5):
+        """JSON-serializable totals, per-page averages and the last `recent` pages."""
+        with self.lock:
+            pages = max(1, self.pages)
+            calls = sum(count for count, _ in self.commands.values())
+            return {
+                "elapsed_seconds": round(time.monotonic() - self.started, 1),
+                "pages": self.pages,
+                "phases": {
+                    name: {
+                        "count": count,
+                        "seconds": round(seconds, 3),
+                        "avg_ms": round(seconds / count * 1000, 2),
+                        "max_ms": round(longest * 1000, 2),
+                        "per_page_seconds": round(seconds / pages, 4)
+                    }
+                    for name, (count, seconds, longest) in sorted(self.phases.items(), key=lambda item: -item[1][1])
+                },
+                "webdriver": {
+                    "calls": calls,
+                    "seconds": round(sum(seconds for _, seconds in self.commands.values()), 3),
+                    "calls_per_page": round(calls / pages, 2),
+                    "by_command": {
+                        command: {"count": count, "seconds": round(seconds, 3)}
+                        for command, (count, seconds) in sorted(self.commands.items(), key=lambda item: -item[1][0])
+                    }
+                },
+                "recent_pages": list(self.recent_pages)[-recent:] if recent else []
+            }
+
+    def summary(self):
+        """Human-readable per-phase table for logs."""
+        snap = self.snapshot(recent=0)
+        lines = [f"⏱  {snap['pages']} page(s) in {snap['elapsed_seconds']}s - "
+                 f"{snap['webdriver']['calls']} WebDriver calls ({snap['webdriver']['calls_per_page']}/page, "
+                 f"{snap['webdriver']['seconds']}s)"]
+        for name, stats in snap["phases"].items():
+            lines.append(f"   {name:<14} {stats['seconds']:9.2f}s  {stats['count']:6d}x  "
+                         f"avg {stats['avg_ms']:8.1f} ms  {stats['per_page_seconds']:7.3f}s/page")
+        top = list(snap["webdriver"]["by_command"].items())[:5]
+        if top:
+            lines.append("   top commands: " + ", ".join(f"{command} {stats['count']}x" for command, stats in top))
+        return "\n".join(lines)
+
+    def prometheus(self, prefix="scraper"):
+        """Prometheus text exposition of the totals."""
+        with self.lock:
+            phases = {name: tuple(stats) for name, stats in self.phases.items()}
+            commands = {command: tuple(stats) for command, stats in self.commands.items()}
+            pages = self.pages
+        lines = [
+            f"# HELP {prefix}_pages_total Review pages processed.",
+            f"# TYPE {prefix}_pages_total counter",
+            f"{prefix}_pages_total {pages}",
+            f"# HELP {prefix}_phase_seconds_total Time spent per phase (phases can nest).",
+            f"# TYPE {prefix}_phase_seconds_total counter"
+        ]
+        lines += [f'{prefix}_phase_seconds_total{{phase="{name}"}} {seconds:.6f}' for name, (_, seconds, _) in phases.items()]
+        lines += [f"# HELP {prefix}_phase_runs_total Times each phase ran.", f"# TYPE {prefix}_phase_runs_total counter"]
+        lines += [f'{prefix}_phase_runs_total{{phase="{name}"}} {count}' for name, (count, _, _) in phases.items()]
+        lines += [f"# HELP {prefix}_webdriver_commands_total WebDriver commands sent.", f"# TYPE {prefix}_webdriver_commands_total counter"]
+        lines += [f'{prefix}_webdriver_commands_total{{command="{command}"}} {count}' for command, (count, _) in commands.items()]
+        lines += [f"# HELP {prefix}_webdriver_seconds_total Time waiting on WebDriver commands.", f"# TYPE {prefix}_webdriver_seconds_total counter"]
+        lines += [f'{prefix}_webdriver_seconds_total{{command="{command}"}} {seconds:.6f}' for command, (_, seconds) in commands.items()]
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide totals across all jobs (/api/metrics)
+REGISTRY = Metrics()
+
+
+def _page_bucket():
+    bucket = getattr(_local, "page", None)
+    if bucket is None:
+        bucket = _local.page = {"started": time.perf_counter(), "calls": 0, "webdriver_seconds": 0.0, "phases": {}}
+    return bucket
+
+
+@contextmanager
+def phase(name):
+    """Times the enclosed block into the active Metrics (no-op without one)."""
+    metrics = current()
+    if metrics is None:
+        yield
+        return
+    with metrics.phase(name):
+        yield
+
+
+def timed(name):
+    """Decorator: records each call of the function as phase `name` in the active Metrics."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = current()
+            if metrics is None:
+                return func(*args, **kwargs)
+            with metrics.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(func):
+    """Wraps `func` to run with this thread's active Metrics (for worker threads it starts)."""
+    metrics = current()
+    if metrics is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with metrics.active():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def instrument_driver(driver):
+    """
+    Times every command `driver` sends through its command executor, into the
+    Metrics active in the calling thread. Safe to call more than once.
+    """
+    executor = getattr(driver, "command_executor", None)
+    if executor is None or getattr(executor, "_metrics_instrumented", False):
+        return driver
+    execute = executor.execute
+
+    def timed_execute(command, params):
+        metrics = current()
+        if metrics is None:
+            return execute(command, params)
+        started = time.perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            metrics.record_command(command, time.perf_counter() - started)
+
+    executor.execute = timed_execute
+    executor._metrics_instrumented = True
+    return driver
@@ -0,0 +1,245 @@
+"""
+Offline review parser.
+
+Runs the same selectors as FlipkartScraper.extract_page_data against raw HTML
+(driver.page_source, debug_last_failed.html or any archived page) using lxml,
+so parsing doesn't need a browser and can run in worker processes.
+
+The order selectors are tried in can be learned per layout (see
+scraper.selector_cache); the lists below are the default order.
+
+Usage:
+    python -m scraper.parser page1.html [page2.html ...]
+"""
+import json
+import sys
+from lxml import etree, html as lxml_html
+
+# Review container strategies, tried in order until one yields blocks with text
+REVIEW_BLOCK_STRATEGIES = [
+    # A. Container that wraps the whole review column
+    "//div[contains(@class, 'gMdEY7')]//div[contains(@class, 'col')]",
+    # B. Direct content wrapper parent
+    "//div[contains(@class, 'x_CUu6')]/parent::div",
+    # C. Find ANY div that contains a rating block (Very Robust)
+    "//div[(.//div[contains(@class, 'MKiFS6')] or .//div[contains(@class, '_3LWZlK')]) and .//p]",
+    # D. Classic layout
+    "//div[contains(@class, '_2wzgFH')]",
+    # E. Mobile/Responsive layout
+    "//div[contains(@class, 'cPHDOP')]"
+]
+
+# Layouts (LAYOUT_MARKERS names) each strategy can match on, None for any page
+STRATEGY_LAYOUTS = {
+    REVIEW_BLOCK_STRATEGIES[0]: ("new",),
+    REVIEW_BLOCK_STRATEGIES[1]: ("new",),
+    REVIEW_BLOCK_STRATEGIES[2]: ("new", "old"),
+    REVIEW_BLOCK_STRATEGIES[3]: ("old",),
+    REVIEW_BLOCK_STRATEGIES[4]: None
+}
+
+# C and E aren't tied to one layout's markup: C matches on any page with ratings
+# (more blocks than reviews on the new layout) and E is a generic page section.
+# A page they won doesn't say which strategy the layout's other pages need.
+CATCH_ALL_STRATEGIES = (REVIEW_BLOCK_STRATEGIES[2], REVIEW_BLOCK_STRATEGIES[4])
+
+# Per-review field selectors (relative to a review block), new layout first
+REVIEW_FIELD_XPATHS = {
+    "name": [".//p[contains(@class, 'ZDi3w2')]", ".//p[contains(@class, '_2V5EHH')]"],
+    "rating": [".//div[contains(@class, 'MKiFS6')]", ".//div[contains(@class, '_3LWZlK')]"],
+    "title": [".//p[contains(@class, 'qW2QI1')] | .//p[contains(@class, '_2-N8zT')]"],
+    "body": [".//div[contains(@class, 'G4PxIA')]//div[1] | .//div[contains(@class, 't-ZTKy')]"]
+}
+
+# build_review falls back to the next rating when one isn't a number, so every
+# rating alternative is read; the other fields stop at the first one with text
+FIELDS_READ_IN_FULL = ("rating",)
+
+# Name and date share the zJ1ZGa class in the new layout, so all candidates are collected
+REVIEW_DATE_XPATH = ".//p[contains(@class, 'zJ1ZGa')] | .//p[contains(@class, '_2sc7ZR')]"
+
+# Rating classes that identify a layout. A page's layout signature is the names
+# of the markers it contains ("new", "old", "new+old" or "" for neither).
+LAYOUT_MARKERS = {
+    "new": "//div[contains(@class, 'MKiFS6')]",
+    "old": "//div[contains(@class, '_3LWZlK')]"
+}
+
+
+# Elements that break lines in the browser's innerText
+BLOCK_TAGS = {"div", "p", "li", "ul", "ol", "section", "article", "header", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "table"}
+
+# Precompiled once per process
+_COMPILED = {
+    xpath: etree.XPath(xpath)
+    for xpath in REVIEW_BLOCK_STRATEGIES + [x for xpaths in REVIEW_FIELD_XPATHS.values() for x in xpaths]
+}
+_MARKER_XPATHS = {name: etree.XPath(f"boolean({xpath})") for name, xpath in LAYOUT_MARKERS.items()}
+_DATE_XPATH = etree.XPath(REVIEW_DATE_XPATH)
+_INVISIBLE_XPATH = etree.XPath("//script | //style | //noscript | //template")
+
+
+def clean_text(text):
+    """Helper to remove newlines and extra spaces."""
+    if not text:
+        return ""
+    return " ".join(text.split())
+
+
+def parse_html(page_source):
+    """
+    Parses HTML into an lxml tree whose text_content() reads like innerText:
+    scripts/styles are dropped and block elements / <br> end with a newline.
+    """
+    tree = lxml_html.fromstring(page_source)
+    for el in _INVISIBLE_XPATH(tree):
+        el.drop_tree()
+    for el in tree.iter():
+        if el.tag in BLOCK_TAGS or el.tag == "br":
+            el.tail = "\n" + (el.tail or "")
+    return tree
+
+
+def layout_signature(tree):
+    """The page's layout signature (see LAYOUT_MARKERS)."""
+    return "+".join(name for name, compiled in _MARKER_XPATHS.items() if compiled(tree))
+
+
+def extract_raw_reviews(tree, skip=0, skip_strategy=None, ranking=None):
+    """
+    Runs the block strategy cascade on a parsed tree.
+    Returns (strategy_xpath, raw_reviews, block_count); strategy_xpath is None if nothing matched.
+
+    skip/skip_strategy: the first `skip` blocks of `skip_strategy` were processed
+    by an earlier call (infinite scroll) and are only counted, not extracted.
+    ranking: (strategies, fields) order to try the selectors in (SelectorCache.ranking),
+    default REVIEW_BLOCK_STRATEGIES / REVIEW_FIELD_XPATHS. Field alternatives after
+    the first one with text aren't evaluated (left None), except for FIELDS_READ_IN_FULL.
+    """
+    strategies, fields = ranking or (REVIEW_BLOCK_STRATEGIES, REVIEW_FIELD_XPATHS)
+    for xpath in strategies:
+        matched = _COMPILED[xpath](tree)
+        seen = skip if xpath == skip_strategy else 0
+        blocks = [b for b in matched[seen:] if len(b.text_content().strip()) > 20]
+        if not blocks and not (seen and len(matched) >= seen):
+            continue
+
+        raw_reviews = []
+        for block in blocks:
+            raw = {}
+            for field, alternatives in fields.items():
+                raw[field] = [None] * len(alternatives)
+                for i, field_xpath in enumerate(alternatives):
+                    found = _COMPILED[field_xpath](block)
+                    if found:
+                        raw[field][i] = found[0].text_content()
+                        if raw[field][i].strip() and field not in FIELDS_READ_IN_FULL:
+                            break
+            raw["dates"] = [dc.text_content() for dc in _DATE_XPATH(block)]
+            raw_reviews.append(raw)
+        return xpath, raw_reviews, len(matched)
+    return None, [], 0
+
+
+def build_review(raw):
+    """
+    Builds the output dict from raw field candidates.
+    Each field in REVIEW_FIELD_XPATHS maps to a list with the first matched
+    text per XPath, in the order they were tried (None when nothing matched or
+    the XPath wasn't needed); "dates" holds every date candidate.
+    """
+    data = {
+        "platform": "Flipkart",
+        "reviewer_name": None,
+        "rating": None,
+        "review": None,
+        "review_date": None
+    }
+
+    # 0. Reviewer Name (New: ZDi3w2, Old: _2V5EHH)
+    for txt in raw.get("name", []):
+        if txt and txt.strip():
+            data["reviewer_name"] = txt.strip()
+            break
+    if not data["reviewer_name"]:
+        data["reviewer_name"] = "Anonymous"
+
+    # 1. Rating (New: MKiFS6, Old: _3LWZlK)
+    data["rating"] = 0
+    for txt in raw.get("rating", []):
+        if txt is None:
+            continue
+        try:
+            data["rating"] = int(txt.strip())
+            break
+        except ValueError:
+            continue
+
+    # 2. Review Text & Title
+    full_text_parts = []
+    for txt in raw.get("title", []):
+        if txt is not None:
+            full_text_parts.append(txt.strip())
+            break
+    for txt in raw.get("body", []):
+        if txt is not None:
+            full_text_parts.append(txt.replace("READ MORE", "").strip())
+            break
+    data["review"] = clean_text(" - ".join(full_text_parts))
+
+    # 3. Date
+    # New layout: Name is <p class="zJ1ZGa ZDi3w2">Name</p>
+    # Date is <p class="zJ1ZGa">10 months ago</p> (Second occurrence in footer or distinct class)
+    # Usually the last one or the one with 'ago' or year is the date
+    date_candidates = [txt.strip() for txt in raw.get("dates", []) if txt is not None]
+    for txt in date_candidates:
+        # Simple heuristic: if it contains "ago" or "202" (year)
+        if "ago" in txt or "202" in txt or "201" in txt:
+            data["review_date"] = txt
+            break
+    if not data["review_date"] and date_candidates:
+        # Fallback: take the last one
+        data["review_date"] = date_candidates[-1]
+
+    return data
+
+
+def parse_reviews(page_source, selectors=None):
+    """
+    Parses a review page's HTML and returns the same review dicts as
+    FlipkartScraper.extract_page_data. Safe to call from worker processes.
+
+    selectors: a SelectorCache to try the learned selector order first (and
+    learn from this page); None runs the default cascade.
+    """
+    tree = parse_html(page_source)
+    if selectors is None:
+        _, raw_reviews, _ = extract_raw_reviews(tree)
+    else:
+        signature = layout_signature(tree)
+        ranking = selectors.ranking(signature)
+        strategy, raw_reviews, _ = extract_raw_reviews(tree, ranking=ranking)
+        selectors.learn(signature, strategy, raw_reviews, ranking)
+    reviews = []
+    for raw in raw_reviews:
+        data = build_review(raw)
+        if data["rating"] or data["review"]:
+            reviews.append(data)
+    return reviews
+
+
+def parse_file(path, encoding="utf-8"):
+    """Parses a saved HTML file (e.g. debug_last_failed.html)."""
+    with open(path, "r", encoding=encoding) as f:
+        return parse_reviews(f.read())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m scraper.parser <page.html> [...]")
+        sys.exit(1)
+    for path in sys.argv[1:]:
+        reviews = parse_file(path)
+        print(f"{path}: {len(reviews)} reviews")
+        for r in reviews:
+            print(json.dumps(r, ensure_ascii=False))
@@ -0,0 +1,138 @@
+"""
+Reading a job's CSV while it is still being written.
+
+The scraper only ever appends whole rows and records how far the file is
+complete (CsvSink.flushed_bytes, published as csv_readable_bytes in the job
+state), so readers stop at that byte and never see a half-written row.
+
+CsvRowIndex keeps a sparse row -> byte offset index (one entry every
+`every` rows), built incrementally as the file grows: fetching rows
+200000-200100 seeks close to row 200000 and parses a few hundred rows,
+instead of reading the file from the top, and memory stays at a few
+integers per thousand rows.
+"""
+import csv
+import os
+import threading
+
+
+class CsvRowIndex:
+    """Sparse index of data row offsets in a growing CSV (header excluded)."""
+    def __init__(self, path, every=1000):
+        self.path = path
+        self.every = every
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.fieldnames = None
+        # offsets[i] is the byte offset of data row i * every
+        self.offsets = []
+        self.rows = 0
+        # End of the last complete row indexed
+        self.scanned = 0
+
+    def refresh(self, limit):
+        """Indexes the complete rows in the first `limit` bytes. Returns the number of data rows."""
+        with self.lock:
+            if limit < self.scanned:
+                # File was cut back (resumed job) - start over
+                self._reset()
+            if limit <= self.scanned or not os.path.isfile(self.path):
+                return self.rows
+            with open(self.path, "rb") as f:
+                f.seek(self.scanned)
+                position, quotes = self.scanned, 0
+                while position < limit:
+                    line = f.readline(limit - position)
+                    if not line:
+                        break
+                    position += len(line)
+                    if not line.endswith(b"\n"):
+                        break
+                    # A newline inside a quoted field leaves an odd number of quotes ("" escapes count twice)
+                    quotes += line.count(b'"')
+                    if quotes % 2:
+                        continue
+                    if self.fieldnames is None:
+                        self.fieldnames = next(csv.reader([line.decode("utf-8")]))
+                        self.offsets.append(position)
+                    else:
+                        self.rows += 1
+                        if self.rows % self.every == 0:
+                            self.offsets.append(position)
+                    self.scanned = position
+                    quotes = 0
+            return self.rows
+
+    def read(self, offset, count, limit):
+        """Returns up to `count` rows (dicts) starting at data row `offset`, reading no further than `limit` bytes."""
+        total = self.refresh(limit)
+        if offset >= total or count <= 0:
+            return []
+        with self.lock:
+            start = self.offsets[offset // self.every]
+            skip = offset % self.every
+            end = self.scanned
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            rows = []
+            for i, row in enumerate(csv.reader(_iter_lines(f, start, end))):
+                if i < skip:
+                    continue
+                rows.append(dict(zip(self.fieldnames, row)))
+                if len(rows) >= count or offset + len(rows) >= total:
+                    break
+        return rows
+
+    def offset_of(self, row, limit):
+        """Byte offset where data row `row` starts (or the end of the complete rows when past them)."""
+        total = self.refresh(limit)
+        if row >= total:
+            return self.scanned
+        with self.lock:
+            start = self.offsets[row // self.every]
+            skip = row % self.every
+        if not skip:
+            return start
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            position, quotes = start, 0
+            while skip:
+                line = f.readline()
+                position += len(line)
+                quotes += line.count(b'"')
+                if not quotes % 2:
+                    skip -= 1
+                    quotes = 0
+        return position
+
+    def header_bytes(self):
+        """The CSV header line as written."""
+        with self.lock:
+            end = self.offsets[0] if self.offsets else 0
+        with open(self.path, "rb") as f:
+            return f.read(end)
+
+
+def _iter_lines(f, position, end):
+    # Lines are split on b"\n", which never occurs inside a UTF-8 multi-byte character
+    while position < end:
+        line = f.readline(end - position)
+        if not line:
+            return
+        position += len(line)
+        yield line.decode("utf-8")
+
+
+def iter_file_range(path, start, end, chunk_size=64 * 1024):
+    """Yields the bytes of path[start:end] in chunks."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,186 @@
+"""
+Learned selector order per page layout.
+
+extract_page_data tries the REVIEW_BLOCK_STRATEGIES in order, reading the
+text of every block a strategy matches, and per review field each
+alternative in REVIEW_FIELD_XPATHS. On a given layout the same selectors
+miss page after page, so trying them first is wasted work.
+
+SelectorCache keeps, per layout signature (parser.layout_signature), the
+selectors that missed before the winner. They move to the back of the
+cascade and everything else keeps the default order, so the selector that
+wins is the one the default order picks whenever the skipped ones still
+miss, and a page where they don't just costs the full cascade. On a page
+won by a catch-all strategy (parser.CATCH_ALL_STRATEGIES) the strategies
+for the page's own layout may well match the next page, so only the ones
+that can't match its layout at all (parser.STRATEGY_LAYOUTS) are learned;
+missed field alternatives are learned whichever strategy won.
+Changes are written to a JSON file (SELECTOR_CACHE_PATH, default
+output/selector_cache.json) so new sessions start with the learned order.
+Set SELECTOR_CACHE_PATH to an empty string to keep it in memory only.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from .parser import CATCH_ALL_STRATEGIES, REVIEW_BLOCK_STRATEGIES, REVIEW_FIELD_XPATHS, STRATEGY_LAYOUTS
+
+SELECTOR_CACHE_PATH = os.environ.get('SELECTOR_CACHE_PATH', os.path.join("output", "selector_cache.json"))
+
+# Shared by every scraper in the process (default_cache)
+_default = None
+_default_lock = threading.Lock()
+
+
+def _ranked(missed, defaults):
+    """`defaults` in their order, the ones that missed moved to the back."""
+    return [xpath for xpath in defaults if xpath not in missed] + [xpath for xpath in defaults if xpath in missed]
+
+
+def _has_text(text):
+    return bool(text and text.strip())
+
+
+class SelectorCache:
+    """
+    Selector order per layout signature (thread-safe).
+
+    path: JSON file to load the learned order from and save changes to
+    (None keeps it in memory, e.g. for benchmarks)
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.layouts = {}  # signature -> {"missed_strategies": [...], "missed_fields": {field: [...]}, "updated_at": ...}
+        if path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                layouts = json.load(f)["layouts"]
+            for signature, entry in layouts.items():
+                if "missed_strategies" not in entry:
+                    # Older format (winners moved to the front) - relearned from the next page
+                    continue
+                # Selectors that were changed in the code since are dropped
+                self.layouts[signature] = {
+                    "missed_strategies": [x for x in REVIEW_BLOCK_STRATEGIES if x in entry["missed_strategies"]],
+                    "missed_fields": {
+                        field: [x for x in xpaths if x in entry.get("missed_fields", {}).get(field, [])]
+                        for field, xpaths in REVIEW_FIELD_XPATHS.items()
+                    },
+                    "updated_at": entry.get("updated_at")
+                }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Ignoring unreadable selector cache {self.path}: {e}")
+            self.layouts = {}
+
+    def _ranking(self, entry):
+        # Called with the lock held
+        if entry is None:
+            return list(REVIEW_BLOCK_STRATEGIES), {field: list(xpaths) for field, xpaths in REVIEW_FIELD_XPATHS.items()}
+        return _ranked(entry["missed_strategies"], REVIEW_BLOCK_STRATEGIES), {
+            field: _ranked(entry["missed_fields"].get(field, []), xpaths) for field, xpaths in REVIEW_FIELD_XPATHS.items()
+        }
+
+    def ranking(self, signature):
+        """(strategies, fields) in the order to try them on a page with this signature."""
+        with self.lock:
+            return self._ranking(self.layouts.get(signature))
+
+    def rankings(self):
+        """Every learned order, {signature: {"strategies": [...], "fields": {...}}} (for BULK_EXTRACT_JS)."""
+        with self.lock:
+            rankings = {}
+            for signature, entry in self.layouts.items():
+                strategies, fields = self._ranking(entry)
+                rankings[signature] = {"strategies": strategies, "fields": fields}
+            return rankings
+
+    def learn(self, signature, strategy, raw_reviews, ranking):
+        """
+        Records the outcome of extracting a page with `ranking`: `strategy` is the
+        block strategy that matched (None if none did) and each raw review's field
+        candidates are aligned with ranking's field order (see parser.build_review).
+        The selectors tried before the winners missed; the cache is saved when
+        the set of missed selectors changed.
+        """
+        if not strategy:
+            return
+        strategies, fields = ranking
+        missed_strategies = set(strategies[:strategies.index(strategy)]) if strategy in strategies else set()
+        if strategy in CATCH_ALL_STRATEGIES:
+            # This page's own layout strategies may match its next page - keep only the other layouts'
+            layouts = set(signature.split("+")) if signature else set()
+            missed_strategies = {
+                x for x in missed_strategies
+                if STRATEGY_LAYOUTS.get(x) is not None and not layouts & set(STRATEGY_LAYOUTS[x])
+            }
+        missed_fields = {}
+        won_fields = {}
+        for field, xpaths in fields.items():
+            # Per review, the position of the alternative that produced the text
+            wins = [
+                next(i for i, text in enumerate(raw[field]) if _has_text(text))
+                for raw in raw_reviews
+                if any(_has_text(text) for text in raw.get(field, []))
+            ]
+            if wins:
+                # Alternatives before the earliest winner missed on every review
+                missed_fields[field] = set(xpaths[:min(wins)])
+                won_fields[field] = {xpaths[i] for i in wins}
+
+        with self.lock:
+            entry = self.layouts.get(signature) or {
+                "missed_strategies": [],
+                "missed_fields": {field: [] for field in REVIEW_FIELD_XPATHS},
+                "updated_at": None
+            }
+            # A selector that missed before but won now is back in the default order
+            updated_strategies = [
+                x for x in REVIEW_BLOCK_STRATEGIES
+                if x != strategy and (x in missed_strategies or x in entry["missed_strategies"])
+            ]
+            updated_fields = {
+                field: [
+                    x for x in xpaths
+                    if x not in won_fields.get(field, ())
+                    and (x in missed_fields.get(field, ()) or x in entry["missed_fields"].get(field, []))
+                ]
+                for field, xpaths in REVIEW_FIELD_XPATHS.items()
+            }
+            if updated_strategies == entry["missed_strategies"] and updated_fields == entry["missed_fields"]:
+                # Nothing new (the usual case once learned)
+                return
+            self.layouts[signature] = {
+                "missed_strategies": updated_strategies,
+                "missed_fields": updated_fields,
+                "updated_at": datetime.now().isoformat(timespec="seconds")
+            }
+            print(f"   Learned selector order for layout '{signature or 'unknown'}': {strategy}")
+            self._save()
+
+    def _save(self):
+        # Called with the lock held; same temp file + os.replace as checkpoints
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"layouts": self.layouts}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Couldn't save selector cache {self.path}: {e}")
+
+
+def default_cache():
+    """The process-wide SelectorCache backed by SELECTOR_CACHE_PATH."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SelectorCache(SELECTOR_CACHE_PATH or None)
+        return _default
@@ -0,0 +1,133 @@
+"""
+Page-range sharding for paginated products.
+
+The total page count is read from the pagination bar, and pages 2..N are
+striped across several browsers (shard k loads pages k, k + shards, ...)
+that open each page directly by URL. Results are merged back into page
+order before they reach the caller, so the CSV looks the same as with a
+single sequential scraper.
+"""
+import threading
+from .flipkart import FlipkartScraper
+from .metrics import bind
+
+
+def split_page_range(first_page, last_page, shards):
+    """
+    Stripes first_page..last_page over `shards` lists of page numbers.
+    Striping (rather than contiguous blocks) keeps the shards close together,
+    so the in-order merge only has to buffer a few pages.
+    """
+    shards = max(1, shards)
+    return [list(range(first_page + k, last_page + 1, shards)) for k in range(shards)]
+
+
+class _OrderedResults:
+    """Collects (page, reviews) from shard threads and releases them in page order."""
+    def __init__(self, first_page, max_ahead):
+        self.next_page = first_page
+        self.max_ahead = max_ahead
+        self.results = {}
+        self.end_page = None  # first page known to be empty / failed
+        self.cond = threading.Condition()
+
+    def put(self, page, reviews):
+        """Stores a page; blocks while the shard is too far ahead of the merge. Returns False to stop."""
+        with self.cond:
+            while page >= self.next_page + self.max_ahead and not self._past_end(page):
+                self.cond.wait()
+            if self._past_end(page):
+                return False
+            if not reviews:
+                self.end_page = page if self.end_page is None else min(self.end_page, page)
+            else:
+                self.results[page] = reviews
+            self.cond.notify_all()
+            return bool(reviews)
+
+    def finish_shard(self):
+        with self.cond:
+            self.cond.notify_all()
+
+    def _past_end(self, page):
+        return self.end_page is not None and page >= self.end_page
+
+    def take(self, last_page, shards_alive):
+        """Returns the next page's reviews (waiting if needed), or None when done."""
+        with self.cond:
+            while True:
+                if self.next_page > last_page or self._past_end(self.next_page):
+                    return None
+                if self.next_page in self.results:
+                    page = self.next_page
+                    self.next_page += 1
+                    self.cond.notify_all()
+                    return page, self.results.pop(page)
+                if not shards_alive():
+                    return None
+                self.cond.wait(timeout=1)
+
+
+def iter_review_pages_sharded(scraper, driver_pool, last_page, shards, scraper_kwargs=None, start_page=1):
+    """
+    Drop-in alternative to scraper.iter_review_pages() for paginated products.
+    Page 1 comes from `scraper` (already on the reviews page); pages 2..last_page
+    are striped over `shards` browsers: `scraper` itself plus shards - 1 drivers
+    leased from `driver_pool`. Yields (page_number, reviews) in page order.
+    start_page > 1 (resuming) shards start_page..last_page instead.
+    """
+    reviews_url = scraper.driver.current_url
+    first_page = max(2, start_page)
+    if start_page <= 1:
+        yield 1, scraper.extract_page_data()
+    if last_page < first_page:
+        return
+
+    scraper_kwargs = scraper_kwargs or {}
+    page_lists = split_page_range(first_page, last_page, shards)
+    merged = _OrderedResults(first_page, max_ahead=shards * 2)
+    threads = []
+
+    def run_shard(shard_index, pages):
+        leased = None
+        current_page = pages[0]
+        try:
+            if shard_index == 0:
+                shard_scraper = scraper
+            else:
+                leased = driver_pool.acquire()
+                shard_scraper = FlipkartScraper(driver=leased, **scraper_kwargs)
+            for current_page in pages:
+                shard_scraper.open_review_page(reviews_url, current_page)
+                if not merged.put(current_page, shard_scraper.extract_page_data()):
+                    break
+        except Exception as e:
+            print(f"   [Shard {shard_index}] Stopped at page {current_page}: {e}")
+            # A page this shard can't deliver ends the ordered stream there
+            merged.put(current_page, [])
+        finally:
+            if leased is not None:
+                driver_pool.release(leased)
+            merged.finish_shard()
+
+    for shard_index, pages in enumerate(page_lists):
+        if not pages:
+            continue
+        thread = threading.Thread(target=bind(run_shard), args=(shard_index, pages), daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    print(f"   🧩 Sharding pages {first_page}-{last_page} across {len(threads)} browser(s)")
+    try:
+        while True:
+            item = merged.take(last_page, lambda: any(t.is_alive() for t in threads))
+            if item is None:
+                return
+            yield item
+    finally:
+        # Tell shards to stop at the next page and wait for them to return their drivers
+        with merged.cond:
+            merged.end_page = merged.next_page if merged.end_page is None else min(merged.end_page, merged.next_page)
+            merged.cond.notify_all()
+        for thread in threads:
+            thread.join()
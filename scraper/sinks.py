@@ -0,0 +1,281 @@
+"""
+Output sinks for scraped reviews.
+
+Every output format implements the same small interface - write(reviews)
+with a page batch of review dicts, close() at the end - so a scrape job can
+fan each batch out to CSV, styled Excel and columnar Parquet alike.
+"""
+import csv
+import os
+import time
+from datetime import date
+
+# Columns written for every review
+REVIEW_FIELDS = ['platform', 'reviewer_name', 'rating', 'review', 'review_date', 'relative_date', 'product_url']
+
+
+class ReviewSink:
+    """Base class: receives batches of review dicts."""
+    path = None
+
+    def write(self, reviews):
+        raise NotImplementedError
+
+    def checkpoint(self):
+        """Makes everything written so far durable. No-op by default."""
+
+    def close(self):
+        """Finishes the output. Returns the list of files written."""
+        return [self.path] if self.path else []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(ReviewSink):
+    """
+    Appends reviews to a CSV file through one long-lived, buffered handle.
+
+    The file is opened on the first batch (header written if it is new) and
+    kept open for the whole job. Buffered rows reach the OS every
+    `flush_interval` seconds or `flush_rows` rows, checkpoint() also fsyncs
+    them to disk, and close() does both.
+    """
+    def __init__(self, path, fieldnames=REVIEW_FIELDS, buffer_size=1024 * 1024, flush_rows=5000, flush_interval=5.0):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.buffer_size = buffer_size
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._file = None
+        self._writer = None
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        # File size as of the last checkpoint(): everything before it is on disk
+        self.committed_bytes = os.path.getsize(path) if os.path.isfile(path) else 0
+        # File size as of the last flush(): everything before it is whole rows other readers can see
+        self.flushed_bytes = self.committed_bytes
+
+    def _open(self):
+        self._file = open(self.path, mode='a', newline='', encoding='utf-8', buffering=self.buffer_size)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction='ignore')
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def write(self, reviews):
+        if not reviews:
+            return
+        if self._file is None:
+            self._open()
+        self._writer.writerows(reviews)
+        self._pending_rows += len(reviews)
+        if (self._pending_rows >= self.flush_rows
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Hands buffered rows to the OS so readers of the file can see them."""
+        if self._file is None:
+            return
+        self._file.flush()
+        self.flushed_bytes = os.fstat(self._file.fileno()).st_size
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+    def checkpoint(self):
+        """Flushes and fsyncs, so everything written so far survives a crash."""
+        if self._file is None:
+            return
+        self.flush()
+        os.fsync(self._file.fileno())
+        self.committed_bytes = os.fstat(self._file.fileno()).st_size
+
+    def close(self):
+        if self._file is not None:
+            self.checkpoint()
+            self._file.close()
+            self._file = None
+            self._writer = None
+        return [self.path] if os.path.isfile(self.path) else []
+
+
+class ExcelSink(ReviewSink):
+    """
+    Streams reviews into styled .xlsx output (see export.StyledExcelWriter).
+    Nothing is created on disk until the first review arrives.
+    """
+    def __init__(self, path, fieldnames=REVIEW_FIELDS, split_by=None, layout="files"):
+        from .export import StyledExcelWriter
+
+        self.path = path
+        self.writer = StyledExcelWriter(path, fieldnames, split_by=split_by, layout=layout)
+        self.rows_written = 0
+        self.files = []
+
+    def write(self, reviews):
+        self.writer.write_rows(reviews)
+        self.rows_written += len(reviews)
+
+    def close(self):
+        if self.rows_written and not self.files:
+            self.files = self.writer.close()
+        return list(self.files)
+
+
+class ParquetSink(ReviewSink):
+    """
+    Buffers reviews into Arrow record batches and writes one Parquet row group
+    every `row_group_size` rows, with typed columns: int8 rating, date32
+    review_date and dictionary-encoded platform/product_url.
+    Needs pyarrow (pip install pyarrow).
+    """
+    def __init__(self, path, row_group_size=50000, compression="zstd"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+
+        self.pa = pa
+        self.path = path
+        self.row_group_size = max(1, int(row_group_size))
+        self.schema = pa.schema([
+            ('platform', pa.dictionary(pa.int32(), pa.string())),
+            ('reviewer_name', pa.string()),
+            ('rating', pa.int8()),
+            ('review', pa.string()),
+            ('review_date', pa.date32()),
+            ('relative_date', pa.string()),
+            ('product_url', pa.dictionary(pa.int32(), pa.string()))
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    @staticmethod
+    def _to_rating(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _to_date(value):
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+    def write(self, reviews):
+        columns = self._columns
+        for r in reviews:
+            columns['platform'].append(r.get('platform'))
+            columns['reviewer_name'].append(r.get('reviewer_name'))
+            columns['rating'].append(self._to_rating(r.get('rating')))
+            columns['review'].append(r.get('review'))
+            columns['review_date'].append(self._to_date(r.get('review_date')))
+            columns['relative_date'].append(r.get('relative_date'))
+            columns['product_url'].append(r.get('product_url'))
+        self._buffered += len(reviews)
+        if self._buffered >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered rows as one row group."""
+        if not self._buffered:
+            return
+        batch = self.pa.RecordBatch.from_arrays(
+            [self.pa.array(self._columns[field.name], type=field.type) for field in self.schema],
+            schema=self.schema
+        )
+        self.writer.write_batch(batch, row_group_size=self._buffered)
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        return [self.path]
+
+
+class MultiSink(ReviewSink):
+    """Fans every batch out to several sinks."""
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    def write(self, reviews):
+        for sink in self.sinks:
+            sink.write(reviews)
+
+    def checkpoint(self):
+        for sink in self.sinks:
+            sink.checkpoint()
+
+    def close(self):
+        files = []
+        for sink in self.sinks:
+            files.extend(sink.close())
+        return files
+
+    def get(self, sink_class):
+        """Returns the first sink of the given class, or None."""
+        return next((s for s in self.sinks if isinstance(s, sink_class)), None)
+
+
+SINK_TYPES = {
+    "csv": CsvSink,
+    "xlsx": ExcelSink,
+    "parquet": ParquetSink
+}
+
+
+def open_sinks(formats, base_path, fieldnames=REVIEW_FIELDS, excel_options=None, parquet_options=None):
+    """
+    Opens one sink per format ("csv", "xlsx", "parquet") at base_path + extension
+    and returns them as a MultiSink.
+    """
+    sinks = []
+    for fmt in formats:
+        if fmt not in SINK_TYPES:
+            raise ValueError(f"Unknown output format: {fmt}")
+        path = f"{base_path}.{fmt}"
+        if fmt == "csv":
+            sinks.append(CsvSink(path, fieldnames))
+        elif fmt == "xlsx":
+            sinks.append(ExcelSink(path, fieldnames, **(excel_options or {})))
+        else:
+            sinks.append(ParquetSink(path, **(parquet_options or {})))
+    return MultiSink(sinks)
+
+
+def truncate_csv(path, size):
+    """
+    Cuts a CSV back to `size` bytes (a CsvSink.committed_bytes value), dropping
+    rows written after the last checkpoint before a job resumes.
+    """
+    if os.path.isfile(path) and os.path.getsize(path) > size:
+        os.truncate(path, size)
+
+
+def replay_csv(path, sink, batch_size=5000):
+    """Feeds every row of an existing CSV into `sink` (e.g. to rebuild Excel on resume)."""
+    if not os.path.isfile(path):
+        return 0
+    count = 0
+    with open(path, newline='', encoding='utf-8') as f:
+        batch = []
+        for row in csv.DictReader(f):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                sink.write(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            sink.write(batch)
+            count += len(batch)
+    return count
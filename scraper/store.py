@@ -0,0 +1,212 @@
+"""
+Cross-run review store (SQLite).
+
+Every review scraped with the store enabled is kept in one database, keyed
+by (product key, review hash), so repeated runs over the same product only
+add what's new. Incremental jobs read newest first and stop once pages
+bring nothing new; their Excel/Parquet/CSV exports are then
+generated from the store, covering every review collected so far.
+
+The review hash here leaves the date out: Flipkart shows relative dates
+("5 days ago"), which give a different absolute date on every run. Generic
+reviews ("Flipkart Customer", 5, "Wonderful") are common, so identical
+copies on one page are kept apart by their occurrence on the page, and an
+incremental product only stops after STORED_PAGES_TO_STOP pages in a row
+brought nothing new.
+
+Known limitation: copies are numbered per page, not per product. When page
+boundaries shift between runs, a copy can be counted again or matched to a
+different stored one (see the README). Numbering them across pages would
+need a per-content counter in every job checkpoint.
+"""
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+from .dedup import review_hash
+from .sinks import REVIEW_FIELDS
+
+STORE_PATH = os.environ.get('REVIEW_STORE_PATH', os.path.join("output", "reviews.db"))
+
+# Fields that identify a review across runs
+STORE_HASH_FIELDS = ("reviewer_name", "rating", "review")
+
+# Incremental jobs stop a product after this many pages in a row with nothing new
+STORED_PAGES_TO_STOP = 2
+
+# PRAGMA user_version of the current review_hash scheme
+_SCHEMA_VERSION = 1
+
+_ITEM_ID = re.compile(r"/(?:p|product-reviews)/(itm\w+)")
+
+
+def product_key(url):
+    """
+    Stable id for a product: its pid query parameter, else the itm... id in
+    the path, else the URL without query. Product and review page URLs of the
+    same product map to the same key.
+    """
+    parts = urlsplit(url)
+    pid = parse_qs(parts.query).get("pid")
+    if pid:
+        return pid[0]
+    match = _ITEM_ID.search(parts.path)
+    if match:
+        return match.group(1)
+    return f"{parts.netloc}{parts.path}"
+
+
+def _signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def store_hash(review, occurrence=0):
+    """Store key of a review; occurrence > 0 for further identical copies on the same page."""
+    if not occurrence:
+        return _signed(review_hash(review, STORE_HASH_FIELDS))
+    return _signed(review_hash({**review, "occurrence": occurrence}, STORE_HASH_FIELDS + ("occurrence",)))
+
+
+class ReviewStore:
+    """
+    Thread-safe SQLite review store. One connection, serialized by a lock;
+    WAL mode so exports and status readers don't block the writers.
+    """
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                product_key TEXT NOT NULL,
+                review_hash INTEGER NOT NULL,
+                platform TEXT,
+                reviewer_name TEXT,
+                rating INTEGER,
+                review TEXT,
+                review_date TEXT,
+                relative_date TEXT,
+                product_url TEXT,
+                job_id TEXT,
+                first_seen TEXT NOT NULL,
+                UNIQUE (product_key, review_hash)
+            );
+            CREATE INDEX IF NOT EXISTS reviews_by_date ON reviews (product_key, review_date);
+        """)
+        self.conn.commit()
+        self._migrate()
+
+    def _migrate(self):
+        # Version 0 hashed name + text only: rehash with the rating (old rows are unique per name + text)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+        rows = self.conn.execute("SELECT rowid, reviewer_name, rating, review FROM reviews").fetchall()
+        self.conn.executemany(
+            "UPDATE reviews SET review_hash = ? WHERE rowid = ?",
+            [(store_hash({"reviewer_name": name, "rating": rating, "review": review}), rowid)
+             for rowid, name, rating, review in rows]
+        )
+        self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def add_reviews(self, key, reviews, job_id=None):
+        """
+        Stores a page of reviews for product `key`. Returns the reviews that
+        earlier jobs hadn't stored, i.e. what this run should output. Reviews
+        this same job stored before (re-scraped after a resume) are returned
+        again but not inserted twice.
+        """
+        if not reviews:
+            return []
+        hashed = {}
+        copies = Counter()
+        for r in reviews:
+            first = store_hash(r)
+            hashed[store_hash(r, copies[first])] = r
+            copies[first] += 1
+
+        with self.lock:
+            known = {}
+            hashes = list(hashed)
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT review_hash, job_id FROM reviews WHERE product_key = ? AND review_hash IN ({','.join('?' * len(chunk))})",
+                    [key, *chunk]
+                )
+                known.update(rows)
+
+            now = datetime.now().isoformat(timespec="seconds")
+            self.conn.executemany(
+                "INSERT INTO reviews (product_key, review_hash, platform, reviewer_name, rating, review, review_date, "
+                "relative_date, product_url, job_id, first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (key, h, r.get('platform'), r.get('reviewer_name'), r.get('rating'), r.get('review'),
+                     r.get('review_date'), r.get('relative_date'), r.get('product_url'), job_id, now)
+                    for h, r in hashed.items() if h not in known
+                ]
+            )
+            self.conn.commit()
+
+        return [r for h, r in hashed.items() if h not in known or (job_id is not None and known[h] == job_id)]
+
+    def count(self, keys=None):
+        """Number of stored reviews (for the given product keys, or all)."""
+        sql, args = "SELECT COUNT(*) FROM reviews", []
+        if keys:
+            sql += f" WHERE product_key IN ({','.join('?' * len(keys))})"
+            args = list(keys)
+        with self.lock:
+            return self.conn.execute(sql, args).fetchone()[0]
+
+    def iter_reviews(self, keys=None, from_date=None, to_date=None, batch_size=5000):
+        """
+        Yields stored reviews as lists of dicts (REVIEW_FIELDS), oldest insert
+        first, optionally limited to product keys and a YYYY-MM-DD date range.
+        """
+        where, args = [], []
+        if keys:
+            where.append(f"product_key IN ({','.join('?' * len(keys))})")
+            args.extend(keys)
+        if from_date:
+            where.append("review_date >= ?")
+            args.append(from_date)
+        if to_date:
+            where.append("review_date <= ?")
+            args.append(to_date)
+        sql = f"SELECT {', '.join(REVIEW_FIELDS)} FROM reviews"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+
+        # Own read connection: WAL lets it run alongside the writers
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(sql, args)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [dict(zip(REVIEW_FIELDS, row)) for row in rows]
+        finally:
+            conn.close()
+
+    def export(self, sink, keys=None, from_date=None, to_date=None):
+        """Writes stored reviews into a sink (see scraper.sinks). Returns the row count."""
+        count = 0
+        for batch in self.iter_reviews(keys, from_date, to_date):
+            sink.write(batch)
+            count += len(batch)
+        return count
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
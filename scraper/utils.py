@@ -1,15 +1,127 @@
 import time
 import random
 import os
+import json
+import queue
+import re
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException, SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from .metrics import instrument_driver, phase
+
+# Where the resolved chromedriver path is remembered between runs
+DRIVER_CACHE_FILE = os.environ.get(
+    'CHROMEDRIVER_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'flipkart-scraper', 'chromedriver.json')
+)
+
+# Resolved once per process
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def get_chrome_version():
+    """
+    Returns the installed Chrome version string (e.g. "120.0.6099.109"), or None if unknown.
+    """
+    if sys.platform.startswith('win'):
+        commands = [['reg', 'query', r'HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon', '/v', 'version']]
+    elif sys.platform == 'darwin':
+        commands = [['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome', '--version']]
+    else:
+        commands = [[name, '--version'] for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')]
+
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'(\d+\.\d+\.\d+\.\d+)', output)
+        if match:
+            return match.group(1)
+    return None
 
-def get_driver():
+def get_driver_path():
+    """
+    Returns the chromedriver binary path.
+    ChromeDriverManager().install() is only called on a cache miss: the result is
+    kept in memory for the process and on disk (DRIVER_CACHE_FILE) together with
+    the Chrome version it was resolved for, and reused while the major version matches.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path:
+            return _driver_path
+
+        chrome_version = get_chrome_version()
+        chrome_major = chrome_version.split('.')[0] if chrome_version else None
+
+        try:
+            with open(DRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+
+        cached_path = cached.get('path')
+        cached_major = (cached.get('chrome_version') or '').split('.')[0] or None
+        if cached_path and os.path.isfile(cached_path) and (chrome_major is None or cached_major == chrome_major):
+            _driver_path = cached_path
+            return _driver_path
+
+        # Cache miss - resolve (may hit the network)
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+
+        try:
+            os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+            with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({"path": _driver_path, "chrome_version": chrome_version}, f)
+        except OSError as e:
+            print(f"   [Driver cache] Could not save {DRIVER_CACHE_FILE}: {e}")
+
+        return _driver_path
+
+def invalidate_driver_path():
+    """Forgets the cached chromedriver path (memory and disk)."""
+    global _driver_path
+    with _driver_path_lock:
+        _driver_path = None
+        try:
+            os.remove(DRIVER_CACHE_FILE)
+        except OSError:
+            pass
+
+# Requests blocked by the lean profile: images, media and fonts.
+# Flipkart's own scripts/styles (static-assets-web.flixcart.com) are left alone so the page still renders reviews.
+LEAN_BLOCKED_URL_PATTERNS = [
+    # Images (product photos come from the rukminim*.flixcart.com image CDN, often without an extension)
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*rukminim1.flixcart.com*", "*rukminim2.flixcart.com*",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Media
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3"
+]
+
+# The only hosts the lean profile resolves: every third-party domain (analytics, ads, ...)
+# fails DNS instead. IP addresses aren't resolved, so local test servers still work.
+LEAN_ALLOWED_HOSTS = ["flipkart.com", "*.flipkart.com", "flixcart.com", "*.flixcart.com", "localhost"]
+
+def get_driver(lean=False):
     """
     Initializes and returns a Selenium Chrome driver.
     Detects if running on Render and configures headless mode accordingly.
+
+    lean: block images, media, fonts (LEAN_BLOCKED_URL_PATTERNS) and every host
+    outside LEAN_ALLOWED_HOSTS, and use the "eager" page-load strategy. Review extraction only needs the DOM, so this
+    saves bandwidth and speeds up page loads and scrolling.
     """
     options = Options()
     
@@ -32,67 +144,285 @@ def get_driver():
     else:
         print("💻 Running Locally - Chrome UI Visible")
 
+    if lean:
+        print("🪶 Lean profile - blocking images, media, fonts and third-party domains")
+        # Return from driver.get() at DOMContentLoaded instead of waiting for every subresource
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        # Network.setBlockedURLs has no allow list, so other hosts are blocked at DNS
+        exclusions = "".join(f", EXCLUDE {host}" for host in LEAN_ALLOWED_HOSTS)
+        options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND{exclusions}")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2
+        })
+
     # Initialize the driver
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    service = Service(get_driver_path())
+    try:
+        driver = webdriver.Chrome(service=service, options=options)
+    except SessionNotCreatedException:
+        # Cached chromedriver no longer matches Chrome - resolve again once
+        print("   [Driver cache] Cached chromedriver rejected by Chrome - re-resolving")
+        invalidate_driver_path()
+        service = Service(get_driver_path())
+        driver = webdriver.Chrome(service=service, options=options)
+
+    if lean:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+        except WebDriverException as e:
+            print(f"   [Lean profile] Could not set blocked URLs: {e}")
     
-    return driver
+    # WebDriver commands are timed into the Metrics of whichever job uses the driver
+    return instrument_driver(driver)
 
-def random_sleep(min_seconds=2, max_seconds=5):
+class DriverPool:
     """
-    Sleeps for a random amount of time between min_seconds and max_seconds.
-    This mimics human behavior (we don't click instantly).
+    Keeps up to `size` warm Chrome drivers that scrape jobs lease per product,
+    instead of starting a fresh browser for every URL.
+
+    Drivers are reset (storage/cookies cleared, about:blank) when returned and
+    health-checked when leased; a crashed or unresponsive driver is quit and
+    replaced by a new one.
     """
-    sleep_time = random.uniform(min_seconds, max_seconds)
-    print(f"   [Sleeping for {sleep_time:.2f} seconds...]")
-    time.sleep(sleep_time)
+    def __init__(self, size=1, lean=False):
+        self.size = max(1, int(size))
+        self.lean = lean
+        self._idle = queue.LifoQueue()  # LIFO: reuse the most recently used (warmest) driver
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
 
-from datetime import datetime, timedelta
-import re
+    def acquire(self, timeout=None):
+        """Leases a healthy driver, starting a new one if the pool isn't full yet."""
+        while True:
+            if self._closed:
+                raise RuntimeError("DriverPool is closed")
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return get_driver(lean=self.lean)
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                driver = self._idle.get(timeout=timeout)
+
+            if self._is_healthy(driver):
+                return driver
+            print("   [DriverPool] Driver failed health check - recycling")
+            self._discard(driver)
+
+    def release(self, driver, healthy=True):
+        """Returns a leased driver, resetting it for the next product."""
+        if self._closed or not healthy:
+            self._discard(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            # A dead chromedriver surfaces as urllib3/connection errors, not just WebDriverException
+            print(f"   [DriverPool] Reset failed ({e.__class__.__name__}) - recycling driver")
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Context manager around acquire()/release()."""
+        driver = self.acquire(timeout=timeout)
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self.release(driver, healthy=healthy)
+
+    def close(self):
+        """Quits every idle driver. Leased drivers are quit when released."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1 and len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        # Close any extra tabs, then wipe the site state the next product shouldn't inherit
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def _discard(self, driver):
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+def polite_sleep(started_at, min_seconds=1, max_seconds=2):
+    """
+    Politeness floor for adaptive waits: makes sure at least a random
+    min_seconds..max_seconds have passed since `started_at` (time.monotonic()),
+    sleeping only for whatever part of that the readiness wait didn't already use.
+    """
+    target = random.uniform(min_seconds, max_seconds)
+    remaining = target - (time.monotonic() - started_at)
+    if remaining > 0:
+        print(f"   [Polite delay {remaining:.2f} seconds...]")
+        with phase("polite_sleep"):
+            time.sleep(remaining)
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls to at most `rate` per second.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0
+        self._lock = threading.Lock()
+        self._next_time = time.monotonic()
 
-def parse_review_date(date_str):
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time)
+            self._next_time = scheduled + self.interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+def set_url_param(url, name, value):
+    """Returns `url` with query parameter `name` set to `value`."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != name]
+    query.append((name, str(value)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def review_page_url(url, page):
+    """Returns `url` with its `page` query parameter set to `page`."""
+    return set_url_param(url, 'page', page)
+
+class OldPageStop:
+    """
+    Early-stop rule for reviews sorted newest first: once `limit` pages in a
+    row hold only reviews older than `from_date`, everything after them is
+    older too. update() takes a page's parsed review dates and returns True
+    when the product should stop. Pages without dates don't count either way.
+    """
+    def __init__(self, from_date, limit):
+        self.from_date = from_date
+        self.limit = limit
+        self.old_pages = 0
+
+    def update(self, dates):
+        if not self.limit or not dates:
+            return False
+        if all(d < self.from_date for d in dates):
+            self.old_pages += 1
+        else:
+            self.old_pages = 0
+        return self.old_pages >= self.limit
+
+# "5 days ago", "a month ago", "3 hrs ago", ...
+_RELATIVE_DATE = re.compile(r'\b(\d+|an?|one)\s+(year|month|week|day|hour|hr|minute|min)s?\s+ago\b')
+_RELATIVE_UNITS = {
+    'year': timedelta(days=365), # Approx
+    'month': timedelta(days=30), # Approx
+    'week': timedelta(weeks=1),
+    'day': timedelta(days=1),
+    'hour': timedelta(hours=1),
+    'hr': timedelta(hours=1),
+    'minute': timedelta(minutes=1),
+    'min': timedelta(minutes=1)
+}
+# Absolute dates: "Oct, 2023", "October, 2023", "20 Jan 2024", ...
+_ABSOLUTE_DATE_FORMATS = ("%b, %Y", "%B, %Y", "%d %b %Y", "%d %B %Y", "%d %b, %Y", "%b %Y")
+
+@lru_cache(maxsize=4096)
+def _parse_review_date(text, reference):
+    """parse_review_date for a stripped, lowercased string - memoized per (text, reference)."""
+    if 'today' in text or 'just now' in text:
+        return reference
+    if 'yesterday' in text:
+        return reference - timedelta(days=1)
+
+    match = _RELATIVE_DATE.search(text)
+    if match:
+        amount, unit = match.groups()
+        count = int(amount) if amount.isdigit() else 1
+        return reference - count * _RELATIVE_UNITS[unit]
+
+    for fmt in _ABSOLUTE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+def _reference_time():
+    # Minute resolution keeps the memo keys stable within a run
+    return datetime.now().replace(second=0, microsecond=0)
+
+def parse_review_date(date_str, reference=None):
     """
     Parses Flipkart review dates like:
-    - "5 days ago"
-    - "1 month ago"
+    - "5 days ago", "1 month ago", "2 years ago", "3 weeks ago", "5 hours ago"
     - "Oct, 2023"
     - "Today"
     - "20 Jan 2024" (Standard format)
     
-    Returns a datetime object or None.
+    Relative dates count back from `reference` (default: now).
+    Returns a datetime object or None. Results are memoized: a run only sees
+    a handful of distinct date strings.
     """
     if not date_str:
         return None
-        
-    date_str = date_str.strip()
-    today = datetime.now()
-    
-    try:
-        # Relative dates
-        if 'today' in date_str.lower():
-            return today
-        if 'days ago' in date_str.lower():
-            days = int(re.search(r'(\d+)', date_str).group(1))
-            return today - timedelta(days=days)
-        if 'month ago' in date_str.lower() or 'months ago' in date_str.lower():
-            months = int(re.search(r'(\d+)', date_str).group(1))
-            return today - timedelta(days=months*30) # Approx
-            
-        # Absolute dates "Oct, 2023"
-        if ',' in date_str:
-            # Example: Oct, 2023
-            try:
-                return datetime.strptime(date_str, "%b, %Y")
-            except:
-                pass
-                
-        # Absolute dates "20 Jan 2024"
-        try:
-            return datetime.strptime(date_str, "%d %b %Y")
-        except:
-            pass
+    if reference is None:
+        reference = _reference_time()
+    return _parse_review_date(date_str.strip().lower(), reference)
 
-        return None
-    except Exception as e:
-        print(f"Date parse error for '{date_str}': {e}")
-        return None
+def parse_review_dates(date_strs, reference=None):
+    """
+    Batch version of parse_review_date: parses a page's (or a column's) date
+    strings against one reference time, each distinct string only once.
+    Takes any iterable and returns a list, or takes a pandas Series and
+    returns a datetime64 Series (NaT where unparseable).
+    """
+    if reference is None:
+        reference = _reference_time()
+
+    if type(date_strs).__module__.startswith('pandas'):
+        import pandas as pd
+        parsed = {s: parse_review_date(s, reference) for s in date_strs.dropna().unique()}
+        return pd.to_datetime(date_strs.map(parsed))
+
+    parsed = {}
+    results = []
+    for s in date_strs:
+        if s not in parsed:
+            parsed[s] = parse_review_date(s, reference)
+        results.append(parsed[s])
+    return results
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from scraper import dedup
+from scraper.dedup import DedupIndex, review_hash
+
+
+def hashes(count, start=1):
+    return [review_hash({"reviewer_name": f"user {i}", "review": f"review {i}", "review_date": "2024-01-01"})
+            for i in range(start, start + count)]
+
+
+def test_table_keeps_every_hash_across_growth():
+    index = DedupIndex()
+    values = hashes(5000)
+    for value in values:
+        assert index.add(value)
+
+    assert index.exact
+    # Started at 1024 slots, so the table was rebuilt several times
+    assert index.nbytes > 1024 * 8
+    assert len(index) == 5000
+    assert all(value in index for value in values)
+    assert not any(value in index for value in hashes(1000, start=10000))
+    assert not index.add(values[0])
+    assert len(index) == 5000
+
+
+def test_switches_to_bloom_filter_at_max_bytes():
+    index = DedupIndex(max_bytes=8 * 1024, false_positive_rate=0.01)
+    values = hashes(2000)
+    index.update(values)
+
+    assert not index.exact
+    assert index.nbytes == 8 * 1024
+    # A Bloom filter has no false negatives
+    assert all(value in index for value in values)
+    assert not index.add(values[0])
+    false_positives = sum(value in index for value in hashes(2000, start=10000))
+    assert false_positives < 200
+
+
+@pytest.mark.parametrize("max_bytes, exact", [(64 * 1024, True), (8 * 1024, False)])
+def test_state_round_trip(max_bytes, exact):
+    index = DedupIndex(max_bytes=max_bytes, false_positive_rate=0.01)
+    values = hashes(1500)
+    index.update(values)
+    assert index.exact is exact
+
+    restored = DedupIndex.from_state(json.loads(json.dumps(index.to_state())))
+
+    assert restored.exact is exact
+    assert len(restored) == len(index)
+    assert restored.nbytes == index.nbytes
+    assert restored.max_bytes == max_bytes
+    assert all(value in restored for value in values)
+    # Keeps working (and growing) after the restore
+    new_values = hashes(1500, start=5000)
+    restored.update(new_values)
+    assert all(value in restored for value in values + new_values)
+
+
+def test_from_empty_state_uses_options():
+    index = DedupIndex.from_state(None, max_bytes=1024, false_positive_rate=0.05)
+    assert index.exact and len(index) == 0
+    assert index.max_bytes == 1024
+
+
+def test_review_hash_is_never_zero(monkeypatch):
+    class ZeroDigest:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def digest(self):
+            return bytes(8)
+
+    monkeypatch.setattr(dedup.hashlib, "blake2b", ZeroDigest)
+    assert review_hash({"reviewer_name": "a", "review": "b", "review_date": "c"}) == 1
+
+
+def test_review_hash_normalizes_whitespace_and_case():
+    a = {"reviewer_name": "Priya  Nair", "review": "Great\nphone", "review_date": "2024-01-01"}
+    b = {"reviewer_name": "priya nair", "review": "great phone ", "review_date": "2024-01-01"}
+    assert review_hash(a) == review_hash(b)
+    assert review_hash(a) != review_hash({**b, "review_date": "2024-01-02"})
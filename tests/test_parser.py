@@ -0,0 +1,41 @@
+import contextlib
+import io
+import re
+
+import pytest
+
+from benchmarks.fake_driver import FakeDriver
+from benchmarks.fixtures import FixtureSite, page_url, reviews_for_page
+from scraper.flipkart import FlipkartScraper
+from scraper.parser import parse_reviews
+from scraper.selector_cache import SelectorCache
+
+
+class BadgeSite(FixtureSite):
+    """New-layout pages whose MKiFS6 rating holds a text badge; the number is in an old-layout _3LWZlK."""
+    def page(self, page):
+        source = super().page(page)
+        return source and re.sub(
+            r'<div class="MKiFS6 Ga3i8K">(\d)', r'<div class="MKiFS6 Ga3i8K">Top pick</div><div class="_3LWZlK">\1', source
+        )
+
+
+def expected_ratings(pages):
+    return [r["rating"] for page in range(1, pages + 1) for r in reviews_for_page(page)]
+
+
+def test_offline_parser_falls_back_to_the_next_rating():
+    site = BadgeSite("new", total_pages=2)
+    ratings = [r["rating"] for page in (1, 2) for r in parse_reviews(site.page(page), selectors=SelectorCache())]
+    assert ratings == expected_ratings(2)
+
+
+@pytest.mark.parametrize("extraction", ["bulk", "elements", "offline"])
+def test_scraper_falls_back_to_the_next_rating(extraction):
+    driver = FakeDriver(BadgeSite("new", total_pages=2))
+    driver.get(page_url(1))
+    scraper = FlipkartScraper(driver=driver, extraction=extraction, min_delay=0, max_delay=0, max_wait=1,
+                              selectors=SelectorCache())
+    with contextlib.redirect_stdout(io.StringIO()):
+        pages = list(scraper.iter_review_pages(2))
+    assert [r["rating"] for _, reviews in pages for r in reviews] == expected_ratings(2)
@@ -0,0 +1,88 @@
+import csv
+import io
+
+from scraper.preview import CsvRowIndex, iter_file_range
+
+FIELDS = ["reviewer_name", "rating", "review"]
+
+
+def write_csv(path, rows, header=True):
+    """Writes rows like CsvSink does; returns the byte offset where each data row starts, plus the end."""
+    offsets = []
+    with open(path, "ab") as f:
+        for i, row in enumerate(([FIELDS] if header else []) + rows):
+            if i or not header:
+                offsets.append(f.tell())
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerow(row)
+            f.write(buffer.getvalue().encode("utf-8"))
+        offsets.append(f.tell())
+    return offsets
+
+
+def make_rows(count, start=0):
+    return [[f"user {i}", str(i % 5 + 1), f"review {i}"] for i in range(start, start + count)]
+
+
+def test_quoted_newlines_and_quotes_stay_in_one_row(tmp_path):
+    path = str(tmp_path / "reviews.csv")
+    rows = [
+        ["Priya", "5", 'Great phone\nbattery lasts "two days"\n\nwould buy again'],
+        ["Rohit", "2", "Heats up, \"meh\""],
+        ["Ananya", "4", "पैसा वसूल\nअच्छा"]
+    ] + make_rows(5)
+    offsets = write_csv(str(path), rows)
+    index = CsvRowIndex(path, every=2)
+
+    assert index.refresh(offsets[-1]) == len(rows)
+    assert index.fieldnames == FIELDS
+    assert index.read(0, 100, offsets[-1]) == [dict(zip(FIELDS, row)) for row in rows]
+    assert index.read(2, 2, offsets[-1]) == [dict(zip(FIELDS, row)) for row in rows[2:4]]
+
+
+def test_incomplete_rows_past_the_limit_are_not_read(tmp_path):
+    path = str(tmp_path / "reviews.csv")
+    offsets = write_csv(path, make_rows(10))
+    index = CsvRowIndex(path, every=3)
+
+    # Limit in the middle of row 6: only rows 0-5 are complete
+    limit = offsets[6] + 3
+    assert index.refresh(limit) == 6
+    assert len(index.read(0, 100, limit)) == 6
+    assert index.refresh(offsets[-1]) == 10
+
+
+def test_file_cut_back_on_resume_is_reindexed(tmp_path):
+    path = str(tmp_path / "reviews.csv")
+    offsets = write_csv(path, make_rows(10))
+    index = CsvRowIndex(path, every=3)
+    assert index.refresh(offsets[-1]) == 10
+
+    # Resume truncates to the last checkpoint (after row 4) and writes different rows
+    with open(path, "r+b") as f:
+        f.truncate(offsets[4])
+    assert index.refresh(offsets[4]) == 4
+    new_offsets = write_csv(path, make_rows(3, start=100), header=False)
+
+    assert index.refresh(new_offsets[-1]) == 7
+    expected = make_rows(4) + make_rows(3, start=100)
+    assert index.read(0, 100, new_offsets[-1]) == [dict(zip(FIELDS, row)) for row in expected]
+
+
+def test_offset_of_rows_past_the_index_boundaries(tmp_path):
+    path = str(tmp_path / "reviews.csv")
+    rows = make_rows(10)
+    rows[4][2] = "multi\nline review"
+    offsets = write_csv(path, rows)
+    index = CsvRowIndex(path, every=3)
+
+    for row in range(10):
+        assert index.offset_of(row, offsets[-1]) == offsets[row]
+    # Past the complete rows: the end of the last one
+    assert index.offset_of(10, offsets[-1]) == offsets[-1]
+    assert index.offset_of(50, offsets[-1]) == offsets[-1]
+    assert index.header_bytes() == b"reviewer_name,rating,review\n"
+
+    with open(path, "rb") as f:
+        data = f.read()
+    assert b"".join(iter_file_range(path, offsets[3], offsets[7], chunk_size=5)) == data[offsets[3]:offsets[7]]
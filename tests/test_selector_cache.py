@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from benchmarks.fixtures import FixtureSite
+from scraper.parser import REVIEW_BLOCK_STRATEGIES, REVIEW_FIELD_XPATHS, parse_reviews
+from scraper.selector_cache import SelectorCache
+
+
+def pages(layout, count=4):
+    site = FixtureSite(layout, total_pages=count)
+    return [site.page(n) for n in range(1, count + 1)]
+
+
+def odd_new_layout_page():
+    # Neither gMdEY7 nor x_CUu6: only the catch-all strategies match
+    return pages("new", 1)[0].replace("x_CUu6", "x_other")
+
+
+def assert_same_as_default(selectors, page_sources):
+    for page_source in page_sources:
+        assert parse_reviews(page_source, selectors=selectors) == parse_reviews(page_source)
+
+
+@pytest.mark.parametrize("layout", ["new", "old"])
+def test_learned_order_extracts_the_same_reviews(tmp_path, layout):
+    path = str(tmp_path / "selector_cache.json")
+    assert_same_as_default(SelectorCache(path), pages(layout))
+    # A new session starts from the saved order
+    assert_same_as_default(SelectorCache(path), pages(layout))
+
+
+def test_catch_all_win_keeps_the_layouts_own_strategies_first(tmp_path):
+    path = str(tmp_path / "selector_cache.json")
+    selectors = SelectorCache(path)
+    assert_same_as_default(selectors, [odd_new_layout_page()] + pages("new"))
+    assert_same_as_default(SelectorCache(path), [odd_new_layout_page()] + pages("new"))
+
+    # Only A (gMdEY7) missed before B won; C stays ahead of D and E
+    strategies, _ = SelectorCache(path).ranking("new")
+    assert strategies == REVIEW_BLOCK_STRATEGIES[1:] + REVIEW_BLOCK_STRATEGIES[:1]
+    assert len(parse_reviews(pages("new", 1)[0], selectors=SelectorCache(path))) == 10
+
+
+def test_older_cache_format_is_relearned(tmp_path):
+    # Winner-first order from before: the catch-all C in front on the new layout
+    path = tmp_path / "selector_cache.json"
+    path.write_text(json.dumps({"layouts": {"new": {
+        "strategies": [REVIEW_BLOCK_STRATEGIES[2]] + REVIEW_BLOCK_STRATEGIES[:2] + REVIEW_BLOCK_STRATEGIES[3:],
+        "fields": {}
+    }}}), encoding="utf-8")
+    selectors = SelectorCache(str(path))
+    assert selectors.ranking("new")[0] == REVIEW_BLOCK_STRATEGIES
+    assert_same_as_default(selectors, pages("new"))
+
+
+def test_old_layout_learns_the_new_layout_selectors_miss(tmp_path):
+    # C (catch-all) wins every old-layout page; A, B and the new-layout fields can't match there
+    path = str(tmp_path / "selector_cache.json")
+    assert_same_as_default(SelectorCache(path), pages("old"))
+
+    strategies, fields = SelectorCache(path).ranking("old")
+    assert strategies == REVIEW_BLOCK_STRATEGIES[2:] + REVIEW_BLOCK_STRATEGIES[:2]
+    assert fields["name"] == REVIEW_FIELD_XPATHS["name"][::-1]
+    assert fields["rating"] == REVIEW_FIELD_XPATHS["rating"][::-1]
+    assert_same_as_default(SelectorCache(path), pages("old"))
+
+
+def test_page_without_rating_markers_learns_every_layout_strategy_misses(tmp_path):
+    # No MKiFS6 / x_CUu6: signature "" and only E (cPHDOP) matches
+    page_sources = [p.replace("MKiFS6", "rating").replace("x_CUu6", "x_other") for p in pages("new")]
+    path = str(tmp_path / "selector_cache.json")
+    assert_same_as_default(SelectorCache(path), page_sources)
+
+    strategies, _ = SelectorCache(path).ranking("")
+    assert strategies == REVIEW_BLOCK_STRATEGIES[4:] + REVIEW_BLOCK_STRATEGIES[:4]
+    assert_same_as_default(SelectorCache(path), page_sources)
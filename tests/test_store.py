@@ -0,0 +1,27 @@
+from scraper.store import ReviewStore
+
+GENERIC = {"reviewer_name": "Flipkart Customer", "rating": 5, "review": "Wonderful - Good product"}
+
+
+def test_generic_reviews_with_other_ratings_or_on_the_same_page_stay_distinct(tmp_path):
+    store = ReviewStore(str(tmp_path / "reviews.db"))
+    added = store.add_reviews("pid", [dict(GENERIC), dict(GENERIC), {**GENERIC, "rating": 4}], job_id="job1")
+    assert len(added) == 3
+    assert store.count() == 3
+
+    # A later run with a third copy on the page only outputs that one
+    added = store.add_reviews("pid", [dict(GENERIC), dict(GENERIC), dict(GENERIC)], job_id="job2")
+    assert len(added) == 1
+    assert store.count() == 4
+    store.close()
+
+
+def test_same_job_gets_its_stored_reviews_back(tmp_path):
+    store = ReviewStore(str(tmp_path / "reviews.db"))
+    page = [dict(GENERIC), {"reviewer_name": "Priya", "rating": 3, "review": "Okay"}]
+    assert len(store.add_reviews("pid", page, job_id="job1")) == 2
+    # Resumed job re-scraping the page: returned again, not stored twice
+    assert len(store.add_reviews("pid", page, job_id="job1")) == 2
+    assert store.add_reviews("pid", page, job_id="job2") == []
+    assert store.count() == 2
+    store.close()